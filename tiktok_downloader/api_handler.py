@@ -1,39 +1,2198 @@
+# whisper(torch), numpy, google.generativeai, requests 같은 무거운 의존성은
+# GUI 창이 빨리 뜨도록 모듈 로드 시점이 아니라 해당 단계가 처음 실행될 때 임포트합니다.
 import os
 import json
 import subprocess
 from datetime import datetime
-import whisper
-import requests
-from moviepy.editor import VideoFileClip
 from pathlib import Path
 import re
 import threading
 import collections # For word frequency counting
-import google.generativeai as genai # Gemini API 임포트
 import hmac
 import hashlib
 import base64
 import time
 import urllib.parse
+import gc
+import bisect
+import multiprocessing
+import queue
+import atexit
+import sys
+import contextlib
+import functools
+import sqlite3
+import random
+import heapq
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+
+
+class WhisperModelRegistry:
+    """
+    Whisper 모델을 (엔진, 크기, 디바이스, 정밀도) 단위로 프로세스 전체에서 공유하는 레지스트리입니다.
+    모델은 처음 사용할 때 한 번만 로드되며, 메모리 압박이 높을 때 일정 시간 사용되지 않은 모델은 해제됩니다.
+    전사 중인 모델은 lease()로 사용 중 표시를 해 두므로 유휴 시간이 지났더라도 해제되지 않습니다.
+    """
+
+    def __init__(self, idle_timeout: float = 600, memory_pressure_threshold: float = 0.85, check_interval: float = 60):
+        self.idle_timeout = idle_timeout # 이 시간(초) 이상 사용되지 않은 모델은 해제 후보
+        self.memory_pressure_threshold = memory_pressure_threshold # 메모리 사용률이 이 값 이상일 때만 해제
+        self.check_interval = check_interval
+        self._models = {}
+        self._last_used = {}
+        self._active = collections.Counter() # 모델별로 지금 전사에 쓰고 있는 호출 수 (0보다 크면 해제하지 않음)
+        self._load_locks = {} # 같은 모델을 여러 스레드가 동시에 로드하지 않도록 키별 잠금
+        self._lock = threading.Lock()
+        self._reaper_thread = None
+
+    def get(self, model_size: str = "base", device: str = "cpu", precision: str = "fp32", backend: str = "whisper"):
+        """모델을 반환합니다. 아직 로드되지 않았다면 이 시점에 로드합니다."""
+        return self._get((backend, model_size, device, precision), hold=False)
+
+    @contextlib.contextmanager
+    def lease(self, model_size: str = "base", device: str = "cpu", precision: str = "fp32", backend: str = "whisper"):
+        """
+        with registry.lease(...) as model: 블록 동안 모델을 사용 중으로 표시해, 유휴 모델 해제가 그 모델을 건드리지 않게 합니다.
+        전사처럼 모델을 실제로 쓰는 동안에는 get() 대신 이 메서드를 사용합니다.
+        """
+        key = (backend, model_size, device, precision)
+        model = self._get(key, hold=True)
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._active[key] -= 1
+                if self._active[key] <= 0:
+                    del self._active[key]
+                self._last_used[key] = time.monotonic() # 유휴 시간은 마지막 사용이 끝난 시점부터 셈
+
+    def _get(self, key, hold):
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._last_used[key] = time.monotonic()
+                if hold:
+                    self._active[key] += 1
+                return model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None: # 대기하는 동안 다른 스레드가 로드를 끝낸 경우
+                    self._last_used[key] = time.monotonic()
+                    if hold:
+                        self._active[key] += 1
+                    return model
+
+            backend, model_size, device, precision = key
+            print(f"[DEBUG] Whisper 모델 로드 중: 엔진={backend}, 크기={model_size}, 디바이스={device}, 정밀도={precision}")
+            started = time.monotonic()
+            model = self._load_model(backend, model_size, device, precision)
+            print(f"[DEBUG] Whisper 모델 로드 완료 ({time.monotonic() - started:.1f}초)")
+
+            with self._lock:
+                self._models[key] = model
+                self._last_used[key] = time.monotonic()
+                if hold:
+                    self._active[key] += 1
+            self._ensure_reaper()
+        return model
+
+    def _load_model(self, backend, model_size, device, precision):
+        if backend == "faster-whisper":
+            # CTranslate2 기반 엔진. precision은 compute_type(int8, int8_float32, float32 등)으로 그대로 전달
+            from faster_whisper import WhisperModel
+            return WhisperModel(model_size, device=device, compute_type=precision)
+
+        import whisper # torch까지 함께 로드되므로 실제로 모델이 필요할 때만 임포트
+        model = whisper.load_model(model_size, device=device)
+        if precision == "fp16" and device != "cpu":
+            model = model.half()
+        elif precision == "int8":
+            if device == "cpu":
+                model = self._quantize_dynamic(model)
+            else:
+                print(f"[DEBUG] int8 동적 양자화는 CPU에서만 지원되어 {device}에서는 fp32 모델을 사용합니다.")
+        return model
+
+    @staticmethod
+    def _quantize_dynamic(model):
+        """
+        Linear 레이어의 가중치를 int8로 동적 양자화합니다 (활성값은 추론 시 int8로 변환).
+        Whisper는 nn.Linear를 상속한 자체 Linear를 쓰는데 quantize_dynamic은 정확히 nn.Linear 타입만
+        교체하므로, forward만 다른 이 서브클래스를 먼저 nn.Linear로 되돌립니다.
+        """
+        import torch
+        import whisper.model
+
+        for module in model.modules():
+            if type(module) is whisper.model.Linear:
+                module.__class__ = torch.nn.Linear
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._models.keys())
+
+    def release(self, key=None):
+        """지정한 모델(또는 전체)을 레지스트리에서 해제합니다."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._models.keys())
+            for k in keys:
+                self._pop_locked(k)
+        self._free_memory()
+
+    def _pop_locked(self, key):
+        self._models.pop(key, None)
+        self._last_used.pop(key, None)
+
+    @staticmethod
+    def _free_memory():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+    def release_idle_models(self):
+        """메모리 압박이 높을 때 유휴 시간이 지난 모델을 해제합니다. 해제한 모델 키 목록을 반환합니다."""
+        pressure = _memory_pressure()
+        if pressure is None or pressure < self.memory_pressure_threshold:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            # 사용 중인(lease) 모델은 오래전에 로드했더라도 해제하지 않음. 확인과 해제를 같은 잠금 안에서 해 그 사이에 사용이 시작되지 않게 함
+            idle_keys = [k for k, last in self._last_used.items()
+                         if now - last >= self.idle_timeout and not self._active.get(k)]
+            for key in idle_keys:
+                print(f"[DEBUG] 메모리 사용률 {pressure:.0%}: 유휴 Whisper 모델 해제 {key}")
+                self._pop_locked(key)
+        if idle_keys:
+            self._free_memory()
+        return idle_keys
+
+    def _ensure_reaper(self):
+        with self._lock:
+            if self._reaper_thread is not None and self._reaper_thread.is_alive():
+                return
+            self._reaper_thread = threading.Thread(target=self._reap_loop, name="whisper-model-reaper", daemon=True)
+            self._reaper_thread.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            try:
+                self.release_idle_models()
+            except Exception as e:
+                print(f"[DEBUG] 유휴 모델 해제 중 오류: {e}")
+            with self._lock:
+                if not self._models:
+                    self._reaper_thread = None
+                    return
+
+
+def _memory_pressure():
+    """시스템 메모리 사용률(0.0~1.0)을 반환합니다. 알 수 없으면 None."""
+    try:
+        import psutil
+        return psutil.virtual_memory().percent / 100.0
+    except ImportError:
+        pass
+    try:
+        meminfo = {}
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                meminfo[name] = int(value.split()[0])
+        return 1.0 - meminfo["MemAvailable"] / meminfo["MemTotal"]
+    except Exception:
+        return None
+
+
+def _available_memory_mb():
+    """지금 사용할 수 있는 시스템 메모리(MB). 알 수 없으면 None."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except Exception:
+        pass
+    return None
+
+
+# 전사 워커 하나가 모델을 로드했을 때 차지하는 대략적인 메모리(MB, 모델 크기 이름의 앞부분으로 찾음)
+WHISPER_MODEL_MEMORY_MB = {"tiny": 400, "base": 600, "small": 1500, "medium": 3500, "large": 7000, "turbo": 4000}
+
+
+def default_transcription_workers(model_size: str, cores: int, max_workers: int = 2):
+    """
+    TRANSCRIPTION_WORKERS를 지정하지 않았을 때의 전사 워커 수.
+    워커마다 모델을 따로 로드하므로 코어 수가 아니라 max_workers(기본 2)와 사용 가능한 메모리의 절반에 들어가는 워커 수 중 작은 값을 씁니다.
+    """
+    workers = max(1, min(max_workers, cores))
+    available = _available_memory_mb()
+    if available is not None:
+        per_worker = next((mb for name, mb in WHISPER_MODEL_MEMORY_MB.items() if model_size.startswith(name)), 2000)
+        # 현재 프로세스에도 모델이 한 벌 있으므로 남은 메모리의 절반까지만 워커에 씀
+        workers = min(workers, int(available * 0.5 // per_worker))
+    return max(1, workers)
+
+
+class CpuGovernor:
+    """
+    파이프라인 단계(download / ffmpeg / transcribe)별로 코어를 나눠 배정해, 같은 머신에서
+    다운로드, ffmpeg, 전사가 서로 코어를 빼앗지 않도록 합니다.
+    단계에 들어가면 현재 스레드의 CPU affinity를 그 단계의 코어로 바꾸고(이 스레드가 띄우는
+    ffmpeg/yt-dlp/전사 워커 프로세스에 그대로 상속), 전사 단계에서는 torch 스레드 수도 맞춥니다.
+    바꾼 affinity와 스레드 수는 단계가 끝나면 원래 값으로 되돌립니다. 기본적으로 꺼져 있습니다(CPU_GOVERNOR=1로 사용).
+    """
+    STAGES = ("download", "ffmpeg", "transcribe")
+
+    def __init__(self, enabled: bool = False, reserved_cores: int = 1):
+        self.enabled = enabled and hasattr(os, "sched_setaffinity") # Linux 전용
+        if hasattr(os, "sched_getaffinity"):
+            self.all_cpus = sorted(os.sched_getaffinity(0))
+        else:
+            self.all_cpus = list(range(os.cpu_count() or 1))
+        self.stage_cpus = self._partition(self.all_cpus, reserved_cores)
+
+    @classmethod
+    def _partition(cls, cpus, reserved_cores):
+        if len(cpus) - reserved_cores < 3: # 코어가 적으면 나누지 않고 모두 공유
+            return {stage: cpus for stage in cls.STAGES}
+        usable = cpus[reserved_cores:] # 앞쪽 코어는 GUI 스레드 몫으로 남김
+        ffmpeg_count = max(1, len(usable) // 8) # 16kHz 모노 디코딩은 가벼움
+        return {
+            "download": usable[:1], # 네트워크 대기가 대부분
+            "ffmpeg": usable[1:1 + ffmpeg_count],
+            "transcribe": usable[1 + ffmpeg_count:],
+        }
+
+    def cpus_for(self, stage: str):
+        return self.stage_cpus[stage] if self.enabled else self.all_cpus
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """with governor.stage("ffmpeg") as cpus: ... 블록 안에서만 해당 단계의 코어를 사용합니다."""
+        cpus = self.cpus_for(name)
+        if not self.enabled:
+            yield cpus
+            return
+        previous = os.sched_getaffinity(0)
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e: # 컨테이너 등에서 허용되지 않는 경우
+            print(f"[DEBUG] CPU affinity 설정 실패 ({name}): {e}")
+        restore_threads = self._limit_torch_threads(len(cpus)) if name == "transcribe" else None
+        try:
+            yield cpus
+        finally:
+            if restore_threads is not None:
+                restore_threads()
+            try:
+                os.sched_setaffinity(0, previous)
+            except OSError:
+                pass
+
+    def _limit_torch_threads(self, threads):
+        """torch 스레드 수(또는 임포트 전이면 OMP_NUM_THREADS)를 제한하고, 원래 값으로 되돌리는 함수를 반환합니다."""
+        torch = sys.modules.get("torch")
+        if torch is None:
+            # 아직 임포트 전이면 환경 변수로 지정 (torch와 CTranslate2가 처음 로드될 때 참고)
+            previous_env = os.environ.get("OMP_NUM_THREADS")
+            os.environ["OMP_NUM_THREADS"] = str(threads)
+
+            def restore_env():
+                if previous_env is None:
+                    os.environ.pop("OMP_NUM_THREADS", None)
+                else:
+                    os.environ["OMP_NUM_THREADS"] = previous_env
+            return restore_env
+
+        # inter-op 스레드 수는 한 번 바꾸면 되돌릴 수 없으므로 여기서는 건드리지 않음 (전사 워커 프로세스에서만 1로 설정)
+        previous_threads = torch.get_num_threads()
+        torch.set_num_threads(threads)
+        return lambda: torch.set_num_threads(previous_threads)
+
+
+def governed_stage(name):
+    """VideoProcessor 메서드를 cpu_governor의 해당 단계 안에서 실행하는 데코레이터"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.cpu_governor.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Whisper가 입력으로 기대하는 샘플레이트 (16kHz 모노)
+AUDIO_SAMPLE_RATE = 16000
+
+def compact_whisper_result(result):
+    """
+    Whisper 결과에서 이후 단계(타임스탬프 요약, 타임라인, 클립 편집)에 필요한 정보만 남깁니다.
+    세그먼트는 start/end/text, 단어는 [start, end, word] 형태로 저장하며 시간은 소수점 2자리로 반올림합니다.
+    """
+    segments = []
+    for segment in result.get("segments", []):
+        compact_segment = {
+            'start': round(float(segment['start']), 2),
+            'end': round(float(segment['end']), 2),
+            'text': segment['text'].strip()
+        }
+        words = segment.get("words")
+        if words:
+            compact_segment['words'] = [
+                [round(float(w['start']), 2), round(float(w['end']), 2), w['word']]
+                for w in words
+            ]
+        segments.append(compact_segment)
+    return {
+        'text': result.get("text", "").strip(),
+        'language': result.get("language"),
+        'segments': segments
+    }
+
+
+# 에너지 기반 VAD에서 무음으로 보는 절대 기준(dBFS). 이보다 큰 프레임은 음악/잡음이라도 음성일 수 있으므로 남김
+SILENCE_FLOOR_DB = -50
+
+
+@functools.lru_cache(maxsize=None)
+def speech_vad_method():
+    """
+    detect_speech_regions가 쓰는 VAD 방식: "silero"(faster-whisper 설치 시, 음악과 음성을 구분) 또는 "energy".
+    energy 방식은 무음만 확실하게 걸러낼 수 있으므로, 그 결과로 음성이 없다고 판단한 클립은 캐시하지 않습니다.
+    """
+    try:
+        from faster_whisper.vad import get_speech_timestamps # noqa: F401
+        return "silero"
+    except ImportError:
+        return "energy"
+
+
+def detect_speech_regions(audio, sample_rate: int = 16000, min_silence: float = 0.5, speech_pad: float = 0.2):
+    """
+    음성 구간을 (시작 샘플, 끝 샘플) 목록으로 반환합니다.
+    faster-whisper가 설치되어 있으면 Silero VAD(음악과 음성을 구분)를 사용하고,
+    없으면 프레임 에너지가 SILENCE_FLOOR_DB 이하인 무음 구간만 걸러냅니다.
+    에너지 방식은 클립 안의 상대적인 크기로 판단하지 않으므로, 배경 음악 위의 음성이나 쉬지 않고 이어지는 말도 잘라내지 않습니다.
+    """
+    if speech_vad_method() == "silero":
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+        options = VadOptions(min_silence_duration_ms=int(min_silence * 1000), speech_pad_ms=int(speech_pad * 1000))
+        return [(ts['start'], ts['end']) for ts in get_speech_timestamps(audio, options)]
+
+    import numpy as np
+
+    frame = int(sample_rate * 0.03) # 30ms 프레임
+    frame_count = len(audio) // frame
+    if frame_count == 0:
+        return []
+    frames = audio[:frame_count * frame].reshape(frame_count, frame)
+    db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    voiced = db > SILENCE_FLOOR_DB
+
+    regions = []
+    start = None
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = i
+        elif not is_voiced and start is not None:
+            regions.append([start, i])
+            start = None
+    if start is not None:
+        regions.append([start, frame_count])
+
+    # 짧은 무음은 이어 붙이고, 너무 짧은 잡음 구간은 버린 뒤 앞뒤로 여유를 둠
+    min_gap = int(min_silence / 0.03)
+    merged = []
+    for region in regions:
+        if merged and region[0] - merged[-1][1] < min_gap:
+            merged[-1][1] = region[1]
+        else:
+            merged.append(region)
+    pad = int(speech_pad * sample_rate)
+    min_length = int(0.25 / 0.03)
+    return [
+        (max(0, s * frame - pad), min(len(audio), e * frame + pad))
+        for s, e in merged if e - s >= min_length
+    ]
+
+
+def remove_non_speech(audio, regions, sample_rate: int = 16000):
+    """
+    음성 구간만 이어 붙인 오디오와, 잘라낸 오디오의 시간을 원본 시간으로 되돌리기 위한
+    오프셋 표 [(잘라낸 오디오에서의 시작 초, 원본에서의 시작 초), ...]를 반환합니다.
+    """
+    import numpy as np
+
+    pieces = []
+    offsets = []
+    kept = 0
+    for start, end in regions:
+        offsets.append((kept / sample_rate, start / sample_rate))
+        pieces.append(audio[start:end])
+        kept += end - start
+    speech_audio = np.concatenate(pieces) if pieces else audio[:0]
+    return speech_audio, offsets
+
+
+def remap_timestamps(whisper_result, offsets):
+    """remove_non_speech로 잘라낸 오디오 기준의 세그먼트/단어 시간을 원본 영상 시간으로 되돌립니다."""
+    if not offsets:
+        return whisper_result
+    kept_starts = [kept for kept, _ in offsets]
+
+    def to_original(t, is_end=False):
+        # 구간 경계에 정확히 걸친 끝 시간은 다음 구간이 아니라 이전 구간의 끝으로 매핑
+        index = (bisect.bisect_left(kept_starts, t) if is_end else bisect.bisect_right(kept_starts, t)) - 1
+        index = max(index, 0)
+        kept, original = offsets[index]
+        return round(original + (t - kept), 2)
+
+    for segment in whisper_result.get("segments", []):
+        segment['start'] = to_original(segment['start'])
+        segment['end'] = to_original(segment['end'], is_end=True)
+        for word in segment.get('words', []):
+            word[0] = to_original(word[0])
+            word[1] = to_original(word[1], is_end=True)
+    return whisper_result
+
+
+def clamp_timestamps(whisper_result, duration):
+    """
+    세그먼트/단어 시간을 0~duration(초) 안으로 맞춥니다.
+    Whisper는 마지막 세그먼트의 끝을 30초 창 기준으로 추정하므로 실제 오디오 길이를 조금 넘는 경우가 있습니다.
+    """
+    duration = round(duration, 2)
+    for segment in whisper_result.get("segments", []):
+        segment['start'] = min(max(segment['start'], 0), duration)
+        segment['end'] = min(max(segment['end'], segment['start']), duration)
+        for word in segment.get('words', []):
+            word[0] = min(max(word[0], 0), duration)
+            word[1] = min(max(word[1], word[0]), duration)
+    return whisper_result
+
+
+def split_audio_at_silence(audio, sample_rate: int = 16000, chunk_seconds: float = 120.0, overlap_seconds: float = 1.0):
+    """
+    긴 오디오를 목표 길이(chunk_seconds) 근처의 무음 지점에서 나눕니다.
+    [(오디오 시작, 오디오 끝, 담당 시작, 담당 끝), ...] 형태(샘플 단위)로 반환하며,
+    오디오 구간은 경계에서 잘린 단어를 살리기 위해 담당 구간보다 overlap_seconds만큼 넓습니다.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * sample_rate)
+    if total <= chunk * 1.5:
+        return [(0, total, 0, total)]
+
+    regions = detect_speech_regions(audio, sample_rate)
+    gaps = [(prev_end + next_start) // 2 for (_, prev_end), (next_start, _) in zip(regions, regions[1:])]
+
+    cuts = []
+    position = 0
+    while total - position > chunk * 1.5:
+        target = position + chunk
+        candidates = [g for g in gaps if position + chunk * 0.5 <= g <= position + chunk * 1.5]
+        cut = min(candidates, key=lambda g: abs(g - target)) if candidates else target # 무음이 없으면 목표 지점에서 자름
+        cuts.append(cut)
+        position = cut
+
+    bounds = [0] + cuts + [total]
+    overlap = int(overlap_seconds * sample_rate)
+    return [
+        (max(0, own_start - overlap), min(total, own_end + overlap), own_start, own_end)
+        for own_start, own_end in zip(bounds, bounds[1:])
+    ]
+
+
+def stitch_chunk_results(chunks, chunk_results, sample_rate: int = 16000):
+    """
+    청크별 전사 결과를 하나의 결과로 합칩니다.
+    각 세그먼트를 청크 시작 시간만큼 이동하고, 겹침 구간에서 중복된 세그먼트는
+    세그먼트 중간 지점이 해당 청크의 담당 구간에 있는 것만 남깁니다.
+    """
+    segments = []
+    languages = collections.Counter()
+    for (audio_start, audio_end, own_start, own_end), result in zip(chunks, chunk_results):
+        offset = audio_start / sample_rate
+        own_start_sec, own_end_sec = own_start / sample_rate, own_end / sample_rate
+        if result.get("language"):
+            languages[result["language"]] += 1
+        clamp_timestamps(result, (audio_end - audio_start) / sample_rate) # 청크 길이를 넘는 끝 시간은 다음 청크로 넘치지 않게 자름
+        for segment in result.get("segments", []):
+            start, end = segment['start'] + offset, segment['end'] + offset
+            if not own_start_sec <= (start + end) / 2 < own_end_sec:
+                continue
+            stitched = {'start': round(start, 2), 'end': round(end, 2), 'text': segment['text']}
+            if segment.get('words'):
+                stitched['words'] = [[round(w[0] + offset, 2), round(w[1] + offset, 2), w[2]] for w in segment['words']]
+            segments.append(stitched)
+    return {
+        'text': " ".join(segment['text'] for segment in segments if segment['text']),
+        'language': languages.most_common(1)[0][0] if languages else None,
+        'segments': segments
+    }
+
+
+# 전사 워커 프로세스가 한 번 로드해 재사용하는 대본 생성 엔진
+_worker_backend = None
+
+
+def _init_transcription_worker(backend_name, model_size, device, precision, threads_per_worker):
+    """전사 워커 초기화: 스레드 수를 제한하고 모델을 미리 로드합니다."""
+    global _worker_backend
+    if threads_per_worker:
+        # torch와 CTranslate2가 모두 참고하므로 모델을 로드하기 전에 설정해야 함
+        os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+        try:
+            import torch
+            torch.set_num_threads(threads_per_worker)
+            torch.set_num_interop_threads(1)
+        except ImportError:
+            pass
+    _worker_backend = create_transcription_backend(backend_name, model_size=model_size, device=device, precision=precision)
+    _worker_backend.model
+
+
+def _transcribe_in_worker(audio, options):
+    return _worker_backend.transcribe(audio, options)
+
+
+def _transcription_worker_main(jobs, results, backend_args, threads_per_worker):
+    """전사 워커 프로세스 본체: 작업 큐에서 (작업 ID, 오디오, 옵션)을 받아 결과 큐로 돌려줍니다."""
+    _init_transcription_worker(*backend_args, threads_per_worker)
+    while True:
+        job = jobs.get()
+        if job is None: # 종료 신호
+            break
+        job_id, audio, options = job
+        try:
+            results.put((job_id, _transcribe_in_worker(audio, options), None))
+        except Exception as e:
+            results.put((job_id, None, f"{type(e).__name__}: {e}"))
+
+
+def format_segments_with_timestamps(segments):
+    """세그먼트 목록을 '[MM:SS-MM:SS] 텍스트' 형식의 여러 줄 문자열로 변환합니다."""
+    lines = []
+    for segment in segments:
+        start_time = str(int(segment['start'] // 60)).zfill(2) + ":" + str(int(segment['start'] % 60)).zfill(2)
+        end_time = str(int(segment['end'] // 60)).zfill(2) + ":" + str(int(segment['end'] % 60)).zfill(2)
+        lines.append(f"[{start_time}-{end_time}] {segment['text']}")
+    return "\n".join(lines)
+
+
+class TranscriptCache:
+    """
+    디코딩된 오디오의 해시와 모델/디코딩 설정을 키로 하는 영구 대본 캐시입니다.
+    같은 영상이 다른 ID로 재업로드되어도 오디오가 같으면 재전사 없이 결과를 돌려줍니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None # 첫 저장 시 디렉토리를 스캔해 계산
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio, settings: dict) -> str:
+        """오디오 샘플과 설정(JSON 직렬화)을 합쳐 SHA-256 키를 만듭니다."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        digest.update(audio.tobytes())
+        return digest.hexdigest()
+
+    def _path_for(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path) # 최근 사용 시각 갱신 (LRU 삭제 기준)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key, result):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path_for(key)
+            data = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path) # 쓰는 도중 중단되어도 깨진 항목이 남지 않도록 원자적 교체
+            with self._lock:
+                if self._total_bytes is None:
+                    self._total_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+                else:
+                    self._total_bytes += len(data)
+                if self._total_bytes > self.max_bytes:
+                    self._evict_locked()
+        except Exception as e:
+            print(f"[DEBUG] 대본 캐시 저장 실패: {e}")
+
+    def _evict_locked(self):
+        entries = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                stat = p.stat()
+                entries.append((stat.st_mtime, stat.st_size, p))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9) # 저장할 때마다 삭제가 일어나지 않도록 여유를 둠
+        evicted = 0
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+                evicted += 1
+            except FileNotFoundError:
+                continue
+        self._total_bytes = total
+        print(f"[DEBUG] 대본 캐시 정리: {evicted}개 항목 삭제, 현재 크기 {total / (1024 * 1024):.1f}MB")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size_bytes': self._total_bytes
+            }
+
+
+# 대본 생성 속도 프로필: 빔 크기, 온도 폴백, 언어 고정, 이전 문맥 사용 여부, 정밀도(fp16/fp32)
+# 콘텐츠 대부분이 한국어이므로 fast/balanced는 언어를 "ko"로 고정해 언어 감지 단계를 생략합니다.
+TRANSCRIPTION_PROFILES = {
+    "fast": {
+        'language': "ko",
+        'beam_size': 1, # 그리디 디코딩
+        'best_of': 1,
+        'temperature': (0.0,), # 온도 폴백 재디코딩 없음
+        'condition_on_previous_text': False,
+        'precision': "fp16",
+    },
+    "balanced": {
+        'language': "ko",
+        'beam_size': 3,
+        'best_of': 3,
+        'temperature': (0.0, 0.4, 0.8),
+        'condition_on_previous_text': False,
+        'precision': "fp16",
+    },
+    "accurate": {
+        'language': None, # 자동 감지
+        'beam_size': 5,
+        'best_of': 5,
+        'temperature': (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        'condition_on_previous_text': True,
+        'precision': "fp32",
+    },
+}
+DEFAULT_TRANSCRIPTION_PROFILE = "balanced"
+
+
+class TranscriptionBackend:
+    """
+    대본 생성 엔진 인터페이스입니다.
+    transcribe()는 엔진과 관계없이 compact_whisper_result 형식(text/language/segments)의 결과를 반환해야 합니다.
+    """
+    name = None
+    default_precision = "fp32"
+
+    def __init__(self, model_size: str = "base", device: str = "cpu", precision: str = None):
+        self.model_size = model_size
+        self.device = device
+        self.precision = precision or self.default_precision
+
+    @property
+    def model(self):
+        """공유 레지스트리의 모델 (처음 접근할 때 로드)"""
+        return whisper_model_registry.get(self.model_size, self.device, self.precision, backend=self.name)
+
+    def lease_model(self):
+        """전사하는 동안 유휴 모델 해제에서 제외되도록 공유 레지스트리의 모델을 빌립니다 (with 블록으로 사용)."""
+        return whisper_model_registry.lease(self.model_size, self.device, self.precision, backend=self.name)
+
+    def transcribe(self, audio, options: dict) -> dict:
+        raise NotImplementedError
+
+    def precision_for_profile(self, profile: dict):
+        """속도 프로필의 정밀도를 이 엔진에서 쓸 값으로 바꿉니다. fp16은 GPU에서만 의미가 있습니다."""
+        if profile.get('precision') == "fp16" and self.device == "cpu":
+            return "fp32"
+        return profile.get('precision')
+
+    def stream(self, audio, options: dict, window_seconds: float = 30.0):
+        """
+        오디오를 무음 지점 기준의 창(window)으로 나눠 차례로 전사하며, 창마다 원본 기준 시간의 부분 결과를 내보냅니다.
+        """
+        for window in split_audio_at_silence(audio, AUDIO_SAMPLE_RATE, window_seconds):
+            start, end, _, _ = window
+            yield stitch_chunk_results([window], [self.transcribe(audio[start:end], options)], AUDIO_SAMPLE_RATE)
+
+    def settings(self) -> dict:
+        """결과에 영향을 주는 엔진 설정 (대본 캐시 키의 일부)"""
+        return {'backend': self.name, 'model_size': self.model_size, 'precision': self.precision}
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """openai-whisper(torch) 엔진"""
+    name = "whisper"
+
+    def transcribe(self, audio, options):
+        if options.get('beam_size') == 1:
+            options = {**options, 'beam_size': None} # openai-whisper는 beam_size=None일 때 그리디 디코딩
+        with self.lease_model() as model:
+            result = model.transcribe(audio, fp16=self.precision == "fp16", **options)
+        return compact_whisper_result(result)
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper(CTranslate2) 엔진. CPU에서는 기본적으로 int8 양자화 모델을 사용합니다."""
+    name = "faster-whisper"
+    default_precision = "int8"
+
+    def precision_for_profile(self, profile):
+        # compute_type은 장치에 맞춘 기본값(int8)이 가장 빠르므로 프로필의 fp16/fp32는 적용하지 않음
+        return None
+
+    def _iter_segments(self, audio, options):
+        with self.lease_model() as model: # 세그먼트를 모두 디코딩할 때까지(또는 중간에 닫힐 때까지) 사용 중으로 표시
+            segments_iter, info = model.transcribe(audio, **options)
+            for segment in segments_iter: # 제너레이터이므로 순회해야 실제 디코딩이 진행됨
+                yield info.language, {
+                    'start': segment.start,
+                    'end': segment.end,
+                    'text': segment.text,
+                    'words': [{'start': w.start, 'end': w.end, 'word': w.word} for w in (segment.words or [])]
+                }
+
+    def transcribe(self, audio, options):
+        language = None
+        segments = []
+        for language, segment in self._iter_segments(audio, options):
+            segments.append(segment)
+        return compact_whisper_result({
+            'text': "".join(segment['text'] for segment in segments),
+            'language': language,
+            'segments': segments
+        })
+
+    def stream(self, audio, options, window_seconds=30.0):
+        # faster-whisper는 세그먼트를 디코딩하는 즉시 내보내므로 창으로 나눌 필요가 없음
+        for language, segment in self._iter_segments(audio, options):
+            yield compact_whisper_result({'text': segment['text'], 'language': language, 'segments': [segment]})
+
+
+TRANSCRIPTION_BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def create_transcription_backend(name: str = None, model_size: str = "base", device: str = "cpu", precision: str = None):
+    """이름(또는 TRANSCRIPTION_BACKEND 환경 변수)으로 대본 생성 엔진을 만듭니다."""
+    name = name or os.environ.get("TRANSCRIPTION_BACKEND", OpenAIWhisperBackend.name)
+    backend_class = TRANSCRIPTION_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"지원하지 않는 대본 생성 엔진입니다: {name} (사용 가능: {', '.join(TRANSCRIPTION_BACKENDS)})")
+    return backend_class(model_size=model_size, device=device, precision=precision)
+
+
+# 모든 VideoProcessor 인스턴스가 공유하는 모델 레지스트리
+whisper_model_registry = WhisperModelRegistry(
+    idle_timeout=float(os.environ.get("WHISPER_MODEL_IDLE_TIMEOUT", 600)),
+    memory_pressure_threshold=float(os.environ.get("WHISPER_MEMORY_PRESSURE_THRESHOLD", 0.85)),
+)
+
+# 단계별 코어 배정 (CPU_GOVERNOR=1일 때만 사용, CPU_GOVERNOR_RESERVED_CORES는 GUI용으로 남길 코어 수)
+cpu_governor = CpuGovernor(
+    enabled=os.environ.get("CPU_GOVERNOR", "0") == "1",
+    reserved_cores=int(os.environ.get("CPU_GOVERNOR_RESERVED_CORES", 1)),
+)
+
+# 모든 VideoProcessor 인스턴스가 공유하는 대본 캐시 (hit/miss 카운터도 프로세스 전체 기준)
+transcript_cache = TranscriptCache(
+    Path("downloads") / ".transcript_cache",
+    max_bytes=int(float(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", 200)) * 1024 * 1024),
+)
+
+
+class TranscriptionWorkerPool:
+    """
+    모델을 한 번만 로드해 두고 여러 영상에 재사용하는 전사 전용 워커 프로세스 풀.
+    작업 큐로 오디오를 받아 결과 큐로 세그먼트 결과를 돌려주며, 워커당 torch 스레드 수를 제한해
+    전체 스레드 수가 코어 수를 넘지 않게 합니다. 워커는 첫 작업이 제출될 때 시작됩니다.
+    """
+
+    def __init__(self, backend_name: str, model_size: str, device: str, precision: str,
+                 workers: int, threads_per_worker: int = None):
+        self.backend_args = (backend_name, model_size, device, precision)
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, len(cpu_governor.cpus_for("transcribe")) // self.workers)
+        self._lock = threading.Lock()
+        self._processes = []
+        self._jobs = None
+        self._results = None
+        self._futures = {}
+        self._next_job_id = 0
+
+    @property
+    def running(self):
+        with self._lock:
+            return bool(self._processes)
+
+    def _start_locked(self):
+        if self._processes:
+            return
+        # 이미 torch 스레드가 떠 있는 프로세스를 fork하면 교착될 수 있으므로 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        self._jobs = context.Queue()
+        self._results = context.Queue()
+        self._processes = [
+            context.Process(
+                target=_transcription_worker_main,
+                args=(self._jobs, self._results, self.backend_args, self.threads_per_worker),
+                daemon=True,
+            )
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        threading.Thread(target=self._collect_results, args=(self._results, self._processes), daemon=True).start()
+        print(f"[DEBUG] 전사 워커 {self.workers}개 시작 (워커당 스레드 {self.threads_per_worker})")
+
+    def submit(self, audio, options) -> Future:
+        """오디오 전사 작업을 제출하고, 결과 딕셔너리로 완료되는 Future를 반환합니다."""
+        future = Future()
+        with self._lock:
+            self._start_locked()
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._futures[job_id] = future
+            self._jobs.put((job_id, audio, options))
+        return future
+
+    def wait(self, futures, stop_event: threading.Event = None, poll_interval: float = 0.5):
+        """
+        모든 작업이 끝날 때까지 기다립니다. stop_event가 설정되면 워커를 종료해
+        진행 중인 전사까지 바로 중단하고 InterruptedError를 발생시킵니다.
+        """
+        pending = set(futures)
+        while pending:
+            if stop_event is not None and stop_event.is_set():
+                self.cancel()
+                raise InterruptedError("작업이 중지되었습니다.")
+            _, pending = wait_futures(pending, timeout=poll_interval)
+
+    def _collect_results(self, results, processes):
+        while True:
+            try:
+                message = results.get(timeout=1)
+            except queue.Empty:
+                with self._lock:
+                    if self._processes is not processes:
+                        return
+                    if any(not process.is_alive() for process in processes):
+                        # 메모리 부족 등으로 워커가 죽으면 남은 작업을 모두 실패 처리하고 다음 제출 때 다시 시작
+                        self._terminate_locked(RuntimeError("전사 워커가 예기치 않게 종료되었습니다."))
+                        return
+                continue
+            if message is None:
+                return
+            job_id, result, error = message
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+            if future is None:
+                continue
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(result)
+
+    def _terminate_locked(self, error):
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._results.put(None) # 결과 수집 스레드 종료
+        futures = self._futures
+        self._processes, self._jobs, self._results, self._futures = [], None, None, {}
+        for future in futures.values():
+            future.set_exception(error)
+
+    def cancel(self):
+        """진행 중인 전사를 포함해 모든 작업을 즉시 중단합니다. 워커는 다음 제출 때 다시 시작됩니다."""
+        self.shutdown(cancel=True)
+
+    def shutdown(self, cancel: bool = False):
+        with self._lock:
+            processes, jobs = self._processes, self._jobs
+            if not processes:
+                return
+            if not cancel:
+                for _ in processes:
+                    jobs.put(None)
+        if not cancel:
+            # 워커가 결과를 모두 내보낼 수 있도록 잠금 밖에서 기다림
+            for process in processes:
+                process.join(timeout=10)
+        with self._lock:
+            if self._processes is processes:
+                self._terminate_locked(InterruptedError("전사 워커가 종료되었습니다."))
+
+
+_transcription_pools = {}
+_transcription_pools_lock = threading.Lock()
+
+
+def get_transcription_pool(backend: TranscriptionBackend, workers: int, threads_per_worker: int = None):
+    """같은 엔진/모델/워커 설정이면 이미 모델을 로드해 둔 워커 풀을 재사용합니다."""
+    key = (backend.name, backend.model_size, backend.device, backend.precision, workers, threads_per_worker)
+    with _transcription_pools_lock:
+        pool = _transcription_pools.get(key)
+        if pool is None:
+            pool = TranscriptionWorkerPool(backend.name, backend.model_size, backend.device, backend.precision,
+                                           workers, threads_per_worker)
+            _transcription_pools[key] = pool
+        return pool
+
+
+def shutdown_transcription_pools():
+    with _transcription_pools_lock:
+        pools = list(_transcription_pools.values())
+        _transcription_pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel=True)
+
+
+atexit.register(shutdown_transcription_pools)
+
+
+def run_streaming_process(command, on_stdout_line=None, on_stderr_line=None, stop_event: threading.Event = None):
+    """
+    하위 프로세스를 실행하면서 stdout/stderr를 각각의 스레드에서 동시에 읽어 한 줄씩 콜백으로 넘깁니다.
+    한쪽 출력만 읽다가 다른 쪽 파이프가 가득 차 자식 프로세스가 멈추는 일이 없고, 콜백은 호출한 스레드에서 실행됩니다.
+    stop_event가 설정되면 프로세스를 종료하고 InterruptedError를 발생시킵니다.
+    (종료 코드, stderr 마지막 부분)을 반환합니다.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding="utf-8", errors="replace")
+    lines = queue.Queue()
+
+    def pump(stream, name):
+        try:
+            for line in stream:
+                lines.put((name, line))
+        finally:
+            lines.put((name, None)) # 스트림이 닫혔다는 표시
+
+    for stream, name in ((process.stdout, "stdout"), (process.stderr, "stderr")):
+        threading.Thread(target=pump, args=(stream, name), daemon=True, name=f"subprocess-{name}").start()
+
+    stderr_tail = collections.deque(maxlen=50) # 오류 메시지용으로 마지막 몇 줄만 보관
+    open_streams = 2
+    try:
+        while open_streams:
+            if stop_event is not None and stop_event.is_set():
+                raise InterruptedError("작업이 중지되었습니다.")
+            try:
+                name, line = lines.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if line is None:
+                open_streams -= 1
+            elif name == "stdout":
+                if on_stdout_line is not None:
+                    on_stdout_line(line.rstrip("\n"))
+            else:
+                stderr_tail.append(line)
+                if on_stderr_line is not None:
+                    on_stderr_line(line.rstrip("\n"))
+        return process.wait(), "".join(stderr_tail).strip()
+    finally:
+        if process.poll() is None: # 중지되었거나 콜백에서 예외가 난 경우
+            process.kill()
+            process.wait()
+
+
+# yt-dlp 포맷 선택: 영상+오디오(병합) / 대본 생성 전용 오디오
+# 오디오만 있는 스트림이 없는 사이트(예: TikTok)는 오디오가 들어 있는 가장 작은 파일로 대체합니다.
+VIDEO_FORMAT = "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best"
+AUDIO_ONLY_FORMAT = "bestaudio[ext=m4a]/bestaudio/worst[acodec!=none]/best"
+
+
+class DownloadEngineError(Exception):
+    """yt-dlp 추출/다운로드 실패 (파이썬 API와 CLI 대체 경로 공통)"""
+
+
+class YtDlpEngine:
+    """
+    yt-dlp를 프로세스 안에서 파이썬 API로 구동하는 다운로드 엔진입니다.
+    스레드마다 옵션 조합별로 오래 유지되는 YoutubeDL 인스턴스를 재사용하므로, 영상마다 새 인터프리터를 띄우고
+    추출기를 다시 임포트하는 비용과 표준 출력을 정규식으로 파싱하는 과정이 없어집니다.
+    결과는 구조화된 info 딕셔너리로 돌려주고, 진행 상황은 progress hook으로 전달합니다.
+    yt_dlp 모듈을 임포트할 수 없으면 yt-dlp CLI를 실행하는 방식으로 대체합니다.
+    """
+    BASE_OPTIONS = {
+        'quiet': True,
+        'no_warnings': True,
+        'noprogress': True,
+        'restrictfilenames': True,
+    }
+    # CLI 대체 경로에서 YoutubeDL 옵션을 명령행 인자로 바꾸는 규칙
+    CLI_FLAGS = {
+        'format': lambda v: ["-f", v],
+        'outtmpl': lambda v: ["-o", v],
+        'noplaylist': lambda v: ["--no-playlist" if v else "--yes-playlist"],
+        'download_archive': lambda v: ["--download-archive", v],
+        'extract_flat': lambda v: ["--flat-playlist"] if v else [],
+        'ignoreerrors': lambda v: ["--ignore-errors"] if v else [],
+        'restrictfilenames': lambda v: ["--restrict-filenames"] if v else [],
+        'no_warnings': lambda v: ["--no-warnings"] if v else [],
+        'continuedl': lambda v: ["--continue" if v else "--no-continue"],
+    }
+    PROGRESS_MARKER = "__progress__" # CLI 출력에서 진행 상황 줄을 info JSON 줄과 구분하는 접두어
+
+    def __init__(self):
+        self._local = threading.local()
+        self._yt_dlp = None
+
+    @property
+    def in_process(self):
+        """yt_dlp 모듈을 사용할 수 있으면 True (처음 확인할 때 임포트)"""
+        if self._yt_dlp is None:
+            try:
+                import yt_dlp
+                self._yt_dlp = yt_dlp
+            except ImportError:
+                print("[DEBUG] yt_dlp 모듈이 없어 yt-dlp CLI를 사용합니다.")
+                self._yt_dlp = False
+        return bool(self._yt_dlp)
+
+    def _ydl(self, options):
+        """현재 스레드에서 같은 옵션으로 만든 YoutubeDL 인스턴스를 재사용합니다."""
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+        key = json.dumps(options, sort_keys=True, default=str)
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = self._yt_dlp.YoutubeDL({**self.BASE_OPTIONS, **options, 'progress_hooks': [self._dispatch_progress]})
+            instances[key] = ydl
+        return ydl
+
+    def _dispatch_progress(self, progress):
+        stop_event = getattr(self._local, "stop_event", None)
+        if stop_event is not None and stop_event.is_set():
+            raise self._yt_dlp.utils.DownloadCancelled("작업이 중지되었습니다.")
+        callback = getattr(self._local, "progress_callback", None)
+        if callback is not None:
+            callback(self._normalize_progress(progress))
+
+    @staticmethod
+    def _normalize_progress(progress):
+        """yt-dlp progress 딕셔너리(프로세스 안 hook 또는 CLI progress template JSON)를 같은 모양으로 맞춥니다."""
+        info = progress.get('info_dict') or {}
+        return {
+            'status': progress.get('status'),
+            'filename': progress.get('filename'),
+            'downloaded_bytes': progress.get('downloaded_bytes'),
+            'total_bytes': progress.get('total_bytes') or progress.get('total_bytes_estimate'),
+            'speed': progress.get('speed'),
+            'eta': progress.get('eta'),
+            'fragment_index': progress.get('fragment_index'), # HLS/DASH 조각 단위 다운로드일 때
+            'fragment_count': progress.get('fragment_count'),
+            'playlist_index': progress.get('playlist_index', info.get('playlist_index')), # 재생목록 다운로드일 때 몇 번째 영상인지
+            'playlist_count': progress.get('playlist_count', info.get('playlist_count')),
+        }
+
+    def extract_info(self, url, options: dict = None, stop_event: threading.Event = None):
+        """다운로드 없이 메타데이터만 추출합니다."""
+        return self._run(url, options or {}, download=False, progress_callback=None, stop_event=stop_event)
+
+    def download(self, url, options: dict = None, progress_callback=None, stop_event: threading.Event = None):
+        """
+        다운로드하고 info 딕셔너리를 반환합니다. 실제 저장 경로는 downloaded_files(info)로 얻습니다.
+        progress_callback은 status/filename/downloaded_bytes/total_bytes/speed/eta 딕셔너리를 받습니다.
+        """
+        return self._run(url, options or {}, download=True, progress_callback=progress_callback, stop_event=stop_event)
+
+    def iter_entries(self, url, options: dict = None, stop_event: threading.Event = None, match_filter: str = None):
+        """
+        재생목록/채널의 항목 정보를 목록 전체를 기다리지 않고 받아오는 대로 하나씩 내보냅니다 (제너레이터).
+        페이지는 필요할 때만 가져오므로, 중간에 반복을 멈추면(close) 나머지 목록은 요청하지 않습니다.
+        match_filter(yt-dlp 필터 문자열)를 주면 조건에 맞지 않는 항목은 추출기 쪽에서 버립니다 (없는 필드는 통과).
+        """
+        options = options or {}
+        if not self.in_process:
+            yield from self._iter_entries_cli(url, options, stop_event, match_filter)
+            return
+        ydl = self._ydl(options)
+        try:
+            # process=False: 항목을 한꺼번에 풀어내지 않고 추출기가 만든 지연(lazy) 목록을 그대로 받음
+            info = ydl.extract_info(url, download=False, process=False)
+            for _ in range(3): # 채널 URL이 실제 목록 탭으로 넘겨주는 경우 따라감
+                if not info or info.get('_type') not in ("url", "url_transparent"):
+                    break
+                info = ydl.extract_info(info['url'], download=False, process=False, ie_key=info.get('ie_key'))
+            if not info:
+                raise DownloadEngineError(f"정보를 가져오지 못했습니다: {url}")
+            if info.get('_type') != "playlist":
+                yield ydl.sanitize_info(info)
+                return
+            yield from self._iter_playlist_entries(ydl, info, stop_event, match_filter)
+        except self._yt_dlp.utils.YoutubeDLError as e:
+            # 지연 목록은 반복하는 도중에 페이지를 가져오므로, 그때 난 ExtractorError 등은 DownloadError로 감싸지지 않은 채 올라옴
+            raise DownloadEngineError(str(e)) from e
+
+    def matches_filter(self, entry, match_filter):
+        """
+        항목이 yt-dlp match filter 문자열에 맞는지 로컬에서 확인합니다 (없는 필드는 통과).
+        yt_dlp 모듈이 없으면 True를 반환하므로, 호출하는 쪽의 ChannelFilter.check가 같은 조건을 다시 확인해야 합니다.
+        """
+        if not match_filter or not self.in_process:
+            return True
+        return self._yt_dlp.utils.match_str(match_filter, entry, incomplete=True)
+
+    def _iter_playlist_entries(self, ydl, playlist, stop_event, match_filter):
+        for entry in playlist.get('entries') or []:
+            if stop_event is not None and stop_event.is_set():
+                raise InterruptedError("작업이 중지되었습니다.")
+            if not entry:
+                continue
+            if entry.get('_type') == "playlist": # 탭 안의 하위 목록
+                yield from self._iter_playlist_entries(ydl, entry, stop_event, match_filter)
+            elif self.matches_filter(entry, match_filter):
+                yield ydl.sanitize_info(entry)
+
+    def _iter_entries_cli(self, url, options, stop_event, match_filter):
+        command = ["yt-dlp"]
+        for name, value in {**self.BASE_OPTIONS, **options, 'extract_flat': True}.items():
+            if name in self.CLI_FLAGS:
+                command += self.CLI_FLAGS[name](value)
+        if match_filter:
+            command += ["--match-filters", match_filter]
+        command += ["--dump-json", url] # --flat-playlist와 함께 쓰면 항목마다 JSON 한 줄(NDJSON)
+
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+        # stderr를 따로 비우지 않으면 경고가 많을 때 파이프가 가득 차서 yt-dlp가 멈춤
+        stderr_lines = []
+        stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+        stderr_thread.start()
+        try:
+            for line in process.stdout:
+                if stop_event is not None and stop_event.is_set():
+                    raise InterruptedError("작업이 중지되었습니다.")
+                if line.strip():
+                    yield json.loads(line)
+            process.wait()
+            stderr_thread.join()
+            if process.returncode != 0:
+                raise DownloadEngineError("".join(stderr_lines).strip() or f"yt-dlp 종료 코드 {process.returncode}")
+        finally:
+            if process.poll() is None: # 중지되었거나 호출한 쪽이 반복을 멈춤
+                process.kill()
+                process.wait()
+
+    def _run(self, url, options, download, progress_callback, stop_event):
+        if not self.in_process:
+            return self._run_cli(url, options, download, progress_callback, stop_event)
+        ydl = self._ydl(options)
+        self._local.progress_callback = progress_callback
+        self._local.stop_event = stop_event
+        try:
+            info = ydl.extract_info(url, download=download)
+        except self._yt_dlp.utils.DownloadCancelled:
+            raise InterruptedError("작업이 중지되었습니다.")
+        except self._yt_dlp.utils.DownloadError as e:
+            raise DownloadEngineError(str(e)) from e
+        finally:
+            self._local.progress_callback = None
+            self._local.stop_event = None
+        if info is None:
+            if download and options.get('download_archive'): # 아카이브에 있어 추출 전에 건너뜀 (CLI 경로와 같은 빈 목록)
+                return {'_type': "playlist", 'entries': []}
+            raise DownloadEngineError(f"정보를 가져오지 못했습니다: {url}")
+        return ydl.sanitize_info(info)
+
+    def _run_cli(self, url, options, download, progress_callback, stop_event):
+        command = ["yt-dlp"]
+        for name, value in {**self.BASE_OPTIONS, **options}.items():
+            if name in self.CLI_FLAGS:
+                command += self.CLI_FLAGS[name](value)
+        if download:
+            # 파일 이동까지 끝난 뒤 영상마다 최종 경로가 담긴 info JSON을 한 줄씩 출력
+            command += ["--print", "after_move:%()j"]
+            if progress_callback is not None:
+                # 진행 상황을 사람이 읽는 진행 막대 대신 한 줄에 하나씩 JSON으로 출력
+                command += ["--newline", "--progress", "--progress-template",
+                            f"download:{self.PROGRESS_MARKER} %(info.playlist_index)s %(info.playlist_count)s %(progress)j"]
+        else:
+            command += ["--dump-single-json"]
+        command.append(url)
+
+        info_lines = []
+
+        def on_stdout_line(line):
+            if not line.startswith(self.PROGRESS_MARKER):
+                if line.strip():
+                    info_lines.append(line)
+                return
+            try:
+                _, playlist_index, playlist_count, payload = line.split(" ", 3)
+                progress = json.loads(payload)
+            except ValueError:
+                return
+            progress['playlist_index'] = int(playlist_index) if playlist_index.isdigit() else None # 없으면 "NA"
+            progress['playlist_count'] = int(playlist_count) if playlist_count.isdigit() else None
+            progress_callback(self._normalize_progress(progress))
+
+        returncode, stderr = run_streaming_process(command, on_stdout_line, stop_event=stop_event)
+        if returncode != 0:
+            raise DownloadEngineError(stderr or f"yt-dlp 종료 코드 {returncode}")
+
+        infos = [json.loads(line) for line in info_lines]
+        if download and len(infos) != 1: # 재생목록 (아카이브에 있는 영상만 있었다면 빈 목록)
+            return {'_type': "playlist", 'entries': infos}
+        if not infos:
+            raise DownloadEngineError(f"정보를 가져오지 못했습니다: {url}")
+        return infos[0]
+
+    @staticmethod
+    def downloaded_files(info):
+        """info(단일 영상 또는 재생목록)에서 실제로 저장된 파일 경로들을 순서대로 꺼냅니다."""
+        if not info:
+            return []
+        if info.get('_type') == "playlist" or 'entries' in info:
+            return [path for entry in info.get('entries') or [] for path in YtDlpEngine.downloaded_files(entry)]
+        paths = [download.get('filepath') for download in info.get('requested_downloads') or []]
+        paths = [path for path in paths if path] or ([info['filepath']] if info.get('filepath') else [])
+        return [path for path in paths if os.path.exists(path)]
+
+
+download_engine = YtDlpEngine()
+
+
+class StagedPipeline:
+    """
+    단계(stage)들을 크기가 제한된 큐로 연결해 동시에 실행하는 파이프라인입니다.
+    stages는 [(이름, 함수, 워커 수), ...]이며, 함수가 None을 반환하면 그 항목은 다음 단계로 넘어가지 않습니다.
+    큐가 가득 차면 앞 단계가 기다리므로(backpressure) 느린 단계 앞에 작업이 끝없이 쌓이지 않고,
+    네트워크 위주 단계와 CPU 위주 단계가 겹쳐 실행되어 전체 시간이 가장 느린 단계에 가까워집니다.
+    """
+    _END = object() # 앞 단계가 모두 끝났다는 표시
+
+    def __init__(self, stages, queue_size: int = 2, stop_event: threading.Event = None):
+        # 워커 수가 0 이하로 설정되어도 단계마다 최소 1개는 실행 (스레드 수, 남은 워커 수, 종료 표시 수를 모두 이 값으로 맞춤)
+        self.stages = [(name, func, max(1, workers)) for name, func, workers in stages]
+        self.queue_size = max(1, queue_size)
+        self.stop_event = stop_event if stop_event else threading.Event()
+        self.busy_seconds = {name: 0.0 for name, _, _ in stages} # 단계별 누적 처리 시간 (병목 확인용)
+
+    def _put(self, target, item):
+        while not self.stop_event.is_set():
+            try:
+                target.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source):
+        while not self.stop_event.is_set():
+            try:
+                return source.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return None
+
+    def run(self, items):
+        """items(리스트나 제너레이터)를 파이프라인에 흘려보내고, 마지막 단계의 결과를 입력 순서대로 반환합니다."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [workers for _, _, workers in self.stages]
+        results = {}
+        lock = threading.Lock()
+
+        def feed():
+            try:
+                for index, item in enumerate(items):
+                    if not self._put(queues[0], (index, item)):
+                        return
+            except InterruptedError:
+                pass
+            except Exception as e: # 제너레이터 입력이 중간에 실패해도 이미 넣은 항목은 끝까지 처리
+                print(f"[파이프라인] 입력 목록을 읽는 중 오류: {e}")
+            for _ in range(self.stages[0][2]):
+                self._put(queues[0], self._END)
+
+        def work(stage_index):
+            name, func, _ = self.stages[stage_index]
+            inbox = queues[stage_index]
+            outbox = queues[stage_index + 1] if stage_index + 1 < len(queues) else None
+            while True:
+                item = self._get(inbox)
+                if item is None: # 중지됨
+                    return
+                if item is self._END:
+                    break
+                index, value = item
+                started = time.monotonic()
+                try:
+                    output = func(value)
+                except Exception as e:
+                    print(f"[파이프라인:{name}] 처리 중 오류: {e}")
+                    output = None
+                with lock:
+                    self.busy_seconds[name] += time.monotonic() - started
+                if output is None:
+                    continue
+                if outbox is None:
+                    with lock:
+                        results[index] = output
+                elif not self._put(outbox, (index, output)):
+                    return
+            with lock:
+                remaining[stage_index] -= 1
+                last_worker = remaining[stage_index] == 0
+            if last_worker and outbox is not None: # 이 단계의 마지막 워커가 다음 단계에 종료를 알림
+                for _ in range(self.stages[stage_index + 1][2]):
+                    self._put(outbox, self._END)
+
+        threads = [threading.Thread(target=feed, daemon=True, name="pipeline-feed")]
+        for stage_index, (name, _, workers) in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(stage_index,), daemon=True, name=f"pipeline-{name}")
+                        for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print("[DEBUG] 파이프라인 단계별 처리 시간: " + ", ".join(f"{name} {seconds:.1f}초" for name, seconds in self.busy_seconds.items()))
+        return [results[index] for index in sorted(results)]
+
+
+# 서버가 요청을 제한하고 있다는 뜻의 오류 (동시 다운로드 수를 줄일 신호)
+THROTTLE_DOWNLOAD_ERRORS = ("HTTP Error 429", "Too Many Requests", "HTTP Error 403")
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD(가산 증가/곱셈 감소) 방식으로 동시 다운로드 수의 한도(limit)를 조절합니다.
+    - 성공이 현재 한도만큼 쌓일 때마다 한도를 1 늘립니다. 단, 늘린 뒤 처리량(바이트/초)이 이전 한도보다 10% 넘게 줄었다면 되돌립니다.
+    - 429/403 같은 제한 응답이나, 첫 바이트까지의 지연이 지금까지의 최소 지연의 latency_factor배를 넘으면 한도를 decrease_factor배로 줄입니다.
+    - 줄인 뒤 cooldown초 동안은 다시 줄이지 않아, 같은 혼잡 때문에 한꺼번에 실패한 요청들이 한도를 연달아 깎지 않게 합니다.
+    metrics()로 현재 한도와 진행 중인 다운로드 수, 관측값을 확인할 수 있습니다.
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 16,
+                 decrease_factor: float = 0.5, latency_factor: float = 3.0, cooldown: float = 2.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.counts = {'success': 0, 'failed': 0, 'throttled': 0, 'slow': 0, 'increases': 0, 'decreases': 0}
+        self.min_latency = None
+        self.last_throughput = None # 바이트/초
+        self._previous = None # 마지막으로 늘리기 전의 (한도, 처리량)
+        self._cooldown_until = 0.0
+        self._condition = threading.Condition()
+        self._reset_window_locked()
+
+    def _reset_window_locked(self):
+        self._window_started = time.monotonic()
+        self._window_bytes = 0
+        self._window_successes = 0
+
+    def acquire(self, stop_event: threading.Event = None):
+        """자리가 날 때까지 기다립니다. 기다리는 동안 중지되면 False."""
+        with self._condition:
+            while self.in_flight >= self.limit:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                self._condition.wait(0.2)
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _decrease_locked(self, reason):
+        self.counts[reason] += 1
+        now = time.monotonic()
+        if now < self._cooldown_until:
+            return
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            print(f"[DEBUG] 동시 다운로드 한도 감소 ({reason}): {self.limit} → {new_limit}")
+            self.limit = new_limit
+            self.counts['decreases'] += 1
+        self._cooldown_until = now + self.cooldown
+        self._previous = None
+        self._reset_window_locked()
+
+    def record(self, outcome, latency: float = None, nbytes: int = 0):
+        """
+        다운로드 하나의 결과를 반영합니다. outcome은 "success", "throttled"(제한 응답), "failed"(그 밖의 실패)이며,
+        latency는 첫 바이트까지 걸린 시간(초), nbytes는 받은 바이트 수입니다.
+        """
+        with self._condition:
+            if outcome == "throttled":
+                self._decrease_locked("throttled")
+            elif outcome == "failed":
+                self.counts['failed'] += 1
+            else:
+                self.counts['success'] += 1
+                if latency is not None:
+                    if self.min_latency is not None and latency > max(self.min_latency * self.latency_factor, 0.05):
+                        self._decrease_locked("slow") # 서버/회선이 밀리고 있음
+                        self._condition.notify_all()
+                        return
+                    self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+                self._window_bytes += nbytes
+                self._window_successes += 1
+                if self._window_successes >= self.limit:
+                    elapsed = max(time.monotonic() - self._window_started, 1e-6)
+                    throughput = self._window_bytes / elapsed
+                    self.last_throughput = throughput
+                    if self._previous and throughput < self._previous[1] * 0.9:
+                        # 한도를 늘렸는데 처리량이 줄었음 → 이전 한도로 되돌리고 유지
+                        self.limit = self._previous[0]
+                        self._previous = None
+                    elif self.limit < self.max_limit:
+                        self._previous = (self.limit, throughput)
+                        self.limit += 1
+                        self.counts['increases'] += 1
+                        self.peak_limit = max(self.peak_limit, self.limit)
+                    self._reset_window_locked()
+            self._condition.notify_all()
+
+    def metrics(self):
+        with self._condition:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'peak_limit': self.peak_limit,
+                'min_latency': self.min_latency,
+                'throughput_bps': self.last_throughput,
+                **self.counts,
+            }
+
+
+class DownloadManager:
+    """
+    여러 URL을 동시에 내려받는 다운로드 관리자입니다.
+    전체 동시 다운로드 수(workers)와 호스트별 동시 다운로드 수(per_host)를 제한하고, 결과는 입력 순서대로 돌려줍니다.
+    download_func(url, progress_callback)는 성공 시 결과, 실패 시 None을 반환해야 합니다.
+    progress_callback(index, progress)에는 항목별로 started → (엔진 진행 상황) → done/failed/cancelled가 전달됩니다.
+    controller(AdaptiveConcurrency)를 주면 고정된 workers 대신 관측한 처리량/제한 응답/지연에 따라 동시 다운로드 수를 조절합니다.
+    이때 download_func가 보내는 retry/error 진행 상황의 오류 메시지로 제한 응답(429/403)을 판단합니다.
+    """
+
+    def __init__(self, download_func, workers: int = 4, per_host: int = 2,
+                 stop_event: threading.Event = None, progress_callback=None, controller: AdaptiveConcurrency = None):
+        self.download_func = download_func
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.stop_event = stop_event if stop_event else threading.Event()
+        self.progress_callback = progress_callback
+        self.controller = controller
+        self._slots = threading.BoundedSemaphore(self.max_workers) # download()로 받을 때의 전체 동시 다운로드 수
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self):
+        """동시에 진행될 수 있는 최대 다운로드 수 (controller가 있으면 그 한도가 실제 동시 수를 정함)"""
+        return self.controller.max_limit if self.controller is not None else self.workers
+
+    def _host_slot(self, url):
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with self._lock:
+            return self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+
+    def _report(self, index, progress):
+        if self.progress_callback is not None:
+            self.progress_callback(index, progress)
+
+    def _download_one(self, index, url):
+        if self.controller is not None and not self.controller.acquire(self.stop_event):
+            self._report(index, {'status': "cancelled"})
+            return None
+        try:
+            with self._host_slot(url):
+                if self.stop_event.is_set(): # 자리를 기다리는 동안 중지된 경우
+                    self._report(index, {'status': "cancelled"})
+                    return None
+                self._report(index, {'status': "started", 'url': url})
+                observed = {'started': time.monotonic(), 'first_byte': None, 'bytes': 0, 'throttled': False}
+
+                def on_progress(progress):
+                    if progress.get('downloaded_bytes'):
+                        if observed['first_byte'] is None:
+                            observed['first_byte'] = time.monotonic() - observed['started']
+                        observed['bytes'] = max(observed['bytes'], progress['downloaded_bytes'])
+                    if progress.get('status') == "retry":
+                        observed['started'] = time.monotonic() + progress.get('delay', 0) # 백오프 대기는 지연에 포함하지 않음
+                    if progress.get('status') in ("retry", "error") and self.controller is not None:
+                        if any(pattern in str(progress.get('error', "")) for pattern in THROTTLE_DOWNLOAD_ERRORS):
+                            observed['throttled'] = True
+                            self.controller.record("throttled") # 재시도를 기다리는 동안 다른 다운로드부터 줄임
+                    self._report(index, progress)
+
+                try:
+                    result = self.download_func(url, on_progress)
+                except Exception as e:
+                    print(f"다운로드 중 오류 ({url}): {e}")
+                    result = None
+            if self.controller is not None and not self.stop_event.is_set():
+                if result:
+                    self.controller.record("success", latency=observed['first_byte'], nbytes=observed['bytes'])
+                elif not observed['throttled']:
+                    self.controller.record("failed")
+        finally:
+            if self.controller is not None:
+                self.controller.release()
+        self._report(index, {'status': "done" if result else ("cancelled" if self.stop_event.is_set() else "failed")})
+        return result
+
+    def download(self, index, url):
+        """
+        URL 하나를 전체/호스트별 제한 안에서 내려받습니다 (실패/중지 시 None).
+        항목을 하나씩 받는 파이프라인 단계에서 호출하며, 진행 상황은 index로 구분됩니다.
+        """
+        with self._slots:
+            return self._download_one(index, url)
+
+    def metrics(self):
+        """현재 동시 다운로드 한도와 관측값 (controller가 없으면 고정 설정값)"""
+        metrics = {'workers': self.workers, 'per_host': self.per_host}
+        if self.controller is not None:
+            metrics.update(self.controller.metrics())
+        return metrics
+
+    def run(self, urls):
+        """urls를 동시에 내려받아 입력 순서대로 결과 리스트를 반환합니다 (실패/중지된 항목은 None)."""
+        results = [None] * len(urls)
+        if not urls:
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)), thread_name_prefix="download") as executor:
+            futures = {executor.submit(self._download_one, index, url): index for index, url in enumerate(urls)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait_futures(pending, timeout=0.5)
+                for future in done:
+                    if not future.cancelled():
+                        results[futures[future]] = future.result()
+                if self.stop_event.is_set():
+                    # 시작 전 항목은 취소하고, 진행 중인 다운로드는 stop_event로 엔진에서 중단됨
+                    for future in pending:
+                        future.cancel()
+        return results
+
+
+class ProgressReporter:
+    """
+    다운로드 진행 상황(엔진의 progress 딕셔너리)을 파일별 진행률과 전체 진행률(0~100)로 합쳐
+    callback(percent, detail)에 전달합니다. 호출은 min_interval초에 한 번으로 제한해 GUI가 청크마다 갱신되지 않게 합니다.
+    항목은 progress의 index(DownloadManager) 또는 playlist_index(재생목록)로 구분하고, total_items를 모르면 playlist_count/total을 씁니다.
+    VideoProcessor.on_download_progress에 그대로 넣어 쓸 수 있습니다.
+    """
+
+    def __init__(self, callback, total_items: int = None, min_interval: float = 0.25):
+        self.callback = callback
+        self.total_items = total_items
+        self.min_interval = min_interval
+        self._fractions = {} # 항목별 진행률 (0.0~1.0, 뒤로 가지 않음)
+        self._last_percent = None
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, progress):
+        key = progress.get('index', progress.get('playlist_index'))
+        if key is None:
+            key = 0
+        status = progress.get('status')
+        with self._lock:
+            fraction = self._fractions.get(key, 0.0)
+            if status in ("finished", "done", "failed", "cancelled"):
+                fraction = 1.0
+            elif progress.get('total_bytes') and progress.get('downloaded_bytes') is not None:
+                fraction = max(fraction, progress['downloaded_bytes'] / progress['total_bytes'])
+            elif progress.get('fragment_count') and progress.get('fragment_index') is not None:
+                fraction = max(fraction, progress['fragment_index'] / progress['fragment_count'])
+            self._fractions[key] = min(fraction, 1.0)
+
+            total = self.total_items or progress.get('playlist_count') or progress.get('total') or len(self._fractions)
+            percent = min(100, int(100 * sum(self._fractions.values()) / max(total, 1)))
+            now = time.monotonic()
+            if percent == self._last_percent or (now - self._last_emit < self.min_interval and percent < 100):
+                return
+            self._last_percent = percent
+            self._last_emit = now
+            detail = {
+                'current': self._fractions[key],
+                'items_done': sum(1 for value in self._fractions.values() if value >= 1.0),
+                'total_items': total,
+                'speed': progress.get('speed'),
+                'eta': progress.get('eta'),
+            }
+        self.callback(percent, detail)
+
+
+# 채널 영상 정렬 기준: 이름 → (값을 판단하는 데 필요한 필드들, 정렬 값을 꺼내는 함수)
+# recency는 채널 목록이 최신순이라는 점을 이용해 목록 순서로 정하므로, 업로드 시각을 얻으려고 영상마다 전체 정보를 추출하지 않음
+VIDEO_SORT_KEYS = {
+    "views": (('view_count',), lambda video: video.get('view_count') or 0),
+    "recency": ((), None),
+    "duration": (('duration',), lambda video: video.get('duration') or 0),
+}
+
+
+def select_top_videos(videos, top_n, sort_by="views"):
+    """
+    videos(제너레이터 가능)를 한 번 훑으면서 sort_by 기준 상위 top_n개만 크기가 top_n인 최소 힙에 남기고, 높은 순서대로 반환합니다.
+    전체를 모아 정렬하지 않으므로 메모리는 top_n개면 되고, 값이 같으면 목록에서 먼저 나온 영상이 앞섭니다.
+    정렬 값 함수가 없는 기준(recency)은 목록 순서 그대로, 즉 먼저 나온 top_n개를 고릅니다.
+    """
+    if sort_by not in VIDEO_SORT_KEYS:
+        raise ValueError(f"알 수 없는 정렬 기준입니다: {sort_by} (사용 가능: {', '.join(VIDEO_SORT_KEYS)})")
+    sort_value = VIDEO_SORT_KEYS[sort_by][1] or (lambda video: 0)
+    heap = [] # (정렬 값, -목록 순서, 영상) — 목록 순서가 모두 달라 영상 딕셔너리끼리는 비교되지 않음
+    for position, video in enumerate(videos):
+        item = (sort_value(video), -position, video)
+        if len(heap) < top_n:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]: # 힙에서 가장 낮은 후보보다 나으면 교체
+            heapq.heapreplace(heap, item)
+    return [video for _, _, video in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+
+class ChannelFilter:
+    """
+    채널 필터 조건(최소 조회수, 숏폼/롱폼, 키워드)을 한 번 해석해 두고 목록 항목에 적용합니다.
+    조회수/길이 조건은 yt-dlp match filter 문자열(match_filter)로 바꿔 추출기 쪽에서 먼저 걸러내고,
+    평면(flat) 목록 항목에 판단에 필요한 필드가 없을 때만 check()가 None(판단 불가)을 돌려주어
+    그 항목에 한해 전체 정보를 추출(enrich)하도록 합니다.
+    """
+    SHORT_FORM_MAX_SECONDS = 60 # 60초 이하는 숏폼, 초과는 롱폼
+
+    def __init__(self, min_views=None, video_type=None, keywords=None):
+        self.min_views = min_views
+        self.video_type = video_type
+        self.keywords = [kw.strip().lower() for kw in keywords.split(',') if kw.strip()] if keywords else []
+
+    @property
+    def match_filter(self):
+        """
+        yt-dlp match filter 문자열 (조건이 없으면 None).
+        '?'를 붙인 비교는 필드가 없는 항목을 통과시키므로, 평면 목록에서 값이 없는 항목은 여기서 버려지지 않고 check()로 넘어옵니다.
+        키워드는 제목 또는 설명에 있으면 되는 조건이라 필터 문자열로 표현할 수 없어 check()에서만 확인합니다.
+        """
+        conditions = []
+        if self.min_views is not None:
+            conditions.append(f"view_count >=? {int(self.min_views)}")
+        if self.video_type == "숏폼":
+            conditions.append(f"duration <=? {self.SHORT_FORM_MAX_SECONDS}")
+        elif self.video_type == "롱폼":
+            conditions.append(f"duration >? {self.SHORT_FORM_MAX_SECONDS}")
+        return " & ".join(conditions) or None
+
+    def check(self, video_info, complete: bool = False):
+        """
+        조건에 맞으면 True, 맞지 않으면 False를 반환합니다.
+        complete=False(평면 목록 항목)일 때 필요한 필드가 없어 판단할 수 없으면 None을 반환합니다.
+        complete=True면 없는 필드는 기존 방식대로 조회수 0, 길이 0, 빈 제목/설명으로 간주합니다.
+        """
+        undecided = False
+
+        if self.min_views is not None:
+            view_count = video_info.get('view_count')
+            if view_count is None and not complete:
+                undecided = True
+            elif (view_count or 0) < self.min_views:
+                return False
+
+        if self.video_type in ("숏폼", "롱폼"):
+            duration = video_info.get('duration')
+            if duration is None and not complete:
+                undecided = True
+            elif (self.video_type == "숏폼") != ((duration or 0) <= self.SHORT_FORM_MAX_SECONDS):
+                return False
+
+        if self.keywords:
+            title = (video_info.get('title') or '').lower()
+            description = video_info.get('description')
+            search_text = f"{title} {(description or '').lower()}"
+            if not all(keyword in search_text for keyword in self.keywords):
+                if description is None and not complete: # 설명에 있을 수도 있음
+                    undecided = True
+                else:
+                    return False
+
+        return None if undecided else True
+
+
+class ChannelSyncState:
+    """
+    채널별 증분 동기화 기준점(high-water mark)을 JSON 파일에 저장합니다.
+    채널마다 이미 처리한 가장 최신 영상의 ID와 업로드 시각, 최근에 본 영상 ID들을 기록해 두고,
+    다음 실행에서 목록이 이미 본 영상에 도달하면 나머지 목록을 읽지 않고 멈출 수 있게 합니다.
+    다운로드/전사에 실패했거나 처리되지 않은 영상은 retry_ids로 남겨 다음 실행에서 다시 새 영상으로 취급합니다.
+    """
+
+    def __init__(self, state_path, recent_ids: int = 200):
+        self.state_path = Path(state_path)
+        self.recent_ids = recent_ids # 채널마다 기억할 최근 영상 ID 수 (고정된 영상 등 순서가 어긋난 항목 판별용)
+        self._state = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def channel_key(url):
+        """쿼리와 끝의 '/'를 뺀 채널 URL (같은 채널의 서로 다른 표기를 하나로 취급)"""
+        parts = urllib.parse.urlsplit(url.strip())
+        host = (parts.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        return f"{host}{parts.path.rstrip('/')}"
+
+    def _load_locked(self):
+        if self._state is None:
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._state = {}
+        return self._state
+
+    def get(self, channel_url):
+        """채널의 기준점 {'last_id', 'last_timestamp', 'recent_ids', 'retry_ids', 'synced_at'} (처음이면 None)"""
+        with self._lock:
+            return self._load_locked().get(self.channel_key(channel_url))
+
+    @staticmethod
+    def is_known(mark, entry):
+        """목록 항목이 이전 동기화에서 이미 본 영상인지 확인합니다."""
+        if not mark:
+            return False
+        if entry.get('id') in mark.get('retry_ids', ()): # 지난번에 처리하지 못한 영상
+            return False
+        if entry.get('id') in mark.get('recent_ids', ()):
+            return True
+        timestamp = entry.get('timestamp')
+        return bool(timestamp and mark.get('last_timestamp') and timestamp <= mark['last_timestamp'])
+
+    def commit(self, channel_url, done_entries, failed_entries=()):
+        """
+        이번에 끝까지 처리한 항목들(최신순)로 기준점을 앞으로 옮기고 파일에 저장합니다.
+        failed_entries(실패/미처리 항목)는 retry_ids로 남기고, 업로드 시각 기준점은 그중 가장 오래된 항목보다 앞으로 옮기지 않습니다.
+        """
+        if not done_entries and not failed_entries:
+            return
+        key = self.channel_key(channel_url)
+        with self._lock:
+            state = self._load_locked()
+            mark = state.get(key) or {}
+            done_ids = [entry['id'] for entry in done_entries if entry.get('id')]
+            failed_ids = [entry['id'] for entry in failed_entries if entry.get('id')]
+            recent_ids = [video_id for video_id in dict.fromkeys(done_ids + mark.get('recent_ids', [])) if video_id not in failed_ids]
+            timestamps = [entry['timestamp'] for entry in done_entries if entry.get('timestamp')]
+            if failed_entries:
+                failed_timestamps = [entry.get('timestamp') for entry in failed_entries]
+                if None in failed_timestamps: # 실패한 항목의 시각을 모르면 시각 기준점은 그대로 둠
+                    timestamps = []
+                else:
+                    timestamps = [timestamp for timestamp in timestamps if timestamp < min(failed_timestamps)]
+            state[key] = {
+                # 다시 시도해 성공한 예전 영상이 아니라 새로 처리한 영상 중 가장 최신인 것
+                'last_id': next((video_id for video_id in done_ids if video_id not in mark.get('retry_ids', [])), mark.get('last_id')),
+                'last_timestamp': max(timestamps + ([mark['last_timestamp']] if mark.get('last_timestamp') else []), default=None),
+                'recent_ids': recent_ids[:self.recent_ids],
+                # 이전 실행의 retry_ids는 모두 이번 목록에서 다시 확인했으므로 이번 실패만 남김
+                'retry_ids': failed_ids,
+                'synced_at': int(time.time()),
+            }
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, ensure_ascii=False)
+                os.replace(tmp_path, self.state_path) # 쓰는 도중 중단되어도 이전 기준점이 남도록 원자적 교체
+            except Exception as e:
+                print(f"[DEBUG] 채널 동기화 기준점 저장 실패: {e}")
+
+
+channel_sync_state = ChannelSyncState(Path("downloads") / ".channel_sync.json")
+
+
+class SQLiteStore:
+    """
+    스레드 간에 연결 하나를 잠금으로 공유하는 작은 SQLite 저장소의 공통 부분입니다.
+    하위 클래스는 SCHEMA(CREATE TABLE 문)와 LABEL(오류 메시지용 이름)을 정합니다.
+    SQLite 오류는 출력만 하고 조회는 None/빈 목록으로 처리해, 저장소 문제로 작업 전체가 멈추지 않게 합니다.
+    """
+    SCHEMA = ""
+    LABEL = "저장소"
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._conn = None # 처음 사용할 때 연결
+        self._lock = threading.Lock()
+
+    def _connection_locked(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def _query(self, sql, params=()):
+        try:
+            with self._lock:
+                return self._connection_locked().execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            print(f"[DEBUG] {self.LABEL} 조회 실패: {e}")
+            return None
+
+    def _query_all(self, sql, params=()):
+        try:
+            with self._lock:
+                return self._connection_locked().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"[DEBUG] {self.LABEL} 조회 실패: {e}")
+            return []
+
+    def _write(self, statements):
+        try:
+            with self._lock:
+                conn = self._connection_locked()
+                with conn: # 하나의 트랜잭션으로 커밋
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+        except sqlite3.Error as e:
+            print(f"[DEBUG] {self.LABEL} 저장 실패: {e}")
+
+
+class MetadataCache(SQLiteStore):
+    """
+    영상 메타데이터와 채널 목록을 SQLite 파일에 보관하는 영구 캐시입니다.
+    영상은 추출기 이름과 영상 ID를 합친 키(예: "youtube:abc123")로, 채널 목록은 채널 URL로 저장하며
+    각각 TTL이 지나면 다시 가져옵니다. 채널 목록은 필터 없이 받은 전체 평면 목록을 저장하므로,
+    같은 채널을 필터 조건만 바꿔 다시 실행하면 네트워크 없이 로컬에서 필터링됩니다.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS videos (video_key TEXT PRIMARY KEY, info TEXT NOT NULL, fetched_at REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS video_urls (url TEXT PRIMARY KEY, video_key TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS listings (channel_key TEXT PRIMARY KEY, entries TEXT NOT NULL, fetched_at REAL NOT NULL);
+    """
+    LABEL = "메타데이터 캐시"
+    # 필터링/분석에 쓰지 않는 큰 필드는 저장하지 않음
+    DROP_KEYS = ('formats', 'requested_formats', 'requested_downloads', 'thumbnails', 'subtitles',
+                 'automatic_captions', 'heatmap', 'http_headers', 'fragments')
+
+    def __init__(self, db_path, video_ttl: float = 24 * 3600, listing_ttl: float = 6 * 3600):
+        super().__init__(db_path)
+        self.video_ttl = video_ttl
+        self.listing_ttl = listing_ttl
+
+    @staticmethod
+    def video_key(info):
+        """추출기 이름과 영상 ID로 만든 정규 키 (ID가 없으면 None)"""
+        if not info or not info.get('id'):
+            return None
+        extractor = info.get('extractor_key') or info.get('ie_key') or info.get('extractor') or ""
+        return f"{extractor.lower()}:{info['id']}"
+
+    def get_video(self, url=None, info=None):
+        """영상 정보(목록 항목 또는 URL로 찾음). 없거나 TTL이 지났으면 None"""
+        key = self.video_key(info)
+        if key is None and url:
+            row = self._query("SELECT video_key FROM video_urls WHERE url = ?", (url,))
+            key = row[0] if row else None
+        if key is None:
+            return None
+        row = self._query("SELECT info, fetched_at FROM videos WHERE video_key = ?", (key,))
+        if not row or time.time() - row[1] > self.video_ttl:
+            return None
+        return json.loads(row[0])
+
+    def put_video(self, info, url=None):
+        key = self.video_key(info)
+        if key is None:
+            return
+        slim_info = {name: value for name, value in info.items() if name not in self.DROP_KEYS}
+        statements = [("INSERT OR REPLACE INTO videos VALUES (?, ?, ?)",
+                       (key, json.dumps(slim_info, ensure_ascii=False), time.time()))]
+        for alias in {url, info.get('webpage_url')} - {None}:
+            statements.append(("INSERT OR REPLACE INTO video_urls VALUES (?, ?)", (alias, key)))
+        self._write(statements)
+
+    def get_listing(self, channel_url):
+        """채널의 전체 평면 목록 (없거나 TTL이 지났으면 None)"""
+        row = self._query("SELECT entries, fetched_at FROM listings WHERE channel_key = ?",
+                          (ChannelSyncState.channel_key(channel_url),))
+        if not row or time.time() - row[1] > self.listing_ttl:
+            return None
+        return json.loads(row[0])
+
+    def put_listing(self, channel_url, entries):
+        self._write([("INSERT OR REPLACE INTO listings VALUES (?, ?, ?)",
+                      (ChannelSyncState.channel_key(channel_url), json.dumps(entries, ensure_ascii=False), time.time()))])
+
+
+metadata_cache = MetadataCache(
+    Path("downloads") / ".metadata_cache.sqlite3",
+    video_ttl=float(os.environ.get("METADATA_CACHE_VIDEO_TTL_HOURS", 24)) * 3600,
+    listing_ttl=float(os.environ.get("METADATA_CACHE_LISTING_TTL_HOURS", 6)) * 3600,
+) if os.environ.get("METADATA_CACHE", "1") != "0" else None
+
+
+class DownloadJobStore(SQLiteStore):
+    """
+    다운로드 작업(URL과 받는 형태 video/audio)별 상태를 기록합니다.
+    pending(진행 중이거나 중단됨) → done(완료, 최종 경로와 영상 정보 보관) / partial(일부 받은 .part 파일이 남아 이어받기 가능) / failed.
+    done인 작업은 다시 요청해도 네트워크 없이 저장된 결과를 돌려주고, 나머지는 resume_downloads()로 다시 시도합니다.
+    모든 다운로드 경로가 같은 yt-dlp 아카이브 파일(archive_path)에 완료된 영상을 기록해 서로 중복해서 받지 않습니다.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS download_jobs (
+            job_key TEXT PRIMARY KEY, url TEXT NOT NULL, media TEXT NOT NULL, state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0, error TEXT, video_info TEXT, updated_at REAL NOT NULL
+        );
+    """
+    LABEL = "다운로드 작업 기록"
+
+    def __init__(self, db_path, archive_dir):
+        super().__init__(db_path)
+        self.archive_dir = Path(archive_dir)
+        self._archive_lock = threading.Lock()
+
+    def merge_archive(self, legacy_path, media):
+        """예전에 경로별로 따로 쓰던 아카이브 파일의 기록을 공유 아카이브로 옮깁니다."""
+        legacy_path = Path(legacy_path)
+        if not legacy_path.exists():
+            return
+        path = self.archive_path(media)
+        with self._archive_lock:
+            try:
+                existing = set(path.read_text(encoding="utf-8").splitlines()) if path.exists() else set()
+                lines = [line for line in legacy_path.read_text(encoding="utf-8").splitlines() if line.strip() and line not in existing]
+                if lines:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                legacy_path.unlink()
+            except OSError as e:
+                print(f"[DEBUG] 다운로드 아카이브 병합 실패: {e}")
+
+    def archive_path(self, media):
+        """yt-dlp download_archive 파일 (오디오만 받은 영상이 영상 다운로드에서 빠지지 않도록 형태별로 따로 둠)"""
+        return self.archive_dir / (".download_archive_audio.txt" if media == "audio" else ".download_archive.txt")
+
+    def get(self, url, media):
+        row = self._query("SELECT state, attempts, error, video_info FROM download_jobs WHERE job_key = ?", (f"{media}:{url}",))
+        if not row:
+            return None
+        return {'state': row[0], 'attempts': row[1], 'error': row[2], 'video_info': json.loads(row[3]) if row[3] else None}
+
+    def mark(self, url, media, state, video_info=None, error=None, attempts=0):
+        """상태를 기록합니다. attempts는 이번에 추가로 시도한 횟수입니다."""
+        self._write([("""
+            INSERT INTO download_jobs (job_key, url, media, state, attempts, error, video_info, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_key) DO UPDATE SET state = excluded.state, attempts = attempts + excluded.attempts,
+                error = excluded.error, video_info = COALESCE(excluded.video_info, video_info), updated_at = excluded.updated_at
+        """, (f"{media}:{url}", url, media, state, attempts, error,
+              json.dumps(video_info, ensure_ascii=False) if video_info else None, time.time()))])
+
+    def unfinished(self, media):
+        """완료되지 않은(pending/partial/failed) 작업의 URL 목록 (오래된 순)"""
+        rows = self._query_all("SELECT url FROM download_jobs WHERE media = ? AND state != 'done' ORDER BY updated_at", (media,))
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def archive_line(info):
+        """yt-dlp 아카이브 형식("추출기 ID")의 한 줄 (추출기나 ID를 모르면 None)"""
+        extractor = info.get('extractor_key') or info.get('extractor')
+        if not extractor or not info.get('id'):
+            return None
+        return f"{extractor.lower()} {info['id']}"
+
+    def in_archive(self, info, media):
+        line = self.archive_line(info)
+        path = self.archive_path(media)
+        if line is None or not path.exists():
+            return False
+        with self._archive_lock:
+            try:
+                return line in path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                return False
+
+    def record_archive(self, info, media):
+        """다른 경로(계정 전체 다운로드 등)가 이 영상을 건너뛰도록 yt-dlp 아카이브 형식("추출기 ID")으로 기록합니다."""
+        line = self.archive_line(info)
+        if line is None:
+            return
+        path = self.archive_path(media)
+        with self._archive_lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                existing = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+                if line not in existing:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+            except OSError as e:
+                print(f"[DEBUG] 다운로드 아카이브 기록 실패: {e}")
+
+
+download_job_store = DownloadJobStore(Path("downloads") / ".download_jobs.sqlite3", Path("downloads"))
+
+
+# 다시 시도해도 결과가 같은 오류 (재시도하지 않음)
+PERMANENT_DOWNLOAD_ERRORS = (
+    "Unsupported URL", "Private video", "Video unavailable", "This video is private", "has been removed",
+    "HTTP Error 404", "HTTP Error 410", "not available in your country", "Sign in to confirm your age",
+)
+
+
+def retry_with_backoff(func, attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0,
+                       stop_event: threading.Event = None, on_retry=None):
+    """
+    func()를 DownloadEngineError가 나면 지수 백오프(base_delay * 2^n, 최대 max_delay)에 지터를 더해 다시 시도합니다.
+    지터는 대기 시간의 절반~전체 사이에서 무작위로 골라, 동시에 실패한 다운로드들이 같은 순간에 다시 몰리지 않게 합니다.
+    PERMANENT_DOWNLOAD_ERRORS에 해당하는 오류와 마지막 시도의 오류는 그대로 발생시킵니다.
+    on_retry(attempt, error, delay)는 다시 시도하기 전에 호출됩니다.
+    """
+    for attempt in range(1, max(1, attempts) + 1):
+        try:
+            return func()
+        except DownloadEngineError as e:
+            if attempt >= attempts or any(pattern in str(e) for pattern in PERMANENT_DOWNLOAD_ERRORS):
+                raise
+            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            if on_retry is not None:
+                on_retry(attempt, e, delay)
+            if stop_event is not None and stop_event.wait(delay): # 기다리는 동안 중지되면 바로 종료
+                raise InterruptedError("작업이 중지되었습니다.")
+
 
 class VideoProcessor:
-    def __init__(self, stop_event: threading.Event = None, api_key: str = None):
-        self.model = whisper.load_model("base")
+    def __init__(self, stop_event: threading.Event = None, api_key: str = None,
+                 model_size: str = None, device: str = None, precision: str = None,
+                 transcription_backend: str = None, transcription_profile: str = None,
+                 language: str = None):
+        # 속도 프로필(fast / balanced / accurate): 디코딩 옵션과 기본 정밀도를 정합니다.
+        self.transcription_profile = transcription_profile or os.environ.get("TRANSCRIPTION_PROFILE", DEFAULT_TRANSCRIPTION_PROFILE)
+        if self.transcription_profile not in TRANSCRIPTION_PROFILES:
+            raise ValueError(f"알 수 없는 대본 생성 프로필입니다: {self.transcription_profile} (사용 가능: {', '.join(TRANSCRIPTION_PROFILES)})")
+        # 프로필의 언어 고정을 덮어쓸 언어 코드 ("auto"면 자동 감지)
+        self.language = language or os.environ.get("TRANSCRIPTION_LANGUAGE")
+
+        # 대본 생성 엔진(whisper / faster-whisper). 모델은 실제로 대본을 생성할 때 공유 레지스트리에서 가져옵니다.
+        precision = precision or os.environ.get("WHISPER_PRECISION")
+        self.transcription_backend = create_transcription_backend(
+            transcription_backend,
+            model_size=model_size or os.environ.get("WHISPER_MODEL_SIZE", "base"),
+            device=device or os.environ.get("WHISPER_DEVICE", "cpu"),
+            precision=precision,
+        )
+        if not precision:
+            profile_precision = self.transcription_backend.precision_for_profile(TRANSCRIPTION_PROFILES[self.transcription_profile])
+            if profile_precision:
+                self.transcription_backend.precision = profile_precision
         self.download_dir = Path("downloads")
         self.download_dir.mkdir(exist_ok=True)
         self.stop_event = stop_event if stop_event else threading.Event()
+        self.transcript_cache = transcript_cache
+        # 전사 전에 무음/음악 구간을 잘라내는 VAD 사용 여부
+        self.vad_enabled = os.environ.get("TRANSCRIPTION_VAD", "1") != "0"
+        # 긴 오디오를 나눠 여러 프로세스에서 병렬 전사할 때의 청크 길이(초)와 최대 워커 수
+        self.chunk_seconds = float(os.environ.get("TRANSCRIPTION_CHUNK_SECONDS", 120))
+        self.cpu_governor = cpu_governor
+        self.download_engine = download_engine
+        # 다운로드 진행 상황을 받을 콜백 (status/filename/downloaded_bytes/total_bytes/speed/eta 딕셔너리)
+        self.on_download_progress = None
+        # 필터링된 채널 영상을 동시에 내려받을 때의 전체/호스트별 동시 다운로드 수
+        self.download_workers = int(os.environ.get("DOWNLOAD_WORKERS", 4))
+        self.download_per_host = int(os.environ.get("DOWNLOAD_PER_HOST", 4))
+        # 적응형 동시 다운로드: download_workers에서 시작해 처리량/제한 응답/지연에 따라 최대 download_max_workers까지 조절
+        self.adaptive_downloads = os.environ.get("DOWNLOAD_ADAPTIVE", "1") != "0"
+        self.download_max_workers = int(os.environ.get("DOWNLOAD_MAX_WORKERS", 16))
+        self.download_metrics = {} # 마지막 채널 파이프라인 다운로드의 동시성 지표 (DownloadManager.metrics)
+        # 채널 처리 파이프라인의 오디오 추출/분석 단계 워커 수와 단계 사이 큐 크기
+        self.audio_workers = int(os.environ.get("AUDIO_WORKERS", 2))
+        self.analysis_workers = int(os.environ.get("ANALYSIS_WORKERS", 2))
+        self.pipeline_queue_size = int(os.environ.get("PIPELINE_QUEUE_SIZE", 2))
+        # 다운로드 재시도 횟수와 첫 대기 시간(초), 작업 상태 기록/공유 아카이브
+        self.download_retries = int(os.environ.get("DOWNLOAD_RETRIES", 3))
+        self.download_retry_base_delay = float(os.environ.get("DOWNLOAD_RETRY_BASE_SECONDS", 2.0))
+        self.download_job_store = download_job_store
+        # 오디오만 받기: 대본 생성만 할 때는 영상 스트림과 병합 단계 없이 오디오만 내려받음 (영상은 ensure_video로 필요할 때)
+        self.audio_only = os.environ.get("AUDIO_ONLY_DOWNLOAD", "0") == "1"
+        # 증분 동기화: 채널/계정 목록을 이전에 처리한 영상까지만 읽고 새 영상만 처리
+        self.incremental_sync = os.environ.get("CHANNEL_INCREMENTAL_SYNC", "0") == "1"
+        # 이미 본 영상이 이만큼 연속으로 나오면 목록 읽기를 멈춤 (상단에 고정된 예전 영상 때문에 일찍 멈추지 않도록)
+        self.sync_stop_after = int(os.environ.get("CHANNEL_SYNC_STOP_AFTER", 5))
+        self.channel_sync_state = channel_sync_state
+        self._pending_channel_sync = {} # 처리가 끝나면 저장할 채널별 기준점 후보 (_iter_new_channel_entries 참고)
+        # 영상 메타데이터/채널 목록 영구 캐시 (METADATA_CACHE=0이면 None)
+        self.metadata_cache = metadata_cache
+        # 워커마다 모델을 따로 로드하므로 기본값은 코어 수가 아니라 메모리를 고려한 작은 값 (default_transcription_workers)
+        transcription_workers = os.environ.get("TRANSCRIPTION_WORKERS")
+        self.transcription_workers = int(transcription_workers) if transcription_workers else default_transcription_workers(
+            self.transcription_backend.model_size, len(self.cpu_governor.cpus_for("transcribe")))
+        # 워커당 torch 스레드 수 (미설정 시 코어 수 / 워커 수)
+        threads_per_worker = os.environ.get("TRANSCRIPTION_THREADS_PER_WORKER")
+        self.threads_per_worker = int(threads_per_worker) if threads_per_worker else None
+        # 스트리밍 전사 시 세그먼트를 모아 전달하는 간격(초)
+        self.stream_batch_interval = float(os.environ.get("TRANSCRIPT_STREAM_BATCH_SECONDS", 1.0))
         
         # API 키는 인자로 전달받거나 환경 변수에서 로드
         self.api_key = api_key if api_key else os.environ.get("GOOGLE_API_KEY")
         # print(f"[DEBUG_INIT] VideoProcessor 초기화: self.api_key 설정됨: {self.api_key is not None}, 값 시작: {self.api_key[:5]}...") # 디버그 출력 제거
 
-        # Gemini API를 위한 generation_config 설정
-        self.generation_config = genai.GenerationConfig(
-            temperature=0.9,
-            max_output_tokens=1000,
-            top_p=1.0,
-            top_k=1
-        )
+        # Gemini 모델과 generation_config는 처음 사용할 때 생성합니다 (gemini_model 속성 참고)
+        self._gemini_model = None
+        self._generation_config = None
+        self._gemini_lock = threading.Lock()
 
         # 쿠팡 파트너스 API 키 설정
         self.coupang_access_key = os.environ.get("COUPANG_PARTNERS_ACCESS_KEY")
@@ -41,18 +2200,47 @@ class VideoProcessor:
         if not self.coupang_access_key or not self.coupang_secret_key:
             print("경고: COUPANG_PARTNERS_ACCESS_KEY 또는 COUPANG_PARTNERS_SECRET_KEY 환경 변수가 설정되지 않았습니다.")
 
-        # Gemini API 설정
         if not self.api_key:
             print("경고: GOOGLE_API_KEY 환경 변수가 설정되지 않았습니다. Gemini API를 사용할 수 없습니다.")
-            self.gemini_model = None
-        else:
-            try:
-                genai.configure(api_key=self.api_key) # 환경 변수에서 가져온 키 사용
-                self.gemini_model = genai.GenerativeModel("gemini-1.5-flash", generation_config=self.generation_config)
-                # print(f"[DEBUG_INIT] Gemini 모델 초기화 성공: {self.gemini_model is not None}") # 디버그 출력 제거
-            except Exception as e:
-                print(f"[DEBUG_INIT] Gemini 모델 초기화 오류 발생: {e}") # 디버그 출력
-                self.gemini_model = None
+
+    @property
+    def transcription_pool(self):
+        """모델을 미리 로드해 둔 전사 워커 풀 (같은 설정의 VideoProcessor끼리 공유)"""
+        return get_transcription_pool(self.transcription_backend, self.transcription_workers, self.threads_per_worker)
+
+    @property
+    def model(self):
+        """현재 대본 생성 엔진의 모델 (처음 접근할 때 로드)"""
+        return self.transcription_backend.model
+
+    @property
+    def generation_config(self):
+        """Gemini API를 위한 generation_config (처음 접근할 때 생성)"""
+        if self._generation_config is None:
+            import google.generativeai as genai # Gemini API 임포트
+            self._generation_config = genai.GenerationConfig(
+                temperature=0.9,
+                max_output_tokens=1000,
+                top_p=1.0,
+                top_k=1
+            )
+        return self._generation_config
+
+    @property
+    def gemini_model(self):
+        """Gemini 모델 (API 키가 있으면 처음 접근할 때 초기화, 없거나 실패하면 None)"""
+        if not self.api_key:
+            return None
+        with self._gemini_lock:
+            if self._gemini_model is None:
+                try:
+                    import google.generativeai as genai # Gemini API 임포트
+                    genai.configure(api_key=self.api_key) # 인자 또는 환경 변수에서 가져온 키 사용
+                    self._gemini_model = genai.GenerativeModel("gemini-1.5-flash", generation_config=self.generation_config)
+                except Exception as e:
+                    print(f"[DEBUG_INIT] Gemini 모델 초기화 오류 발생: {e}") # 디버그 출력
+                    return None
+            return self._gemini_model
 
     def _check_stop_event(self):
         if self.stop_event.is_set():
@@ -68,60 +2256,92 @@ class VideoProcessor:
         '주다', '받다', '쓰다', '읽다', '듣다', '먹다', '자다', '일어나다', '앉다', '서다', '알다', '모르다'
     }
 
-    def _get_video_metadata(self, url):
-        """yt-dlp를 사용하여 영상 메타데이터를 가져옵니다."""
-        try:
-            command = [
-                "yt-dlp",
-                "--dump-json",
-                "--flat-playlist",  # For playlist URL, dump info for each video
-                "--skip-download",
-                url
-            ]
-            process = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-            metadata = json.loads(process.stdout)
-            
-            # If it's a playlist, metadata might contain 'entries'
-            if 'entries' in metadata and isinstance(metadata['entries'], list):
-                if len(metadata['entries']) > 0:
-                    metadata = metadata['entries'][0] # Take the first entry if it's a list
-                else:
-                    return None # No entries found
-            
-            video_title = metadata.get('title', metadata.get('id', 'Unknown_Title'))
-            video_id = metadata.get('id', 'Unknown_ID')
-            uploader = metadata.get('uploader', metadata.get('channel', 'Unknown_Uploader'))
-            duration = metadata.get('duration') # duration in seconds
-            original_url = metadata.get('webpage_url', url)
+    @staticmethod
+    def _video_info_from_metadata(metadata, url):
+        """yt-dlp info 딕셔너리에서 이후 단계(대본 저장, 분석)에 필요한 정보만 꺼냅니다."""
+        return {
+            'video_title': metadata.get('title', metadata.get('id', 'Unknown_Title')),
+            'video_id': metadata.get('id', 'Unknown_ID'),
+            'uploader': metadata.get('uploader', metadata.get('channel', 'Unknown_Uploader')),
+            'duration': metadata.get('duration'), # duration in seconds
+            'url': metadata.get('webpage_url', url)
+        }
 
-            return {
-                'video_title': video_title,
-                'video_id': video_id,
-                'uploader': uploader,
-                'duration': duration,
-                'url': original_url
-            }
-        except subprocess.CalledProcessError as e:
-            print(f"메타데이터 가져오기 오류 (yt-dlp): {e.stderr}")
-            return None
-        except json.JSONDecodeError as e:
-            print(f"메타데이터 JSON 파싱 오류: {e}")
-            return None
-        except Exception as e:
-            print(f"메타데이터 가져오기 중 예상치 못한 오류 발생: {e}")
-            return None
+    def _download_progress_hook(self, progress):
+        if self.on_download_progress is not None:
+            self.on_download_progress(progress)
 
-    def download_video_from_url(self, video_url):
-        """URL에서 단일 영상 다운로드 (yt-dlp 사용)"""
+    @governed_stage("download")
+    def download_video_from_url(self, video_url, progress_callback=None):
+        """
+        URL에서 단일 영상 다운로드 (yt-dlp 사용). progress_callback을 주면 on_download_progress 대신 사용합니다.
+        이미 받은 영상은 다시 받지 않고, 일시적인 오류는 백오프하며 다시 시도하며, 중단된 파일은 이어받습니다.
+        다른 경로(계정 전체 다운로드 등)가 공유 아카이브에 기록한 영상은 받지 않고 완료로 처리하며,
+        이때 반환하는 정보에는 'archived': True가 붙습니다 (파일 경로는 이 작업으로 받은 적이 있을 때만 있음).
+        """
         self._check_stop_event()
+        media = "audio" if self.audio_only else "video"
+        job = self.download_job_store.get(video_url, media)
+        if job and job['state'] == "done" and job['video_info'] and os.path.exists(job['video_info'].get('downloaded_path') or ""):
+            print(f"[DEBUG] 이미 받은 영상입니다: {job['video_info']['downloaded_path']}")
+            return job['video_info']
+        self.download_job_store.mark(video_url, media, "pending")
+
+        report = progress_callback or self._download_progress_hook
+        received_bytes = [0] # 이번 실행에서 받은 바이트 (실패했을 때 이어받을 .part 파일이 남았는지 판단)
+        attempts = [0]
+
+        def track_progress(progress):
+            received_bytes[0] = max(received_bytes[0], progress.get('downloaded_bytes') or 0)
+            report(progress)
+
+        def on_retry(attempt, error, delay):
+            print(f"다운로드 실패, {delay:.1f}초 후 다시 시도합니다 ({attempt}/{self.download_retries}): {error}")
+            report({'status': "retry", 'error': str(error), 'attempt': attempt, 'delay': delay})
+
+        def attempt_download():
+            attempts[0] += 1
+            return self.download_engine.download(
+                video_url,
+                {
+                    'outtmpl': str(staging_dir / "%(id)s.%(ext)s"), # 이름이 고정되어 있어 다시 시도하면 .part 파일을 이어받음
+                    'noplaylist': True,
+                    'format': AUDIO_ONLY_FORMAT if self.audio_only else VIDEO_FORMAT,
+                    'continuedl': True,
+                    'download_archive': str(self.download_job_store.archive_path(media)), # 계정 전체 다운로드와 같은 아카이브
+                },
+                progress_callback=track_progress,
+                stop_event=self.stop_event,
+            )
+
         try:
-            # Step 1: Get video metadata
-            video_info = self._get_video_metadata(video_url)
-            if not video_info:
-                print("영상 메타데이터를 가져오지 못했습니다. 다운로드를 계속할 수 없습니다.")
+            # 메타데이터 조회와 다운로드를 한 번의 추출로 처리합니다.
+            # 먼저 임시 폴더에 받은 뒤, 같은 결과의 업로더/길이로 최종 폴더를 정해 옮깁니다.
+            staging_dir = self.download_dir / ".staging"
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            info = retry_with_backoff(
+                attempt_download,
+                attempts=self.download_retries,
+                base_delay=self.download_retry_base_delay,
+                stop_event=self.stop_event,
+                on_retry=on_retry,
+            )
+            downloaded_files = self.download_engine.downloaded_files(info)
+            # 아카이브에 있으면 yt-dlp가 받지 않음: 추출 전에 건너뛰면 빈 목록, 추출 후에 건너뛰면 파일 없는 정보가 돌아옴
+            skipped = not info.get('entries') if info.get('_type') == "playlist" else self.download_job_store.in_archive(info, media)
+            if not downloaded_files and skipped:
+                print(f"[DEBUG] 다운로드 아카이브에 있는 영상이라 건너뜁니다: {video_url}")
+                video_info = (job or {}).get('video_info') or (
+                    self._video_info_from_metadata(info, video_url) if info.get('_type') != "playlist" else {'url': video_url})
+                video_info['archived'] = True
+                self.download_job_store.mark(video_url, media, "done", video_info=video_info, attempts=attempts[0])
+                return video_info
+            if not downloaded_files:
+                print(f"yt-dlp 다운로드 실패 또는 경로를 찾을 수 없음: {video_url}")
+                self.download_job_store.mark(video_url, media, "failed", error="다운로드된 파일 없음", attempts=attempts[0])
                 return None
 
-            video_id = video_info['video_id']
+            video_info = self._video_info_from_metadata(info, video_url)
             uploader_name = video_info['uploader'].replace('@', '') if video_info['uploader'] else "Unknown_Account"
             duration = video_info['duration']
 
@@ -135,78 +2355,97 @@ class VideoProcessor:
             base_output_dir = self.download_dir / uploader_name / video_type_folder
             base_output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Construct output template for yt-dlp
-            output_template = str(base_output_dir / "%(id)s.%(ext)s")
-            
-            command = [
-                "yt-dlp",
-                video_url,
-                "-o", output_template,
-                "--no-playlist",
-                "--restrict-filenames",
-                "-f", "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best"
-            ]
-            
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
-            download_path = None # This will be the actual downloaded path
-
-            for line in iter(process.stdout.readline, ''):
-                self._check_stop_event() # 중지 신호 확인
-                print(f"[yt-dlp] {line.strip()}") # 모든 yt-dlp 출력을 로그로
-                if "Destination:" in line and download_path is None: # Only set if not already found
-                    download_path = line.split("Destination:")[-1].strip()
-                elif "downloaded" in line.lower() and download_path is None: # general "downloaded" pattern
-                    match = re.search(r'downloaded "(.*?)"', line)
-                    if match:
-                        download_path = match.group(1).strip()
-            
-            stderr_output = process.stderr.read()
-
-            process.stdout.close()
-            process.stderr.close() # Close stderr pipe too
-            process.wait() # 프로세스 종료 대기
-
-            if self.stop_event.is_set():
-                return None
-
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr_output)
-
-            # Validate download_path or construct it based on video_info
-            if not download_path or not os.path.exists(download_path):
-                # Fallback: Construct path assuming common video formats
-                # This is a bit of a guess, better to rely on yt-dlp output
-                possible_paths = [
-                    base_output_dir / f"{video_id}.mp4",
-                    base_output_dir / f"{video_id}.webm",
-                    base_output_dir / f"{video_id}.mkv"
-                ]
-                for p in possible_paths:
-                    if os.path.exists(p):
-                        download_path = str(p)
-                        break
-                
-                if not download_path or not os.path.exists(download_path):
-                    print(f"yt-dlp 다운로드 실패 또는 경로를 찾을 수 없음: {stderr_output}")
-                    return None
+            download_path = str(base_output_dir / Path(downloaded_files[0]).name)
+            os.replace(downloaded_files[0], download_path) # 같은 downloads 폴더 안이므로 이름만 바뀜
             
             # Pass full metadata and actual downloaded path to save_transcript
             video_info['downloaded_path'] = download_path
+            video_info['media_type'] = media # 오디오만 받았다면 ensure_video로 나중에 영상을 받음
+            self.download_job_store.mark(video_url, media, "done", video_info=video_info, attempts=attempts[0])
+            self.download_job_store.record_archive(info, media)
+            if self.metadata_cache:
+                # 다운로드와 함께 추출한 전체 정보를 저장해, 이후 채널 필터링에서 이 영상은 다시 추출하지 않음
+                self.metadata_cache.put_video(info, video_url)
             return video_info # Return video_info including downloaded_path
         
         except InterruptedError:
-            if 'process' in locals() and process.poll() is None:
-                process.terminate()
-                process.wait()
             print("작업이 중지되었습니다.")
+            self.download_job_store.mark(video_url, media, "partial" if received_bytes[0] else "pending", attempts=attempts[0])
             return None
-        except subprocess.CalledProcessError as e:
-            print(f"yt-dlp 실행 오류: {e.stderr}")
+        except DownloadEngineError as e:
+            print(f"yt-dlp 실행 오류: {e}")
+            self.download_job_store.mark(video_url, media, "partial" if received_bytes[0] else "failed", error=str(e), attempts=attempts[0])
+            report({'status': "error", 'error': str(e)})
             return None
         except Exception as e:
             print(f"다운로드 중 예상치 못한 오류 발생: {e}")
+            self.download_job_store.mark(video_url, media, "failed", error=str(e), attempts=attempts[0])
+            return None
+
+    def _create_download_manager(self, download_func=None, progress_callback=None):
+        """
+        download_workers/download_per_host 설정으로 DownloadManager를 만듭니다 (기본 download_func는 download_video_from_url).
+        adaptive_downloads면 download_workers에서 시작해 download_max_workers까지 조절하는 AdaptiveConcurrency를 붙입니다.
+        """
+        controller = None
+        if self.adaptive_downloads:
+            controller = AdaptiveConcurrency(initial=self.download_workers, max_limit=self.download_max_workers)
+        return DownloadManager(
+            download_func or self.download_video_from_url,
+            workers=self.download_workers,
+            # 적응형일 때는 한 채널(같은 호스트)의 다운로드도 한도까지 늘어날 수 있도록 호스트별 제한을 한도에 맞춤
+            per_host=self.download_max_workers if controller else self.download_per_host,
+            stop_event=self.stop_event,
+            progress_callback=progress_callback,
+            controller=controller,
+        )
+
+    def resume_downloads(self):
+        """이전 실행에서 끝나지 않은(중단/일부/실패) 다운로드를 다시 시도하고, 받은 영상 정보 목록을 반환합니다."""
+        self._check_stop_event()
+        urls = self.download_job_store.unfinished("audio" if self.audio_only else "video")
+        if not urls:
+            return []
+        print(f"끝나지 않은 다운로드 {len(urls)}개를 다시 시도합니다.")
+        manager = self._create_download_manager()
+        return [video_info for video_info in manager.run(urls) if video_info]
+
+    @governed_stage("download")
+    def ensure_video(self, video_info):
+        """
+        오디오만 받아 둔 영상(media_type == "audio")의 영상 파일이 필요할 때(클립 자르기, 썸네일 등) 그때 받아옵니다.
+        영상 파일 경로를 반환하고 video_info['video_path']에 기록합니다. 실패하면 None.
+        """
+        self._check_stop_event()
+        if video_info.get('media_type') != "audio":
+            return video_info.get('downloaded_path')
+        if video_info.get('video_path') and os.path.exists(video_info['video_path']):
+            return video_info['video_path']
+        try:
+            staging_dir = self.download_dir / ".staging"
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            info = self.download_engine.download(
+                video_info['url'],
+                {'outtmpl': str(staging_dir / "%(id)s.video.%(ext)s"), 'noplaylist': True, 'format': VIDEO_FORMAT},
+                progress_callback=self._download_progress_hook,
+                stop_event=self.stop_event,
+            )
+            downloaded_files = self.download_engine.downloaded_files(info)
+            if not downloaded_files:
+                print(f"영상 다운로드 실패: {video_info['url']}")
+                return None
+            video_path = str(Path(video_info['downloaded_path']).parent / Path(downloaded_files[0]).name)
+            os.replace(downloaded_files[0], video_path) # 오디오 파일과 같은 폴더에 둠
+            video_info['video_path'] = video_path
+            return video_path
+        except InterruptedError:
+            print("작업이 중지되었습니다.")
+            return None
+        except DownloadEngineError as e:
+            print(f"yt-dlp 실행 오류: {e}")
             return None
 
+    @governed_stage("download")
     def download_all_videos_from_profile_url(self, profile_url):
         """계정 URL에서 모든 영상 다운로드 (yt-dlp 사용)"""
         self._check_stop_event()
@@ -216,116 +2455,398 @@ class VideoProcessor:
             output_dir.mkdir(parents=True, exist_ok=True)
             
             output_template = str(output_dir / "%(id)s.%(ext)s")
-            archive_file = str(output_dir / f"{profile_name}_archive.txt") # 중복 제외를 위한 아카이브 파일 경로
+            # 중복 제외를 위한 아카이브 파일: 단일 영상/채널 필터링 경로와 함께 쓰는 공유 아카이브
+            media = "audio" if self.audio_only else "video"
+            self.download_job_store.merge_archive(output_dir / f"{profile_name}_{'audio_' if self.audio_only else ''}archive.txt", media)
+            options = {
+                'outtmpl': output_template,
+                'noplaylist': False,
+                'format': AUDIO_ONLY_FORMAT if self.audio_only else VIDEO_FORMAT,
+                'download_archive': str(self.download_job_store.archive_path(media)), # 아카이브 파일 지정
+                'continuedl': True, # 중단된 .part 파일 이어받기
+            }
 
-            command = [
-                "yt-dlp",
-                profile_url,
-                "-o", output_template,
-                "--yes-playlist",
-                "--restrict-filenames",
-                "-f", "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-                "--no-warnings",
-                "--download-archive", archive_file, # 아카이브 파일 지정
-            ]
-            
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
+            def download_with_retry(url, download_options, progress_callback):
+                return retry_with_backoff(
+                    lambda: self.download_engine.download(url, download_options, progress_callback=progress_callback, stop_event=self.stop_event),
+                    attempts=self.download_retries,
+                    base_delay=self.download_retry_base_delay,
+                    stop_event=self.stop_event,
+                    on_retry=lambda attempt, error, delay: print(f"다운로드 실패, {delay:.1f}초 후 다시 시도합니다 ({attempt}/{self.download_retries}): {error}"),
+                )
+
+            if self.incremental_sync:
+                # 목록을 이전 동기화 지점까지만 읽고, 새 영상만 하나씩 내려받음
+                new_entries = {}
+                for entry in self._iter_new_channel_entries(profile_url):
+                    url = entry.get('webpage_url') or entry.get('url')
+                    if url:
+                        new_entries[url] = entry
+                    else: # 내려받을 수 없는 항목은 다시 시도하지 않음
+                        self._settle_channel_entry(profile_url, entry)
+                new_urls = list(new_entries)
+                print(f"[DEBUG] 증분 동기화: 새 영상 {len(new_urls)}개")
+                failed_urls = set()
+
+                def download_one(url, progress_callback):
+                    try:
+                        return download_with_retry(url, {**options, 'noplaylist': True}, progress_callback)
+                    except DownloadEngineError as e:
+                        print(f"yt-dlp 실행 오류 ({url}): {e}")
+                        failed_urls.add(url)
+                        return None
+
+                manager = self._create_download_manager(
+                    download_one,
+                    progress_callback=lambda index, progress: self._download_progress_hook({**progress, 'index': index, 'total': len(new_urls)}),
+                )
+                infos = [info for info in manager.run(new_urls) if info]
+                # 아카이브에 있어 건너뛴 영상(결과 None)도 처리된 것으로 보고, 실패한 영상만 다음 실행에서 다시 시도
+                processed_ids = [entry.get('id') for url, entry in new_entries.items() if url not in failed_urls]
+            else:
+                # 재시도할 때는 아카이브에 기록된 영상은 건너뛰고 중단된 파일은 이어받으므로 이미 받은 부분을 다시 받지 않음
+                infos = [download_with_retry(profile_url, options, self._download_progress_hook)]
             downloaded_video_paths = []
-
-            for line in iter(process.stdout.readline, ''):
-                self._check_stop_event() # 중지 신호 확인
-                print(f"[yt-dlp] {line.strip()}") # 모든 yt-dlp 출력을 로그로
-                if "Destination:" in line:
-                    path_match = re.search(r'Destination: (.*?\\.mp4|.*?\\.webm|.*?\\.mkv)', line)
-                    if path_match:
-                        download_path = path_match.group(1).strip()
-                        if os.path.exists(download_path) and download_path not in downloaded_video_paths: # Check for existence and uniqueness
+            for info in infos:
+                for entry in (info.get('entries') or []) if 'entries' in info else [info]:
+                    entry_files = self.download_engine.downloaded_files(entry)
+                    if entry_files and entry.get('webpage_url'):
+                        # 단일 영상 경로에서 같은 영상을 요청하면 다시 받지 않도록 작업 기록에 남김
+                        video_info = {**self._video_info_from_metadata(entry, entry['webpage_url']),
+                                      'downloaded_path': entry_files[0], 'media_type': media}
+                        self.download_job_store.mark(entry['webpage_url'], media, "done", video_info=video_info, attempts=1)
+                        if self.metadata_cache:
+                            self.metadata_cache.put_video(entry, entry['webpage_url'])
+                    for download_path in entry_files:
+                        if download_path not in downloaded_video_paths: # Check for uniqueness
                             downloaded_video_paths.append(download_path)
                             print(f"[yt-dlp] 다운로드됨: {download_path}")
-                elif "downloaded" in line.lower() and (".mp4" in line.lower() or ".webm" in line.lower() or ".mkv" in line.lower()):
-                    match = re.search(r'downloaded "(.*?)"', line)
-                    if match:
-                        download_path = match.group(1).strip()
-                        if os.path.exists(download_path) and download_path not in downloaded_video_paths: # Check for existence and uniqueness
-                            downloaded_video_paths.append(download_path)
-            
-            # Read stderr after stdout is exhausted and process has finished
-            stderr_output = process.stderr.read()
-
-            process.stdout.close()
-            process.stderr.close() # Close stderr pipe too
-            process.wait()
 
             if self.stop_event.is_set():
-                # Process terminated by stop event, handle clean exit
                 return []
-
-            if process.returncode != 0:
-                raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr_output)
+            if self.incremental_sync:
+                self.commit_channel_sync(processed_ids)
 
             return downloaded_video_paths
 
         except InterruptedError:
-            if 'process' in locals() and process.poll() is None:
-                process.terminate()
-                process.wait()
             print("작업이 중지되었습니다.")
             return []
-        except subprocess.CalledProcessError as e:
-            print(f"yt-dlp 실행 오류 (계정): {stderr_output}") # Use the collected stderr
+        except DownloadEngineError as e:
+            print(f"yt-dlp 실행 오류 (계정): {e}")
             return []
         except Exception as e:
             print(f"계정 영상 다운로드 중 예상치 못한 오류 발생: {e}")
             return []
 
+    @governed_stage("ffmpeg")
     def extract_audio(self, video_path):
-        """영상에서 오디오 추출""" 
+        """
+        영상에서 오디오를 추출합니다.
+        ffmpeg를 한 번만 실행해 16kHz 모노 PCM을 파이프로 받아 float32 NumPy 배열로 반환하므로,
+        중간 MP3 파일 없이 바로 Whisper에 넘길 수 있습니다.
+        """
         self._check_stop_event()
+        process = None
         try:
-            audio_path = str(Path(video_path).with_suffix('.mp3'))
-            # moviepy는 내부적으로 ffmpeg를 subprocess로 호출합니다.
-            # moviepy에서 직접 subprocess를 제어하기 어렵기 때문에, 여기서는 중지 이벤트만 체크하고
-            # moviepy의 write_audiofile이 블로킹될 경우 스레드 종료 신호에 반응하지 않을 수 있습니다.
-            # 더 완벽한 중지 제어를 위해서는 moviepy 대신 ffmpeg 명령어를 직접 Popen으로 호출해야 합니다.
-            
-            # moviepy 사용 부분을 주석 처리하고 ffmpeg 직접 사용
-            video = VideoFileClip(video_path)
-            video.audio.write_audiofile(audio_path) # 이 부분이 블로킹될 수 있음
-            video.close()
-            
-            # ffmpeg를 직접 사용하여 오디오 추출
+            import numpy as np
+
             command = [
-                "ffmpeg", "-i", video_path, "-vn", "-acodec", "mp3", 
-                "-ab", "128k", "-ar", "44100", "-y", audio_path
+                "ffmpeg", "-nostdin", "-loglevel", "error",
+                "-threads", str(len(self.cpu_governor.cpus_for("ffmpeg"))), # 디코더 스레드를 배정된 코어 수로 제한
+                "-i", str(video_path), "-vn",
+                "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+                "-f", "s16le", "-acodec", "pcm_s16le", "-"
             ]
-            
-            process = subprocess.run(command, capture_output=True, text=True, check=True)
-            return audio_path
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # stderr는 별도 스레드에서 비워 경고가 많아도 파이프가 가득 차 ffmpeg가 멈추지 않게 함
+            stderr_chunks = []
+            stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+            stderr_thread.start()
+
+            pcm_bytes = bytearray()
+            while True:
+                self._check_stop_event() # 긴 영상도 청크 단위로 읽으면서 중지 신호에 반응
+                chunk = process.stdout.read(1 << 20)
+                if not chunk:
+                    break
+                pcm_bytes.extend(chunk)
+
+            process.wait()
+            stderr_thread.join()
+            stderr_output = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr_output)
+
+            audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            if audio.size == 0:
+                print(f"오디오 트랙이 비어 있습니다: {video_path}")
+                return None
+            print(f"[DEBUG] 오디오 추출 완료: {audio.size / AUDIO_SAMPLE_RATE:.1f}초 ({video_path})")
+            return audio
         except InterruptedError:
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
             print("오디오 추출 작업이 중지되었습니다.")
             return None
+        except subprocess.CalledProcessError as e:
+            print(f"오디오 추출 중 오류 발생 (ffmpeg): {e.stderr}")
+            return None
         except Exception as e:
             print(f"오디오 추출 중 오류 발생: {e}")
             return None
 
-    def generate_transcript(self, audio_path):
-        """오디오를 텍스트로 변환"""
+    def generate_transcript(self, audio, on_segments=None):
+        """
+        오디오(16kHz 모노 float32 배열 또는 파일 경로)를 텍스트로 변환합니다.
+        텍스트뿐 아니라 세그먼트/단어 타임스탬프와 감지된 언어를 포함한 결과 딕셔너리를 반환합니다.
+        on_segments 콜백을 주면 스트리밍 모드로 전사하며, 디코딩된 세그먼트를 모아 도착하는 대로
+        on_segments(세그먼트 리스트)로 전달합니다 (전체 파일이 끝날 때까지 기다리지 않음).
+        긴 오디오는 스트리밍 모드에서도 워커 풀의 병렬 청크 전사를 사용합니다.
+        """
         self._check_stop_event()
         try:
-            print(f"[DEBUG] 대본 생성을 위해 오디오 경로 확인: {audio_path}") # 디버그 출력
-            
-            result = self.model.transcribe(audio_path) # 이 부분도 블로킹될 수 있음
-            transcript_text = result["text"]
-            
-            print(f"[DEBUG] Whisper 대본 생성 완료. 텍스트 길이: {len(transcript_text) if transcript_text else 0}, 시작 부분: \"{transcript_text[:50]}...\"") # 디버그 출력
-            return transcript_text
+            job = self._prepare_transcription(audio)
+            if 'result' in job:
+                if on_segments is not None and job['result']['segments']:
+                    on_segments(job['result']['segments'])
+                return job['result']
+            if on_segments is not None and not isinstance(job['audio'], str):
+                whisper_result = self._stream_audio(job, on_segments)
+            else:
+                whisper_result = self._transcribe_audio(job['audio'], job['options']) # 이 부분도 블로킹될 수 있음
+            return self._finish_transcription(job, whisper_result)
+        except InterruptedError:
+            print("대본 생성 작업이 중지되었습니다.")
+            return None
+        except Exception as e:
+            print(f"대본 생성 중 오류 발생: {e}")
+            return None
+
+    def transcribe_videos(self, video_paths):
+        """
+        여러 영상의 대본을 전사 워커 풀에서 동시에 생성하고 입력 순서대로 (영상 경로, 결과)를 내보냅니다.
+        워커 수만큼의 영상을 미리 제출해 두므로, 한 영상의 결과를 저장/분석하는 동안 다음 영상들이 전사됩니다.
+        오디오 추출이나 대본 생성에 실패한 영상의 결과는 None이며, 중지되면 바로 끝납니다.
+        """
+        if not self._use_worker_pool():
+            for video_path in video_paths:
+                if self.stop_event.is_set():
+                    return
+                audio = self.extract_audio(video_path)
+                yield video_path, self.generate_transcript(audio) if audio is not None else None
+            return
+
+        in_flight = collections.deque()
+        remaining = iter(video_paths)
+        try:
+            while True:
+                while len(in_flight) < self.transcription_workers:
+                    video_path = next(remaining, None)
+                    if video_path is None:
+                        break
+                    in_flight.append((video_path, self._submit_video_transcription(video_path)))
+                if not in_flight:
+                    return
+                video_path, job = in_flight.popleft()
+                yield video_path, self._await_video_transcription(job)
         except InterruptedError:
+            self.transcription_pool.cancel()
             print("대본 생성 작업이 중지되었습니다.")
+
+    def _submit_video_transcription(self, video_path):
+        self._check_stop_event()
+        audio = self.extract_audio(video_path)
+        if audio is None:
+            return None
+        return self._submit_transcription(audio)
+
+    def _submit_transcription(self, audio):
+        try:
+            job = self._prepare_transcription(audio)
+            if 'result' not in job:
+                job['chunks'] = split_audio_at_silence(job['audio'], AUDIO_SAMPLE_RATE, self.chunk_seconds)
+                job['futures'] = self._submit_to_pool(job.pop('audio'), job['chunks'], job['options'])
+            return job
+        except InterruptedError:
+            raise
+        except Exception as e:
+            print(f"대본 생성 중 오류 발생: {e}")
+            return None
+
+    def _await_video_transcription(self, job):
+        if job is None:
             return None
+        if 'result' in job:
+            return job['result']
+        self.transcription_pool.wait(job['futures'], self.stop_event)
+        try:
+            return self._finish_transcription(job, self._collect_pool_result(job['chunks'], job['futures']))
         except Exception as e:
             print(f"대본 생성 중 오류 발생: {e}")
             return None
 
+    def _transcribe_in_stage(self, audio):
+        """파이프라인의 전사 단계용: 워커 풀을 쓸 수 있으면 풀에서, 아니면 현재 프로세스에서 전사합니다."""
+        if not self._use_worker_pool():
+            return self.generate_transcript(audio)
+        return self._await_video_transcription(self._submit_transcription(audio))
+
+    def _prepare_transcription(self, audio):
+        """
+        캐시 조회와 VAD까지 전사 전 단계를 처리합니다.
+        바로 돌려줄 결과가 있으면 'result', 아니면 전사할 'audio'와 'options'를 담은 작업 딕셔너리를 반환합니다.
+        """
+        if isinstance(audio, (str, Path)):
+            print(f"[DEBUG] 대본 생성을 위해 오디오 경로 확인: {audio}") # 디버그 출력
+            audio = str(audio)
+        else:
+            print(f"[DEBUG] 대본 생성 시작. 오디오 길이: {len(audio) / AUDIO_SAMPLE_RATE:.1f}초") # 디버그 출력
+
+        options = self._transcribe_options()
+        cache_key = None
+        if not isinstance(audio, str): # 디코딩된 오디오일 때만 내용 해시로 캐시 조회
+            cache_key = TranscriptCache.make_key(audio, self._transcript_cache_settings(options))
+            cached = self.transcript_cache.get(cache_key)
+            if cached is not None:
+                print(f"[DEBUG] 대본 캐시 적중 - 재전사 생략 ({self.transcript_cache.stats()})")
+                return {'result': cached}
+
+        # 결과 시간을 원본 길이 안으로 맞추기 위한 VAD로 자르기 전 오디오 길이(초, 파일 경로면 None)
+        duration = len(audio) / AUDIO_SAMPLE_RATE if cache_key is not None else None
+        offsets = None
+        if self.vad_enabled and cache_key is not None:
+            regions = detect_speech_regions(audio, AUDIO_SAMPLE_RATE)
+            speech_samples = sum(end - start for start, end in regions)
+            print(f"[DEBUG] VAD: 음성 구간 {len(regions)}개, 전체의 {speech_samples / max(len(audio), 1):.0%}")
+            if not regions:
+                # 음성이 전혀 없는 클립은 Whisper와 Gemini 호출을 모두 건너뜀.
+                # 에너지 방식은 거의 무음인 클립만 여기 오지만 음성을 구분하지 못하므로, 그 판단은 캐시에 남기지 않음
+                whisper_result = {'text': "", 'language': None, 'segments': [], 'no_speech': True}
+                if speech_vad_method() == "silero":
+                    self.transcript_cache.put(cache_key, whisper_result)
+                print("[DEBUG] 음성이 감지되지 않아 대본 생성을 건너뜁니다.")
+                return {'result': whisper_result}
+            if speech_samples < len(audio) * 0.9: # 잘라낼 부분이 거의 없으면 원본 그대로 사용
+                audio, offsets = remove_non_speech(audio, regions, AUDIO_SAMPLE_RATE)
+
+        return {'audio': audio, 'options': options, 'cache_key': cache_key, 'offsets': offsets, 'duration': duration}
+
+    def _finish_transcription(self, job, whisper_result):
+        """VAD로 잘라낸 시간을 되돌리고 결과를 캐시에 저장합니다."""
+        if job['offsets']:
+            whisper_result = remap_timestamps(whisper_result, job['offsets'])
+        if job['duration'] is not None:
+            clamp_timestamps(whisper_result, job['duration'])
+        transcript_text = whisper_result["text"]
+        if job['cache_key'] is not None:
+            self.transcript_cache.put(job['cache_key'], whisper_result)
+
+        print(f"[DEBUG] Whisper 대본 생성 완료. 언어: {whisper_result['language']}, 세그먼트 수: {len(whisper_result['segments'])}, 텍스트 길이: {len(transcript_text) if transcript_text else 0}, 시작 부분: \"{transcript_text[:50]}...\"") # 디버그 출력
+        return whisper_result
+
+    @governed_stage("transcribe")
+    def _stream_audio(self, job, on_segments):
+        """
+        창 단위로 전사하며 세그먼트를 stream_batch_interval 간격으로 모아 on_segments로 전달하고, 합친 결과를 반환합니다.
+        워커 풀을 쓸 수 있는 긴 오디오는 청크를 풀에서 병렬로 전사하면서 앞 청크부터 순서대로 전달합니다.
+        """
+        offsets = job['offsets']
+        job['offsets'] = None # 부분 결과마다 원본 시간으로 바로 변환하므로 마무리 단계에서는 생략
+        chunks = split_audio_at_silence(job['audio'], AUDIO_SAMPLE_RATE, self.chunk_seconds) if self._use_worker_pool() else []
+        if len(chunks) >= 2:
+            print(f"[DEBUG] 긴 오디오 병렬 스트리밍 전사: 청크 {len(chunks)}개, 워커 {self.transcription_workers}개")
+            partials = self._iter_pool_chunks(job['audio'], chunks, job['options'])
+        else:
+            partials = self.transcription_backend.stream(job['audio'], job['options'])
+        segments = []
+        languages = collections.Counter()
+        batch = []
+        last_flush = None
+        for partial in partials:
+            self._check_stop_event()
+            if offsets:
+                remap_timestamps(partial, offsets)
+            clamp_timestamps(partial, job['duration'])
+            if partial['language']:
+                languages[partial['language']] += 1
+            batch.extend(partial['segments'])
+            now = time.monotonic()
+            # 첫 세그먼트는 바로 보내고, 이후로는 GUI 갱신이 너무 잦지 않도록 모아서 전달
+            if batch and (last_flush is None or now - last_flush >= self.stream_batch_interval):
+                on_segments(batch)
+                segments.extend(batch)
+                batch = []
+                last_flush = now
+        if batch:
+            on_segments(batch)
+            segments.extend(batch)
+        return {
+            'text': " ".join(segment['text'] for segment in segments if segment['text']),
+            'language': languages.most_common(1)[0][0] if languages else None,
+            'segments': segments
+        }
+
+    def _use_worker_pool(self):
+        # GPU는 한 프로세스가 이미 전부 사용하므로 CPU에서만 여러 워커로 나눠 처리
+        return self.transcription_workers >= 2 and self.transcription_backend.device == "cpu"
+
+    @governed_stage("transcribe")
+    def _transcribe_audio(self, audio, options):
+        """짧은 오디오는 현재 프로세스에서, 긴 오디오는 무음 지점에서 나눠 워커 풀에서 병렬로 전사합니다."""
+        if isinstance(audio, str) or not self._use_worker_pool():
+            return self.transcription_backend.transcribe(audio, options)
+        chunks = split_audio_at_silence(audio, AUDIO_SAMPLE_RATE, self.chunk_seconds)
+        if len(chunks) < 2:
+            return self.transcription_backend.transcribe(audio, options)
+        print(f"[DEBUG] 긴 오디오 병렬 전사: 청크 {len(chunks)}개, 워커 {self.transcription_workers}개")
+        futures = self._submit_to_pool(audio, chunks, options)
+        self.transcription_pool.wait(futures, self.stop_event)
+        return self._collect_pool_result(chunks, futures)
+
+    @governed_stage("transcribe")
+    def _submit_to_pool(self, audio, chunks, options):
+        return [self.transcription_pool.submit(audio[start:end], options) for start, end, _, _ in chunks]
+
+    def _iter_pool_chunks(self, audio, chunks, options):
+        """
+        청크를 모두 워커 풀에 제출한 뒤, 청크 k의 부분 결과(원본 기준 시간)를 청크 0..k가 모두 끝났을 때 내보냅니다.
+        뒤 청크가 먼저 끝나도 앞 청크를 기다리므로 세그먼트는 항상 시간 순서대로 전달됩니다.
+        """
+        futures = self._submit_to_pool(audio, chunks, options)
+        for chunk, future in zip(chunks, futures):
+            self.transcription_pool.wait([future], self.stop_event)
+            yield stitch_chunk_results([chunk], [future.result()], AUDIO_SAMPLE_RATE)
+
+    def _collect_pool_result(self, chunks, futures):
+        if len(chunks) == 1:
+            return futures[0].result()
+        return stitch_chunk_results(chunks, [future.result() for future in futures], AUDIO_SAMPLE_RATE)
+
+    def _transcribe_options(self):
+        """대본 생성 엔진의 transcribe에 넘기는 디코딩 옵션 (엔진 공통, 속도 프로필에 따라 결정)"""
+        profile = TRANSCRIPTION_PROFILES[self.transcription_profile]
+        options = {
+            'word_timestamps': True,
+            'beam_size': profile['beam_size'],
+            'best_of': profile['best_of'],
+            'temperature': profile['temperature'],
+            'condition_on_previous_text': profile['condition_on_previous_text']
+        }
+        language = self.language or profile['language']
+        if language and language != "auto":
+            options['language'] = language # 언어를 고정하면 클립마다 하던 언어 감지를 생략
+        return options
+
+    def _transcript_cache_settings(self, options):
+        """결과에 영향을 주는 모델/디코딩 설정 (대본 캐시 키의 일부)"""
+        return {
+            **self.transcription_backend.settings(),
+            'vad': self.vad_enabled,
+            'options': options
+        }
+
     def save_transcript(self, video_info, whisper_result):
         """대본 저장"""
         self._check_stop_event()
@@ -341,7 +2862,8 @@ class VideoProcessor:
             # 간소화된 출력 내용
             output = {
                 'video_title': video_title,
-                'transcript_text': whisper_result["text"]
+                'transcript_text': whisper_result["text"],
+                'language': whisper_result.get("language")
             }
             
             json_filename = transcript_output_dir / f"{video_id}_transcript.json"
@@ -349,6 +2871,13 @@ class VideoProcessor:
                 json.dump(output, f, ensure_ascii=False, indent=2)
             print(f"대본이 다음 위치에 저장되었습니다: {json_filename}")
 
+            # 세그먼트/단어 타임스탬프는 대본 옆에 공백 없는 JSON으로 저장 (재전사 없이 타임라인/클립 편집에 재사용)
+            segments = whisper_result.get("segments")
+            if segments:
+                segments_filename = transcript_output_dir / f"{video_id}_segments.json"
+                with open(segments_filename, "w", encoding="utf-8") as f:
+                    json.dump(segments, f, ensure_ascii=False, separators=(",", ":"))
+
             # Markdown 파일로도 내보내기 (pass correct metadata, ensuring video_title is used)
             markdown_success = self.export_transcript_to_markdown(
                 video_id,
@@ -375,6 +2904,29 @@ class VideoProcessor:
             print(f"[DEBUG_SAVE_TRANSCRIPT] 대본 저장 중 예외 발생: {e}") # 디버그 출력 추가
             return False
 
+    def load_transcript_result(self, uploader_name, video_id):
+        """저장된 대본과 세그먼트 타임스탬프를 Whisper 결과 형식으로 다시 불러옵니다. 없으면 None."""
+        transcript_output_dir = self.download_dir / uploader_name / "video_scripts"
+        transcript_file = transcript_output_dir / f"{video_id}_transcript.json"
+        if not transcript_file.exists():
+            return None
+        try:
+            with open(transcript_file, "r", encoding="utf-8") as f:
+                transcript_data = json.load(f)
+            segments = []
+            segments_file = transcript_output_dir / f"{video_id}_segments.json"
+            if segments_file.exists():
+                with open(segments_file, "r", encoding="utf-8") as f:
+                    segments = json.load(f)
+            return {
+                'text': transcript_data.get('transcript_text', ''),
+                'language': transcript_data.get('language'),
+                'segments': segments
+            }
+        except Exception as e:
+            print(f"대본 파일 읽기 오류 {transcript_file}: {e}")
+            return None
+
     def export_transcript_to_markdown(self, video_id, transcript_text, output_dir, video_title):
         """
         대본을 Markdown 파일로 내보내어 블로그 게시물 작성을 돕습니다.
@@ -418,6 +2970,16 @@ class VideoProcessor:
         content_ideas = [] # 블로그 및 새 영상 아이디어를 통합
         timestamped_summaries = [] # 세그먼트별 요약 및 타임스탬프
 
+        if whisper_result and (whisper_result.get("no_speech") or not whisper_result.get("text", "").strip()):
+            # 음성이 없는 영상(음악/무음)은 분석할 대본이 없으므로 Gemini 호출 없이 빈 결과 반환
+            print("[DEBUG_API] 대본이 비어 있어 콘텐츠 분석(Gemini 호출)을 건너뜁니다.")
+            return {
+                'suggested_tags': suggested_tags,
+                'content_ideas': content_ideas,
+                'timestamped_summaries': timestamped_summaries,
+                'no_speech': True
+            }
+
         if whisper_result and "text" in whisper_result:
             transcript = whisper_result["text"] # Extract transcript text
             segments = whisper_result.get("segments", []) # Get segments
@@ -864,6 +3426,8 @@ class VideoProcessor:
             print("쿠팡 파트너스 API 키가 설정되지 않아 상품 정보를 가져올 수 없습니다.")
             return None
 
+        import requests
+
         headers = {"Accept": "application/json"}
         DOMAIN = "https://api.coupang.com"
 
@@ -906,168 +3470,340 @@ class VideoProcessor:
             print(f"_get_coupang_product_info_from_api 중 예상치 못한 오류 발생: {e}")
             return None 
 
-    def get_channel_videos_with_filters(self, channel_url, min_views=None, video_type=None, keywords=None):
-        """채널에서 조건에 맞는 동영상 목록을 가져옵니다."""
+    def get_channel_videos_with_filters(self, channel_url, min_views=None, video_type=None, keywords=None, max_results=None,
+                                        top_n=None, sort_by="views"):
+        """채널에서 조건에 맞는 동영상 목록을 가져옵니다 (top_n을 주면 sort_by 기준 상위 top_n개를 높은 순서대로)."""
         self._check_stop_event()
+        # 목록만 보여주는 경우에는 처리하지 않으므로 증분 동기화 기준점을 쓰지도 옮기지도 않음
+        filtered_videos = list(self.iter_channel_videos(channel_url, min_views, video_type, keywords, max_results,
+                                                        incremental=False, top_n=top_n, sort_by=sort_by))
+        print(f"[DEBUG] 필터링 완료: {len(filtered_videos)}개 동영상 선택됨")
+        return filtered_videos
+
+    def iter_channel_videos(self, channel_url, min_views=None, video_type=None, keywords=None, max_results=None, incremental=None,
+                            top_n=None, sort_by="views"):
+        """
+        채널 목록을 받아오는 대로 항목마다 필터 조건을 확인하고, 맞는 동영상을 바로 내보냅니다 (제너레이터).
+        run_channel_pipeline에 그대로 넘기면 목록을 다 받기 전에 첫 영상의 다운로드가 시작됩니다.
+        max_results개를 찾으면 나머지 목록은 요청하지 않고 멈춥니다.
+        조회수/길이 조건은 추출기에 match filter로 넘기고, 평면 목록에 필요한 필드가 없는 항목만 개별로 전체 정보를 추출합니다.
+        incremental(기본값은 self.incremental_sync)이면 이전 동기화 이후의 새 영상만 확인합니다.
+        top_n을 주면 목록을 끝까지 확인하면서 sort_by(views / recency / duration) 기준 상위 top_n개만 힙에 남겼다가
+        높은 순서대로 내보내므로, 파이프라인은 가장 가치 있는 영상부터 처리하고 top_n개에서 멈춥니다.
+        recency는 목록(최신순)에서 먼저 나온 top_n개이므로, 증분 동기화가 아니면 그만큼 찾은 뒤 목록 읽기를 멈춥니다.
+        증분 동기화에서 상위 top_n개에 들지 못한 영상은 이번 선택에서 밀려난 것이므로 본 것으로 기록하고,
+        다운로드/처리에 실패한 영상만 다음 실행에서 다시 후보가 됩니다.
+        """
+        incremental = self.incremental_sync if incremental is None else incremental
+        if top_n and sort_by == "recency" and not incremental:
+            # 증분 동기화는 목록을 끝까지(이전 기준점까지) 읽어야 기준점을 저장할 수 있으므로 제외
+            max_results = min(max_results or top_n, top_n)
+        matches = self._iter_matching_channel_videos(channel_url, min_views, video_type, keywords, max_results, incremental,
+                                                     sort_by if top_n else None)
+        if not top_n:
+            yield from matches
+            return
+        candidate_ids = []
+
+        def track_candidates():
+            for video_info in matches:
+                candidate_ids.append(video_info.get('id'))
+                yield video_info
+
+        top_videos = select_top_videos(track_candidates(), top_n, sort_by)
+        print(f"[DEBUG] {sort_by} 기준 상위 {len(top_videos)}개 선택")
+        if incremental:
+            # 상위 top_n개 밖의 영상은 실패가 아니므로 retry_ids에 남기지 않음 (남기면 다음 실행이 목록 끝까지 읽게 됨)
+            selected_ids = {video_info.get('id') for video_info in top_videos}
+            for video_id in candidate_ids:
+                if video_id not in selected_ids:
+                    self._settle_channel_entry(channel_url, {'id': video_id})
+        yield from top_videos
+
+    def _iter_matching_channel_videos(self, channel_url, min_views, video_type, keywords, max_results, incremental, sort_by):
+        """iter_channel_videos의 필터링 부분. sort_by를 주면 정렬 값에 필요한 필드가 없는 항목도 전체 정보를 추출합니다."""
+        print(f"[DEBUG] 채널 필터링 시작: {channel_url}")
+        sort_fields = VIDEO_SORT_KEYS[sort_by][0] if sort_by else ()
+        channel_filter = ChannelFilter(min_views, video_type, keywords)
+        matched = 0
+        enriched = 0
+        if incremental:
+            # 이미 본 영상을 만나야 멈출 수 있으므로 추출기 쪽 필터 없이 모든 항목을 받아 여기서 거름
+            entries = self._iter_new_channel_entries(channel_url)
+        elif self.metadata_cache:
+            # 캐시에 전체 목록이 있으면 로컬에서 필터링, 없으면 전체 목록을 받아 캐시에 저장하면서 로컬에서 필터링
+            entries = self._iter_cached_channel_entries(channel_url, channel_filter.match_filter)
+        else:
+            entries = self.download_engine.iter_entries(channel_url, {'extract_flat': "in_playlist"},
+                                                        stop_event=self.stop_event, match_filter=channel_filter.match_filter)
         try:
-            print(f"[DEBUG] 채널 필터링 시작: {channel_url}")
-            
-            # yt-dlp를 사용하여 채널의 동영상 목록 가져오기
-            command = [
-                "yt-dlp",
-                "--dump-json",
-                "--flat-playlist",
-                "--no-download",
-                channel_url
-            ]
-            
-            process = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-            videos_data = process.stdout.strip().split('\n')
-            
-            filtered_videos = []
-            for video_data in videos_data:
-                if not video_data.strip():
+            for video_info in entries:
+                verdict = channel_filter.check(video_info)
+                if verdict is None:
+                    enriched += 1
+                    video_info = self._enrich_entry(video_info)
+                    verdict = channel_filter.check(video_info, complete=True)
+                if not verdict:
+                    if incremental: # 조건에 맞지 않는 영상은 처리할 필요가 없으므로 처리한 것으로 기록
+                        self._settle_channel_entry(channel_url, video_info)
                     continue
-                    
-                try:
-                    video_info = json.loads(video_data)
-                    if self._matches_filter_criteria(video_info, min_views, video_type, keywords):
-                        filtered_videos.append(video_info)
-                except json.JSONDecodeError:
-                    continue
-            
-            print(f"[DEBUG] 필터링 완료: {len(filtered_videos)}개 동영상 선택됨")
-            return filtered_videos
-            
-        except subprocess.CalledProcessError as e:
-            print(f"채널 정보 가져오기 오류: {e.stderr}")
-            return []
+                if sort_fields and all(video_info.get(field) is None for field in sort_fields):
+                    enriched += 1
+                    video_info = self._enrich_entry(video_info)
+                matched += 1
+                yield video_info
+                if max_results and matched >= max_results:
+                    # 읽지 않은 새 영상이 남아 있으므로 목록이 끝나지 않은 것으로 남아 기준점을 옮기지 않음
+                    print(f"[DEBUG] 최대 {max_results}개에 도달하여 채널 목록 읽기를 멈춥니다.")
+                    break
+        except InterruptedError:
+            print("채널 목록 읽기가 중지되었습니다.")
+        except DownloadEngineError as e:
+            print(f"채널 정보 가져오기 오류: {e}")
         except Exception as e:
             print(f"채널 필터링 중 오류 발생: {e}")
-            return []
+        finally:
+            entries.close()
+            print(f"[DEBUG] 채널 필터링: {matched}개 선택, 전체 정보 추출 {enriched}회")
+
+    def _iter_new_channel_entries(self, channel_url):
+        """
+        채널 목록(최신순)을 읽다가 이전 동기화에서 이미 본 영상이 sync_stop_after개 연속으로 나오면 멈추고,
+        그 전까지의 새 항목만 내보냅니다. 지난번에 처리하지 못한 영상(retry_ids)은 다시 내보내며, 그 영상들을 모두 지나기 전에는 멈추지 않습니다.
+        이번에 본 항목들은 기준점 후보로 남겨 두고, 실제 저장은 처리가 끝난 뒤 commit_channel_sync()에서
+        처리에 성공한(또는 필터에서 제외된) 항목만 반영합니다. 목록을 끝까지 읽지 못하면 저장하지 않습니다.
+        """
+        key = ChannelSyncState.channel_key(channel_url)
+        mark = self.channel_sync_state.get(channel_url)
+        if mark:
+            print(f"[DEBUG] 증분 동기화 기준점: {mark.get('last_id')} (업로드 시각 {mark.get('last_timestamp')}, "
+                  f"다시 시도할 영상 {len(mark.get('retry_ids', []))}개)")
+        retry_ids = set(mark.get('retry_ids', [])) if mark else set()
+        pending = {'url': channel_url, 'seen': [], 'settled': set(), 'complete': False}
+        self._pending_channel_sync[key] = pending
+        known_streak = 0
+        entries = self.download_engine.iter_entries(channel_url, {'extract_flat': "in_playlist"}, stop_event=self.stop_event)
+        try:
+            for entry in entries:
+                if ChannelSyncState.is_known(mark, entry):
+                    known_streak += 1
+                    if known_streak >= self.sync_stop_after and not retry_ids:
+                        print(f"[DEBUG] 이전에 처리한 영상에 도달하여 목록 읽기를 멈춥니다 (새 항목 {len(pending['seen'])}개).")
+                        break
+                    continue
+                known_streak = 0
+                retry_ids.discard(entry.get('id'))
+                pending['seen'].append({'id': entry.get('id'), 'timestamp': entry.get('timestamp')})
+                yield entry
+            pending['complete'] = True
+        finally:
+            entries.close()
+
+    def _settle_channel_entry(self, channel_url, entry):
+        """증분 동기화 중인 채널에서 처리할 필요가 없는(필터에서 제외된) 항목을 처리한 것으로 기록합니다."""
+        pending = self._pending_channel_sync.get(ChannelSyncState.channel_key(channel_url))
+        if pending is not None and entry.get('id'):
+            pending['settled'].add(entry['id'])
+
+    def _iter_cached_channel_entries(self, channel_url, match_filter=None):
+        """
+        메타데이터 캐시의 채널 목록 중 match_filter에 맞는 항목을 내보냅니다. 캐시에 없으면 필터 없이 전체 목록을 받아오는 대로
+        걸러 내보내고, 끝까지 읽었을 때 전체 목록을 캐시에 저장합니다 (다른 필터 조건으로 다시 쓸 수 있도록).
+        평면 목록은 필터를 추출기에 넘겨도 받는 페이지 수가 같으므로, 필터는 항상 로컬에서 적용합니다.
+        """
+        cached_entries = self.metadata_cache.get_listing(channel_url)
+        if cached_entries is not None:
+            print(f"[DEBUG] 채널 목록 캐시 적중: {len(cached_entries)}개 항목을 로컬에서 필터링합니다.")
+            yield from (entry for entry in cached_entries if self.download_engine.matches_filter(entry, match_filter))
+            return
+        listed = []
+        entries = self.download_engine.iter_entries(channel_url, {'extract_flat': "in_playlist"}, stop_event=self.stop_event)
+        try:
+            for entry in entries:
+                listed.append(entry)
+                if self.download_engine.matches_filter(entry, match_filter):
+                    yield entry
+        finally:
+            entries.close()
+        self.metadata_cache.put_listing(channel_url, listed) # 중간에 멈춘 목록은 저장하지 않음
+
+    def commit_channel_sync(self, processed_ids=()):
+        """
+        목록을 끝까지 읽은 채널들의 기준점을 저장합니다 (중지된 경우에는 저장하지 않아 다음 실행에서 다시 확인).
+        processed_ids(끝까지 처리된 영상 ID)와 필터에서 제외된 항목만 본 것으로 기록하고, 나머지(실패/미처리)는 다음 실행에서 다시 시도합니다.
+        """
+        if self.stop_event.is_set():
+            return
+        processed_ids = set(processed_ids)
+        for pending in list(self._pending_channel_sync.values()):
+            if not pending['complete']:
+                continue
+            done = [entry for entry in pending['seen'] if entry['id'] in processed_ids or entry['id'] in pending['settled']]
+            failed = [entry for entry in pending['seen'] if entry['id'] not in processed_ids and entry['id'] not in pending['settled']]
+            if failed:
+                print(f"[DEBUG] 증분 동기화: 처리되지 않은 영상(다운로드/처리 실패) {len(failed)}개는 다음 실행에서 다시 확인합니다.")
+            self.channel_sync_state.commit(pending['url'], done, failed)
+        self._pending_channel_sync.clear()
+
+    def _enrich_entry(self, video_info):
+        """평면 목록 항목에 없는 필드를 채우기 위해 그 영상 하나만 전체 정보를 추출합니다 (실패하면 원래 항목 그대로)."""
+        video_url = video_info.get('webpage_url') or video_info.get('url')
+        if not video_url:
+            return video_info
+        full_info = self.metadata_cache.get_video(url=video_url, info=video_info) if self.metadata_cache else None
+        if full_info is None:
+            try:
+                full_info = self.download_engine.extract_info(video_url, {'noplaylist': True}, stop_event=self.stop_event)
+            except DownloadEngineError as e:
+                print(f"[DEBUG] 항목 정보 추출 실패 ({video_url}): {e}")
+                return video_info
+            if self.metadata_cache:
+                self.metadata_cache.put_video(full_info, video_url)
+        return {**video_info, **full_info}
 
     def _matches_filter_criteria(self, video_info, min_views=None, video_type=None, keywords=None):
         """동영상이 필터 조건에 맞는지 확인합니다."""
         try:
-            # 조회수 필터링
-            if min_views is not None:
-                view_count = video_info.get('view_count', 0)
-                if view_count < min_views:
-                    return False
-            
-            # 동영상 유형 필터링 (숏폼/롱폼)
-            if video_type is not None:
-                duration = video_info.get('duration', 0)
-                if video_type == "숏폼" and duration > 60:  # 60초 초과는 롱폼
-                    return False
-                elif video_type == "롱폼" and duration <= 60:  # 60초 이하는 숏폼
-                    return False
-            
-            # 키워드 필터링
-            if keywords:
-                title = video_info.get('title', '').lower()
-                description = video_info.get('description', '').lower()
-                search_text = f"{title} {description}"
-                
-                keyword_list = [kw.strip().lower() for kw in keywords.split(',')]
-                for keyword in keyword_list:
-                    if keyword not in search_text:
-                        return False
-            
-            return True
-            
+            return bool(ChannelFilter(min_views, video_type, keywords).check(video_info, complete=True))
         except Exception as e:
             print(f"필터 조건 확인 중 오류: {e}")
             return False
 
     def download_filtered_videos(self, filtered_videos, output_dir=None):
-        """필터링된 동영상들을 순차적으로 다운로드합니다."""
+        """
+        필터링된 동영상들을 DownloadManager로 동시에 다운로드합니다 (결과는 목록 순서 유지).
+        채널 처리(run_channel_pipeline)와 같은 _create_download_manager 설정(호스트별 제한, 적응형 동시성)을 사용합니다.
+        """
         self._check_stop_event()
         try:
-            if not filtered_videos:
+            videos = [video_info for video_info in filtered_videos or [] if video_info.get('webpage_url') or video_info.get('url')]
+            if not videos:
                 print("다운로드할 동영상이 없습니다.")
                 return []
-            
-            downloaded_videos = []
-            total_videos = len(filtered_videos)
-            
-            for i, video_info in enumerate(filtered_videos, 1):
-                if self.stop_event.is_set():
-                    break
-                
-                try:
-                    video_url = video_info.get('webpage_url') or video_info.get('url')
-                    if not video_url:
-                        continue
-                    
-                    print(f"[{i}/{total_videos}] 다운로드 중: {video_info.get('title', 'Unknown')}")
-                    
-                    # 개별 동영상 다운로드
-                    downloaded_info = self.download_video_from_url(video_url)
-                    if downloaded_info:
-                        downloaded_videos.append(downloaded_info)
-                        print(f"✅ 다운로드 완료: {downloaded_info.get('video_title', 'Unknown')}")
-                    else:
-                        print(f"❌ 다운로드 실패: {video_info.get('title', 'Unknown')}")
-                
-                except Exception as e:
-                    print(f"동영상 다운로드 중 오류: {e}")
-                    continue
-            
-            print(f"총 {len(downloaded_videos)}개 동영상 다운로드 완료")
+            total_videos = len(videos)
+            print(f"{total_videos}개 동영상 다운로드 시작 (동시 {self.download_workers}개, 호스트당 {self.download_per_host}개)")
+
+            def report(index, progress):
+                title = videos[index].get('title', 'Unknown')
+                if progress['status'] == "started":
+                    print(f"[{index + 1}/{total_videos}] 다운로드 중: {title}")
+                elif progress['status'] == "done":
+                    print(f"✅ 다운로드 완료: {title}")
+                elif progress['status'] == "failed":
+                    print(f"❌ 다운로드 실패: {title}")
+                self._download_progress_hook({**progress, 'index': index, 'total': total_videos})
+
+            manager = self._create_download_manager(progress_callback=report)
+            results = manager.run([video_info.get('webpage_url') or video_info.get('url') for video_info in videos])
+            downloaded_videos = [result for result in results if result]
+            self.download_metrics = manager.metrics()
+            print(f"총 {len(downloaded_videos)}개 동영상 다운로드 완료 (동시성 지표: {self.download_metrics})")
             return downloaded_videos
-            
+
         except Exception as e:
             print(f"필터링된 동영상 다운로드 중 오류: {e}")
             return []
 
-    def process_channel_with_filters(self, channel_url, min_views=None, video_type=None, keywords=None):
-        """채널 URL을 받아서 필터링 조건에 맞는 동영상들을 처리합니다."""
+    def process_channel_with_filters(self, channel_url, min_views=None, video_type=None, keywords=None, max_results=None,
+                                     top_n=None, sort_by="views"):
+        """
+        채널 URL을 받아서 필터링 조건에 맞는 동영상들을 처리합니다 (목록을 받는 동안 조건에 맞는 영상부터 처리 시작).
+        top_n을 주면 sort_by 기준 상위 top_n개만 높은 순서대로 처리합니다.
+        """
         self._check_stop_event()
         try:
             print(f"채널 처리 시작: {channel_url}")
             print(f"필터 조건 - 최소 조회수: {min_views}, 유형: {video_type}, 키워드: {keywords}")
             
-            # 1단계: 필터링된 동영상 목록 가져오기
-            filtered_videos = self.get_channel_videos_with_filters(channel_url, min_views, video_type, keywords)
-            
-            if not filtered_videos:
-                print("조건에 맞는 동영상이 없습니다.")
-                return []
-            
-            # 2단계: 필터링된 동영상들 다운로드
-            downloaded_videos = self.download_filtered_videos(filtered_videos)
-            
-            # 3단계: 각 동영상에 대해 분석 수행 (선택사항)
-            for video_info in downloaded_videos:
-                if self.stop_event.is_set():
-                    break
-                
-                try:
-                    # 오디오 추출 및 대본 생성 (현재는 더미 데이터)
-                    video_path = video_info.get('downloaded_path')
-                    if video_path and os.path.exists(video_path):
-                        audio_path = self.extract_audio(video_path)
-                        if audio_path:
-                            transcript = self.generate_transcript(audio_path)
-                            if transcript:
-                                # 대본 저장
-                                self.save_transcript(video_info, {"text": transcript})
-                                
-                                # 콘텐츠 분석
-                                analysis_results = self.analyze_video_content(video_info, {"text": transcript})
-                                self.save_analysis_results(video_info, analysis_results)
-                
-                except Exception as e:
-                    print(f"동영상 분석 중 오류: {e}")
-                    continue
-            
-            return downloaded_videos
+            # 채널 목록을 읽으면서 조건에 맞는 영상을 바로 다운로드 → 오디오 추출 → 대본 생성 → 분석 → 저장 파이프라인에 넣음
+            processed_videos = self.run_channel_pipeline(
+                self.iter_channel_videos(channel_url, min_views, video_type, keywords, max_results, top_n=top_n, sort_by=sort_by))
+            if not processed_videos:
+                print("조건에 맞는 동영상이 없거나 처리에 실패했습니다.")
+            return processed_videos
             
         except Exception as e:
             print(f"채널 처리 중 오류: {e}")
             return []
 
+    def run_channel_pipeline(self, videos, on_video_done=None):
+        """
+        다운로드 → 오디오 추출 → 대본 생성 → 분석 → 저장 단계를 크기가 제한된 큐로 연결해 동시에 실행합니다.
+        다운로드(네트워크)와 전사(CPU)가 겹쳐 실행되므로 전체 시간이 가장 느린 단계에 가까워집니다.
+        다운로드 단계는 DownloadManager를 거치므로 전체/호스트별 동시 다운로드 수 제한이 적용되고,
+        진행 상황은 영상 순번(index)과 함께 on_download_progress로 전달됩니다.
+        on_video_done(video_info, whisper_result, analysis_results)는 영상 하나의 저장이 끝날 때마다 호출됩니다.
+        끝까지 처리된 영상들의 정보를 목록 순서대로 반환합니다.
+        """
+        titles = {}
+        archived_ids = [] # 공유 아카이브에 있어 받지 않은 영상 (이미 처리된 것으로 봄)
+
+        def report(index, progress):
+            title = titles.get(index, 'Unknown')
+            if progress['status'] == "started":
+                print(f"[{index + 1}] 다운로드 중: {title}")
+            elif progress['status'] == "done":
+                print(f"✅ 다운로드 완료: {title}")
+            elif progress['status'] == "failed":
+                print(f"❌ 다운로드 실패: {title}")
+            self._download_progress_hook({**progress, 'index': index})
+
+        manager = self._create_download_manager(progress_callback=report)
+
+        def download(item):
+            index, video = item
+            video_url = video.get('webpage_url') or video.get('url')
+            if not video_url:
+                return None
+            titles[index] = video.get('title', 'Unknown')
+            video_info = manager.download(index, video_url)
+            if video_info and not os.path.exists(video_info.get('downloaded_path') or ""):
+                if video_info.get('archived'):
+                    print(f"이미 다운로드 아카이브에 있는 영상이라 건너뜁니다: {titles[index]}")
+                    archived_ids.append(video.get('id'))
+                return None
+            return video_info
+
+        def decode_audio(video_info):
+            audio = self.extract_audio(video_info['downloaded_path'])
+            return (video_info, audio) if audio is not None else None
+
+        def transcribe(item):
+            video_info, audio = item
+            whisper_result = self._transcribe_in_stage(audio)
+            return (video_info, whisper_result) if whisper_result else None
+
+        def analyze(item):
+            video_info, whisper_result = item
+            return video_info, whisper_result, self.analyze_video_content(video_info, whisper_result)
+
+        def persist(item):
+            video_info, whisper_result, analysis_results = item
+            self.save_transcript(video_info, whisper_result)
+            if analysis_results:
+                self.save_analysis_results(video_info, analysis_results)
+            if on_video_done is not None:
+                on_video_done(video_info, whisper_result, analysis_results)
+            return video_info
+
+        pipeline = StagedPipeline(
+            [
+                ("download", download, manager.max_workers), # 실제 동시 다운로드 수는 DownloadManager가 제한
+                ("audio", decode_audio, self.audio_workers),
+                ("transcribe", transcribe, self.transcription_workers if self._use_worker_pool() else 1),
+                ("analyze", analyze, self.analysis_workers),
+                ("persist", persist, 1), # 저장과 결과 집계는 한 스레드에서 순서대로
+            ],
+            queue_size=self.pipeline_queue_size,
+            stop_event=self.stop_event,
+        )
+        processed_videos = pipeline.run(enumerate(videos))
+        self.download_metrics = manager.metrics()
+        print(f"총 {len(processed_videos)}개 동영상 처리 완료 (동시성 지표: {self.download_metrics})")
+        # 증분 동기화 목록을 끝까지 읽었다면 처리에 성공한 영상까지만 기준점을 앞으로 옮김
+        self.commit_channel_sync([video_info['video_id'] for video_info in processed_videos] + archived_ids)
+        return processed_videos
+
     # 숏츠 제작 지원 메서드들
     def generate_shorts_script(self, transcript_content: str, video_length: str, platform: str, content_type: str) -> str:
         """숏츠 전용 스크립트를 생성합니다."""
@@ -0,0 +1,402 @@
+"""
+성능 벤치마크 스크립트
+
+사용법 (tiktok_downloader 폴더에서 실행):
+    python benchmark.py startup [--budget 1.0]
+    python benchmark.py rtf sample.mp4 [--backends whisper faster-whisper] [--model base]
+    python benchmark.py profiles corpus_dir [--profiles fast balanced accurate] [--max-wer 0.3]
+    python benchmark.py downloads [--videos 24] [--workers 8] [--latency 0.3]
+    python benchmark.py throttle [--videos 24] [--workers 12] [--server-limit 4]
+
+각 벤치마크는 결과를 출력하고, 기준을 넘으면 종료 코드 1을 반환하므로
+CI나 배포 전 점검 스크립트에서 회귀 감지용으로 사용할 수 있습니다.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# GUI 창이 뜨기 전에는 로드되면 안 되는 무거운 모듈들
+HEAVY_MODULES = ["whisper", "torch", "moviepy", "google.generativeai", "numpy", "requests"]
+
+_STARTUP_PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+import gui_app
+imported = time.perf_counter()
+result = {"import_seconds": imported - started}
+if "--paint" in sys.argv:
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication([])
+    window = gui_app.TikTokGUI()
+    window.show()
+    app.processEvents()
+    result["paint_seconds"] = time.perf_counter() - started
+    window.update_timer.stop()
+result["heavy_modules_loaded"] = [m for m in HEAVY_MODULES if m in sys.modules]
+print(json.dumps(result))
+"""
+
+
+def benchmark_startup(budget, runs, paint):
+    """새 인터프리터에서 gui_app 임포트(및 창 표시)까지 걸리는 시간을 측정합니다."""
+    env = dict(os.environ)
+    if paint:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    probe = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n" + _STARTUP_PROBE
+    command = [sys.executable, "-c", probe] + (["--paint"] if paint else [])
+
+    measurements = []
+    for _ in range(runs):
+        process = subprocess.run(command, capture_output=True, text=True, cwd=SCRIPT_DIR, env=env)
+        if process.returncode != 0:
+            print(f"시작 시간 측정 실패:\n{process.stderr}")
+            return 1
+        measurements.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    metric = "paint_seconds" if paint else "import_seconds"
+    best = min(m[metric] for m in measurements)
+    heavy = sorted({name for m in measurements for name in m["heavy_modules_loaded"]})
+    print(f"[startup] {metric}: 최소 {best:.3f}초 ({runs}회 측정, 기준 {budget:.3f}초)")
+
+    failed = False
+    if heavy:
+        print(f"[startup] 실패: 시작 시점에 무거운 모듈이 로드되었습니다: {', '.join(heavy)}")
+        failed = True
+    if best > budget:
+        print(f"[startup] 실패: 시작 시간이 기준을 초과했습니다.")
+        failed = True
+    return 1 if failed else 0
+
+
+def benchmark_rtf(media_paths, backends, model_size, device, runs):
+    """
+    엔진별 실시간 배율(RTF = 처리 시간 / 오디오 길이)을 측정합니다. 1보다 작을수록 실시간보다 빠릅니다.
+    모델 로드 시간은 제외하고, 대본 캐시를 거치지 않도록 엔진을 직접 호출합니다.
+    """
+    from api_handler import AUDIO_SAMPLE_RATE, VideoProcessor, create_transcription_backend
+
+    processor = VideoProcessor()
+    clips = []
+    for path in media_paths:
+        audio = processor.extract_audio(path)
+        if audio is None:
+            print(f"[rtf] 오디오를 읽을 수 없어 건너뜁니다: {path}")
+            continue
+        clips.append((path, audio))
+    if not clips:
+        return 1
+    total_audio_seconds = sum(len(audio) for _, audio in clips) / AUDIO_SAMPLE_RATE
+
+    results = {}
+    for name in backends:
+        try:
+            backend = create_transcription_backend(name, model_size=model_size, device=device)
+            backend.model # 모델 로드 (측정에서 제외)
+        except Exception as e:
+            print(f"[rtf] {name}: 엔진을 준비할 수 없습니다 ({e})")
+            continue
+        best = None
+        for _ in range(runs):
+            started = time.perf_counter()
+            for _, audio in clips:
+                backend.transcribe(audio, {'word_timestamps': True})
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best / total_audio_seconds
+        print(f"[rtf] {name} ({backend.precision}): {best:.2f}초 / 오디오 {total_audio_seconds:.1f}초 → RTF {results[name]:.3f}")
+
+    if len(results) > 1:
+        baseline_name = backends[0]
+        if baseline_name in results:
+            for name, rtf in results.items():
+                if name != baseline_name:
+                    print(f"[rtf] {name}는 {baseline_name} 대비 {results[baseline_name] / rtf:.2f}배 빠릅니다.")
+    return 0 if results else 1
+
+
+def edit_distance(reference, hypothesis):
+    """두 토큰 시퀀스 사이의 레벤슈타인 거리"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_token in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_token in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_token != hyp_token)))
+        previous = current
+    return previous[-1]
+
+
+def _normalize_text(text):
+    return re.sub(r"[^\w\s]", " ", text.lower()).split()
+
+
+def error_rates(reference, hypothesis):
+    """(WER, CER). 한국어는 띄어쓰기 차이가 커서 공백을 뺀 글자 단위 CER도 함께 봅니다."""
+    ref_words, hyp_words = _normalize_text(reference), _normalize_text(hypothesis)
+    ref_chars, hyp_chars = list("".join(ref_words)), list("".join(hyp_words))
+    wer = edit_distance(ref_words, hyp_words) / max(len(ref_words), 1)
+    cer = edit_distance(ref_chars, hyp_chars) / max(len(ref_chars), 1)
+    return wer, cer
+
+
+def benchmark_profiles(corpus_dir, profiles, backend_name, model_size, device, max_wer):
+    """
+    고정된 로컬 코퍼스(영상/오디오 파일 + 같은 이름의 .txt 정답 대본)로 속도 프로필별
+    처리량(오디오 초 / 처리 초)과 WER/CER을 측정합니다. 캐시와 VAD를 거치지 않도록 엔진을 직접 호출합니다.
+    """
+    from api_handler import AUDIO_SAMPLE_RATE, VideoProcessor
+
+    corpus = []
+    loader = VideoProcessor()
+    for reference_path in sorted(Path(corpus_dir).glob("*.txt")):
+        media_paths = [p for p in reference_path.parent.glob(reference_path.stem + ".*") if p.suffix != ".txt"]
+        if not media_paths:
+            continue
+        audio = loader.extract_audio(str(media_paths[0]))
+        if audio is None:
+            print(f"[profiles] 오디오를 읽을 수 없어 건너뜁니다: {media_paths[0]}")
+            continue
+        corpus.append((media_paths[0].name, audio, reference_path.read_text(encoding="utf-8")))
+    if not corpus:
+        print(f"[profiles] 코퍼스가 비어 있습니다: {corpus_dir} (미디어 파일과 같은 이름의 .txt 정답 대본 필요)")
+        return 1
+    total_audio_seconds = sum(len(audio) for _, audio, _ in corpus) / AUDIO_SAMPLE_RATE
+
+    failed = False
+    for profile in profiles:
+        processor = VideoProcessor(model_size=model_size, device=device, transcription_backend=backend_name,
+                                   transcription_profile=profile)
+        backend = processor.transcription_backend
+        options = processor._transcribe_options()
+        backend.model # 모델 로드 (측정에서 제외)
+
+        started = time.perf_counter()
+        hypotheses = [backend.transcribe(audio, options)["text"] for _, audio, _ in corpus]
+        elapsed = time.perf_counter() - started
+
+        rates = [error_rates(reference, hypothesis) for (_, _, reference), hypothesis in zip(corpus, hypotheses)]
+        wer = sum(r[0] for r in rates) / len(rates)
+        cer = sum(r[1] for r in rates) / len(rates)
+        print(f"[profiles] {profile} ({backend.name}, {backend.precision}): 처리량 {total_audio_seconds / elapsed:.1f}x 실시간, "
+              f"WER {wer:.3f}, CER {cer:.3f} ({elapsed:.1f}초 / 오디오 {total_audio_seconds:.1f}초)")
+        if max_wer is not None and wer > max_wer:
+            print(f"[profiles] 실패: {profile}의 WER이 기준({max_wer:.3f})을 초과했습니다.")
+            failed = True
+    return 1 if failed else 0
+
+
+class _SlowFixtureHandler(SimpleHTTPRequestHandler):
+    """요청마다 지연을 넣어 실제 서버의 응답 지연을 흉내 내는 정적 파일 핸들러"""
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def do_HEAD(self):
+        time.sleep(self.latency)
+        super().do_HEAD()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # yt-dlp가 형식 확인용 요청을 중간에 끊는 것은 정상 동작이므로 무시
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _start_fixture_server(directory, latency):
+    handler = type("FixtureHandler", (_SlowFixtureHandler,), {'latency': latency})
+    server = _QuietHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _ThrottlingFixtureHandler(_SlowFixtureHandler):
+    """동시에 처리 중인 요청이 max_concurrent개 이상이면 429로 거절해 요청 제한을 흉내 내는 핸들러"""
+    max_concurrent = 4
+    state = None # {'lock', 'active', 'throttled'} (서버마다 새로 만듦)
+
+    def do_GET(self):
+        with self.state['lock']:
+            if self.state['active'] >= self.max_concurrent:
+                self.state['throttled'] += 1
+                self.send_error(429, "Too Many Requests")
+                return
+            self.state['active'] += 1
+        try:
+            super().do_GET()
+        finally:
+            with self.state['lock']:
+                self.state['active'] -= 1
+
+
+def _start_throttling_fixture_server(directory, latency, max_concurrent):
+    state = {'lock': threading.Lock(), 'active': 0, 'throttled': 0}
+    handler = type("ThrottlingFixtureHandler", (_ThrottlingFixtureHandler,),
+                   {'latency': latency, 'max_concurrent': max_concurrent, 'state': state})
+    server = _QuietHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def _isolated_processor(workdir, label):
+    """다운로드 폴더와 작업 기록을 측정마다 따로 두어, 앞선 측정에서 받은 영상을 건너뛰지 않게 한 VideoProcessor"""
+    from api_handler import DownloadJobStore, VideoProcessor
+
+    processor = VideoProcessor()
+    processor.download_dir = Path(workdir) / f"downloads_{label}"
+    processor.download_job_store = DownloadJobStore(Path(workdir) / f"jobs_{label}.sqlite3", processor.download_dir)
+    return processor
+
+
+def benchmark_downloads(videos, size_kb, latency, workers, min_speedup):
+    """
+    로컬 HTTP 픽스처 서버에서 같은 영상 목록을 순차(동시 1개)와 동시(workers개)로 내려받아
+    DownloadManager의 처리량 향상을 측정합니다. 실제 다운로드 경로(yt-dlp 엔진)를 그대로 사용합니다.
+    """
+    from api_handler import DownloadManager
+
+    with tempfile.TemporaryDirectory() as workdir:
+        fixture_dir = Path(workdir) / "fixture"
+        fixture_dir.mkdir()
+        for i in range(videos):
+            (fixture_dir / f"clip{i:03d}.mp4").write_bytes(os.urandom(size_kb * 1024))
+        server = _start_fixture_server(fixture_dir, latency)
+        urls = [f"http://127.0.0.1:{server.server_port}/clip{i:03d}.mp4" for i in range(videos)]
+
+        timings = {}
+        try:
+            for label, concurrency in (("sequential", 1), ("concurrent", workers)):
+                processor = _isolated_processor(workdir, label)
+                manager = DownloadManager(processor.download_video_from_url, workers=concurrency, per_host=concurrency)
+                started = time.perf_counter()
+                results = manager.run(urls)
+                timings[label] = time.perf_counter() - started
+                succeeded = sum(1 for result in results if result)
+                print(f"[downloads] {label} (동시 {concurrency}개): {timings[label]:.2f}초, "
+                      f"{succeeded}/{videos}개 성공, {videos / timings[label]:.1f}개/초")
+                if succeeded != videos:
+                    print("[downloads] 실패: 일부 다운로드가 실패했습니다.")
+                    return 1
+        finally:
+            server.shutdown()
+
+    speedup = timings["sequential"] / timings["concurrent"]
+    print(f"[downloads] 동시 다운로드가 {speedup:.2f}배 빠릅니다 (기준 {min_speedup:.2f}배)")
+    return 0 if speedup >= min_speedup else 1
+
+
+def benchmark_throttle(videos, size_kb, latency, server_limit, workers, retry_delay):
+    """
+    동시 요청이 server_limit개를 넘으면 429를 돌려주는 로컬 픽스처 서버에서 고정 동시성(workers개)과
+    적응형 동시성(AdaptiveConcurrency, 2개에서 시작해 최대 workers개)을 비교합니다.
+    채널 처리와 같은 경로(run_channel_pipeline의 다운로드 단계)로 내려받으며, 픽스처는 영상이 아니므로
+    오디오 추출 이후 단계에서는 걸러지고 다운로드 작업 기록으로 성공 수를 셉니다.
+    적응형이 모든 영상을 받고 429 응답을 고정 동시성보다 적게 받으면 통과입니다.
+    """
+    outcomes = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        fixture_dir = Path(workdir) / "fixture"
+        fixture_dir.mkdir()
+        for i in range(videos):
+            (fixture_dir / f"clip{i:03d}.mp4").write_bytes(os.urandom(size_kb * 1024))
+
+        for label in ("fixed", "adaptive"):
+            server, state = _start_throttling_fixture_server(fixture_dir, latency, server_limit)
+            urls = [f"http://127.0.0.1:{server.server_port}/clip{i:03d}.mp4" for i in range(videos)]
+            try:
+                processor = _isolated_processor(workdir, label)
+                processor.download_retry_base_delay = retry_delay
+                processor.adaptive_downloads = label == "adaptive"
+                processor.download_workers = 2 if processor.adaptive_downloads else workers
+                processor.download_max_workers = workers
+                processor.download_per_host = workers
+                started = time.perf_counter()
+                processor.run_channel_pipeline([{'webpage_url': url, 'title': Path(url).name} for url in urls])
+                elapsed = time.perf_counter() - started
+            finally:
+                server.shutdown()
+            succeeded = videos - len(processor.download_job_store.unfinished("video"))
+            outcomes[label] = (succeeded, state['throttled'])
+            print(f"[throttle] {label}: {elapsed:.2f}초, {succeeded}/{videos}개 성공, 429 응답 {state['throttled']}회, "
+                  f"지표 {processor.download_metrics}")
+
+    adaptive_ok, adaptive_throttled = outcomes["adaptive"]
+    _, fixed_throttled = outcomes["fixed"]
+    if adaptive_ok != videos or adaptive_throttled >= max(fixed_throttled, 1):
+        print("[throttle] 실패: 적응형 동시성이 요청 제한을 충분히 피하지 못했습니다.")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GGooltem 성능 벤치마크")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    startup_parser = subparsers.add_parser("startup", help="GUI 시작 시간과 지연 임포트 검사")
+    startup_parser.add_argument("--budget", type=float, default=1.0, help="허용 시작 시간(초)")
+    startup_parser.add_argument("--runs", type=int, default=3, help="측정 횟수")
+    startup_parser.add_argument("--no-paint", action="store_true", help="창 표시 없이 임포트 시간만 측정")
+
+    rtf_parser = subparsers.add_parser("rtf", help="대본 생성 엔진별 실시간 배율(RTF) 비교")
+    rtf_parser.add_argument("media", nargs="+", help="측정에 사용할 영상/오디오 파일")
+    rtf_parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper"], help="비교할 엔진 (첫 번째가 기준)")
+    rtf_parser.add_argument("--model", default="base", help="모델 크기")
+    rtf_parser.add_argument("--device", default="cpu", help="디바이스")
+    rtf_parser.add_argument("--runs", type=int, default=1, help="측정 횟수 (최솟값 사용)")
+
+    profiles_parser = subparsers.add_parser("profiles", help="속도 프로필별 처리량과 WER/CER 비교")
+    profiles_parser.add_argument("corpus", help="미디어 파일과 같은 이름의 .txt 정답 대본이 있는 폴더")
+    profiles_parser.add_argument("--profiles", nargs="+", default=["fast", "balanced", "accurate"], help="비교할 프로필")
+    profiles_parser.add_argument("--backend", default=None, help="대본 생성 엔진 (기본: TRANSCRIPTION_BACKEND)")
+    profiles_parser.add_argument("--model", default="base", help="모델 크기")
+    profiles_parser.add_argument("--device", default="cpu", help="디바이스")
+    profiles_parser.add_argument("--max-wer", type=float, default=None, help="허용 WER (초과 시 실패)")
+
+    downloads_parser = subparsers.add_parser("downloads", help="로컬 HTTP 픽스처로 순차/동시 다운로드 처리량 비교")
+    downloads_parser.add_argument("--videos", type=int, default=24, help="픽스처 영상 수")
+    downloads_parser.add_argument("--size-kb", type=int, default=256, help="픽스처 영상 크기(KB)")
+    downloads_parser.add_argument("--latency", type=float, default=0.3, help="요청당 서버 지연(초)")
+    downloads_parser.add_argument("--workers", type=int, default=8, help="동시 다운로드 수")
+    downloads_parser.add_argument("--min-speedup", type=float, default=1.5, help="요구 처리량 향상 배수")
+
+    throttle_parser = subparsers.add_parser("throttle", help="요청 제한(429) 픽스처로 고정/적응형 동시 다운로드 비교")
+    throttle_parser.add_argument("--videos", type=int, default=24, help="픽스처 영상 수")
+    throttle_parser.add_argument("--size-kb", type=int, default=256, help="픽스처 영상 크기(KB)")
+    throttle_parser.add_argument("--latency", type=float, default=0.2, help="요청당 서버 지연(초)")
+    throttle_parser.add_argument("--server-limit", type=int, default=4, help="서버가 429 없이 받아 주는 동시 요청 수")
+    throttle_parser.add_argument("--workers", type=int, default=12, help="고정 동시 다운로드 수 (적응형의 최대 한도)")
+    throttle_parser.add_argument("--retry-delay", type=float, default=0.5, help="다운로드 재시도 첫 대기 시간(초)")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "startup":
+        return benchmark_startup(args.budget, args.runs, paint=not args.no_paint)
+    if args.benchmark == "rtf":
+        return benchmark_rtf(args.media, args.backends, args.model, args.device, args.runs)
+    if args.benchmark == "profiles":
+        return benchmark_profiles(args.corpus, args.profiles, args.backend, args.model, args.device, args.max_wer)
+    if args.benchmark == "downloads":
+        return benchmark_downloads(args.videos, args.size_kb, args.latency, args.workers, args.min_speedup)
+    if args.benchmark == "throttle":
+        return benchmark_throttle(args.videos, args.size_kb, args.latency, args.server_limit, args.workers, args.retry_delay)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,11 @@ import re
 import json
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QTextEdit, QVBoxLayout, QHBoxLayout,
-    QProgressBar, QMessageBox, QFileDialog, QTextBrowser, QInputDialog, QListWidget, QListWidgetItem, QScrollArea, QTabWidget, QComboBox
+    QProgressBar, QMessageBox, QFileDialog, QTextBrowser, QInputDialog, QListWidget, QListWidgetItem, QScrollArea, QTabWidget, QComboBox, QCheckBox
 )
 from PyQt5.QtGui import QFont, QPalette, QColor
 from PyQt5.QtCore import Qt, pyqtSignal, QObject, QTimer
-from api_handler import VideoProcessor
+from api_handler import VideoProcessor, ProgressReporter, format_segments_with_timestamps, TRANSCRIPTION_PROFILES, DEFAULT_TRANSCRIPTION_PROFILE
 from pathlib import Path
 import os
 import platform
@@ -38,6 +38,9 @@ class WorkerSignals(QObject):
     shorts_ab_test_output = pyqtSignal(str)
 
 class TikTokGUI(QWidget):
+    # 상위 N개 정렬 기준 (화면 표시 → VideoProcessor의 sort_by)
+    SORT_BY_OPTIONS = {"조회수": "views", "최신순": "recency", "길이": "duration"}
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("틱톡 영상 다운로더 & 대본 생성기")
@@ -132,6 +135,27 @@ class TikTokGUI(QWidget):
         self.keywords_input.setStyleSheet("color: #333;")
         self.keywords_input.setPlaceholderText("예: 리뷰, 추천, 비교")
         self.keywords_input.setFixedWidth(200)
+
+        # 상위 N개만 처리: 정렬 기준(조회수/최신순/길이)으로 가장 높은 N개만 골라 높은 순서대로 처리
+        self.top_n_label = QLabel("상위 N개:")
+        self.top_n_label.setFont(font_label)
+        self.top_n_label.setStyleSheet("color: #333;")
+        self.top_n_input = QLineEdit()
+        self.top_n_input.setFont(font_input)
+        self.top_n_input.setStyleSheet("color: #333;")
+        self.top_n_input.setPlaceholderText("예: 20")
+        self.top_n_input.setFixedWidth(60)
+        self.sort_by_combo = QComboBox()
+        self.sort_by_combo.setFont(font_input)
+        self.sort_by_combo.setStyleSheet("color: #333;")
+        self.sort_by_combo.addItems(list(self.SORT_BY_OPTIONS))
+        self.sort_by_combo.setFixedWidth(90)
+
+        # 증분 동기화: 채널/계정에서 이전에 처리한 영상 이후의 새 영상만 처리
+        self.incremental_sync_checkbox = QCheckBox("새 영상만 (증분 동기화)")
+        self.incremental_sync_checkbox.setFont(font_label)
+        self.incremental_sync_checkbox.setStyleSheet("color: #333;")
+        self.incremental_sync_checkbox.setToolTip("이전 실행에서 처리한 영상에 도달하면 채널 목록 읽기를 멈춥니다.")
         
         # 필터링 옵션들을 레이아웃에 추가
         filter_layout.addWidget(self.min_views_label)
@@ -142,8 +166,39 @@ class TikTokGUI(QWidget):
         filter_layout.addSpacing(20)
         filter_layout.addWidget(self.keywords_label)
         filter_layout.addWidget(self.keywords_input)
+        filter_layout.addSpacing(20)
+        filter_layout.addWidget(self.top_n_label)
+        filter_layout.addWidget(self.top_n_input)
+        filter_layout.addWidget(self.sort_by_combo)
+        filter_layout.addSpacing(20)
+        filter_layout.addWidget(self.incremental_sync_checkbox)
         filter_layout.addStretch()
 
+        # 대본 생성 속도 프로필 선택 (fast: 빠름, balanced: 균형, accurate: 정확)
+        transcription_frame = QWidget()
+        transcription_layout = QHBoxLayout()
+        transcription_frame.setLayout(transcription_layout)
+        self.transcription_profile_label = QLabel("대본 생성 프로필:")
+        self.transcription_profile_label.setFont(font_label)
+        self.transcription_profile_label.setStyleSheet("color: #333;")
+        self.transcription_profile_combo = QComboBox()
+        self.transcription_profile_combo.setFont(font_input)
+        self.transcription_profile_combo.setStyleSheet("color: #333;")
+        self.transcription_profile_combo.addItems(list(TRANSCRIPTION_PROFILES))
+        self.transcription_profile_combo.setCurrentText(DEFAULT_TRANSCRIPTION_PROFILE)
+        self.transcription_profile_combo.setToolTip("fast: 한국어 고정 + 그리디 디코딩 / balanced: 한국어 고정 + 작은 빔 / accurate: 언어 자동 감지 + 큰 빔")
+        self.transcription_profile_combo.setFixedWidth(120)
+        transcription_layout.addWidget(self.transcription_profile_label)
+        transcription_layout.addWidget(self.transcription_profile_combo)
+        # 오디오만 받기: 대본 생성/분석에는 음성만 쓰므로 영상 스트림을 받지 않아 대역폭과 디스크를 크게 줄임
+        self.audio_only_checkbox = QCheckBox("오디오만 받기 (대본 생성 전용)")
+        self.audio_only_checkbox.setFont(font_label)
+        self.audio_only_checkbox.setStyleSheet("color: #333;")
+        self.audio_only_checkbox.setToolTip("영상 대신 오디오 스트림만 내려받습니다. 영상 파일은 필요할 때 따로 받습니다.")
+        transcription_layout.addSpacing(20)
+        transcription_layout.addWidget(self.audio_only_checkbox)
+        transcription_layout.addStretch()
+
         # Google API Key 입력란 (새로 추가)
         self.google_api_key_label = QLabel("Google API Key (필수):")
         self.google_api_key_label.setFont(font_label)
@@ -326,6 +381,7 @@ class TikTokGUI(QWidget):
         download_analysis_layout.addWidget(self.url_input)
         download_analysis_layout.addWidget(self.filter_label)  # 필터링 옵션 라벨 추가
         download_analysis_layout.addWidget(filter_frame)  # 필터링 옵션 프레임 추가
+        download_analysis_layout.addWidget(transcription_frame)  # 대본 생성 프로필 선택 추가
         download_analysis_layout.addWidget(self.google_api_key_label) # API Key 입력란 추가
         download_analysis_layout.addWidget(self.google_api_key_input) # API Key 입력란 추가
         download_analysis_layout.addWidget(self.coupang_url_label)
@@ -593,6 +649,7 @@ class TikTokGUI(QWidget):
         if video_type == "전체":
             video_type = None
         keywords = self.keywords_input.text().strip() if self.keywords_input.text().strip() else None
+        top_n, sort_by = self._ranking_options()
 
         if not url:
             QMessageBox.warning(self, "입력 오류", "영상 URL을 입력해주세요.")
@@ -624,7 +681,10 @@ class TikTokGUI(QWidget):
 
         self.stop_event.clear()
 
-        self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key) # API Key 전달
+        self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key,
+                                        transcription_profile=self.transcription_profile_combo.currentText()) # API Key 전달
+        self.processor.incremental_sync = self.incremental_sync_checkbox.isChecked()
+        self.processor.audio_only = self.audio_only_checkbox.isChecked()
 
         # 채널 URL인지 확인하고 필터링 옵션이 있는지 확인
         is_channel_url = re.match(r'^https?://(www\.)?tiktok\.com/@[\w.]+/?(?:\?.*)?$', url) or \
@@ -632,14 +692,14 @@ class TikTokGUI(QWidget):
                         re.match(r'^https?://(www\.)?youtube\.com/(channel|user|c)/[\w.-]+/?', url) or \
                         re.match(r'^https?://(www\.)?youtube\.com/@[\w.-]+/?', url)
         
-        has_filters = min_views is not None or video_type is not None or keywords is not None
+        has_filters = min_views is not None or video_type is not None or keywords is not None or top_n is not None
         
         if is_channel_url and has_filters:
             # 채널 URL이고 필터링 옵션이 있는 경우
             self.signals.log_message.emit(f"<b>채널 URL + 필터링 감지: {url}</b>")
             self.current_thread = threading.Thread(
                 target=self._process_channel_with_filters_thread, 
-                args=(url, min_views, video_type, keywords, coupang_url, product_description,), 
+                args=(url, min_views, video_type, keywords, coupang_url, product_description, top_n, sort_by,), 
                 daemon=True
             )
         elif re.match(r'^https?://(www\.)?tiktok\.com/@[\w.]+/?(?:\?.*)?$', url) or \
@@ -683,7 +743,8 @@ class TikTokGUI(QWidget):
             self.generate_blog_draft_btn.setEnabled(False)
             self.stop_event.clear()
 
-            self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key) # API Key 전달
+            self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key,
+                                            transcription_profile=self.transcription_profile_combo.currentText()) # API Key 전달
             # 로컬 영상 대본 생성에서는 쿠팡 URL/상품 설명 인자를 사용하지 않으므로, 기본값으로 빈 문자열 전달
             self.current_thread = threading.Thread(target=self._process_local_video_for_transcript_thread, args=(video_path,), daemon=True)
             self.current_thread.start()
@@ -812,13 +873,15 @@ class TikTokGUI(QWidget):
                 with open(analysis_file_path, "r", encoding="utf-8") as f:
                     analysis_data = json.load(f)
 
-                transcript_file_path = Path(self.processor.download_dir) / uploader_name / "video_scripts" / f"{video_id}_transcript.json"
+                # 저장된 세그먼트 타임스탬프까지 함께 불러오므로 다시 전사할 필요가 없음
+                loaded_result = self.processor.load_transcript_result(uploader_name, video_id)
                 transcript_content = ""
-                if transcript_file_path.exists():
-                    with open(transcript_file_path, "r", encoding="utf-8") as f:
-                        transcript_data = json.load(f)
-                        transcript_content = transcript_data.get('transcript_text', '')
+                loaded_segments = []
+                if loaded_result:
+                    transcript_content = loaded_result['text']
+                    loaded_segments = loaded_result['segments']
                 else:
+                    transcript_file_path = Path(self.processor.download_dir) / uploader_name / "video_scripts" / f"{video_id}_transcript.json"
                     self.signals.log_message.emit(f"<span style='color:orange;'>경고: 대본 파일 {transcript_file_path}을 찾을 수 없습니다.</span>")
 
                 tags_text = ", ".join(analysis_data.get('suggested_tags', []))
@@ -854,6 +917,7 @@ class TikTokGUI(QWidget):
                 self.export_results_btn.setEnabled(True)
                 self.generate_platform_content_btn.setEnabled(True) # 플랫폼 최적화 버튼 활성화
                 self.last_loaded_transcript_content = transcript_content
+                self.last_loaded_segments = loaded_segments
                 self.last_loaded_video_title = selected_analysis_info['video_title']
 
                 # 쿠팡 파트너스 관련 데이터 저장 (초안 생성은 버튼 클릭 시)
@@ -883,14 +947,47 @@ class TikTokGUI(QWidget):
             self.load_previous_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
 
+    def _make_transcript_stream_callback(self):
+        """스트리밍 전사 중 도착한 세그먼트를 원본 대본/타임스탬프 창에 이어서 표시하는 콜백을 만듭니다."""
+        streamed_segments = []
+
+        def on_segments(segments):
+            streamed_segments.extend(segments)
+            self.signals.original_transcript_output.emit(" ".join(segment['text'] for segment in streamed_segments))
+            self.signals.timestamped_summaries_output.emit(format_segments_with_timestamps(streamed_segments))
+
+        return on_segments
+
+    def _ranking_options(self):
+        """상위 N개 입력과 정렬 기준 (N이 비어 있으면 (None, 정렬 기준))"""
+        top_n_text = self.top_n_input.text().strip()
+        top_n = int(top_n_text) if top_n_text.isdigit() and int(top_n_text) > 0 else None
+        return top_n, self.SORT_BY_OPTIONS[self.sort_by_combo.currentText()]
+
+    def _make_download_progress_reporter(self, start=0, end=100, total_items=None):
+        """다운로드 진행률(0~100)을 진행 표시줄의 start~end 구간과 상태 표시줄(속도, 남은 시간)로 전달하는 ProgressReporter를 만듭니다."""
+        def report(percent, detail):
+            self.signals.progress.emit(start + (end - start) * percent // 100)
+            status = f"다운로드 중... {percent}%"
+            if detail['total_items'] > 1:
+                status += f" ({detail['items_done']}/{detail['total_items']}개)"
+            if detail.get('speed'):
+                status += f" · {detail['speed'] / (1024 * 1024):.1f}MB/s"
+            if detail.get('eta') is not None:
+                status += f" · 남은 시간 {detail['eta']}초"
+            self.signals.status_message.emit(status)
+
+        return ProgressReporter(report, total_items=total_items)
+
     def _process_single_video_thread(self, url, coupang_url, product_description):
         """단일 영상 처리 스레드"""
-        audio_path = None
         try:
             self.signals.log_message.emit("영상 다운로드 중...")
             self.signals.progress.emit(10)
             
+            self.processor.on_download_progress = self._make_download_progress_reporter(10, 40)
             video_info = self.processor.download_video_from_url(url)
+            self.processor.on_download_progress = None
             
             if not video_info:
                 if self.stop_event.is_set():
@@ -903,6 +1000,10 @@ class TikTokGUI(QWidget):
             
             downloaded_path = video_info.get('downloaded_path')
             if not downloaded_path or not os.path.exists(downloaded_path):
+                if video_info.get('archived'):
+                    self.signals.log_message.emit("<span style='color:orange;'>이미 다운로드 아카이브에 기록된 영상이라 다시 받지 않았습니다.</span>")
+                    self.signals.status_message.emit("건너뜀: 이미 받은 영상")
+                    return
                 self.signals.log_message.emit("<span style='color:red;'>다운로드된 영상 파일을 찾을 수 없습니다.</span>")
                 self.signals.status_message.emit("실패: 파일 없음")
                 return
@@ -911,8 +1012,8 @@ class TikTokGUI(QWidget):
             self.signals.progress.emit(40)
 
             self.signals.log_message.emit("오디오 추출 중...")
-            audio_path = self.processor.extract_audio(downloaded_path)
-            if not audio_path:
+            audio = self.processor.extract_audio(downloaded_path)
+            if audio is None:
                 if self.stop_event.is_set():
                     self.signals.log_message.emit("<span style='color:orange;'>작업이 중지되었습니다.</span>")
                     self.signals.status_message.emit("중지됨")
@@ -920,17 +1021,19 @@ class TikTokGUI(QWidget):
                     self.signals.log_message.emit("<span style='color:red;'>오디오 추출 실패</span>")
                     self.signals.status_message.emit("실패: 오디오 추출 오류")
                 return
-            self.signals.log_message.emit(f"오디오 추출 완료: {audio_path}")
+            self.signals.log_message.emit("오디오 추출 완료")
             self.signals.progress.emit(70)
 
-            self.signals.log_message.emit("대본 생성 중...")
+            self.signals.log_message.emit("대본 생성 중... (생성되는 대로 원본 대본 창에 표시됩니다)")
             self.signals.progress.emit(70)
 
-            transcript_text = self.processor.generate_transcript(audio_path)
-            if transcript_text is None:
+            whisper_result = self.processor.generate_transcript(audio, on_segments=self._make_transcript_stream_callback())
+            if whisper_result is None:
                 raise Exception("대본 생성 실패: Whisper 모델이 텍스트를 반환하지 않았습니다.")
+            transcript_text = whisper_result["text"]
             print(f"[DEBUG_GUI] Whisper 대본 생성 결과: {transcript_text[:50]}...")
-            whisper_result = {"text": transcript_text, "segments": []}
+            if whisper_result.get("no_speech"):
+                self.signals.log_message.emit("<span style='color:orange;'>음성이 감지되지 않았습니다 (음악/무음). 대본 생성과 AI 분석을 건너뜁니다.</span>")
 
             self.signals.log_message.emit("대본 저장 중...")
             print("[DEBUG_GUI] save_transcript 호출 전.")
@@ -983,6 +1086,7 @@ class TikTokGUI(QWidget):
             self.export_results_btn.setEnabled(True)
             self.generate_platform_content_btn.setEnabled(True) # 플랫폼 최적화 버튼 활성화
             self.last_loaded_transcript_content = transcript_text
+            self.last_loaded_segments = whisper_result.get('segments', [])
             self.last_loaded_video_title = video_info.get('video_title', '제목 없음')
 
             # 쿠팡 파트너스 관련 데이터 저장 (초안 생성은 버튼 클릭 시)
@@ -1009,31 +1113,26 @@ class TikTokGUI(QWidget):
             self.signals.status_message.emit("오류 발생")
             self.signals.progress.emit(0)
         finally:
-            if audio_path is not None and Path(audio_path).exists():
-                try:
-                    os.remove(audio_path)
-                    self.signals.log_message.emit(f"임시 오디오 파일 삭제 완료: {audio_path}")
-                except Exception as e:
-                    self.signals.log_message.emit(f"임시 오디오 파일 삭제 실패: {e}")
             self.signals.finished.emit()
 
     def _process_local_video_for_transcript_thread(self, local_video_path):
         video_info = {'video_id': Path(local_video_path).stem, 'video_title': Path(local_video_path).stem, 'uploader': 'LocalVideo'}
-        audio_path = None
         try:
             self.signals.log_message.emit("로컬 영상에서 오디오 추출 중...")
             self.signals.progress.emit(20)
-            audio_path = self.processor.extract_audio(local_video_path)
-            if audio_path is None:
+            audio = self.processor.extract_audio(local_video_path)
+            if audio is None:
                 raise Exception("오디오 추출 실패.")
 
-            self.signals.log_message.emit("대본 생성 중...")
+            self.signals.log_message.emit("대본 생성 중... (생성되는 대로 원본 대본 창에 표시됩니다)")
             self.signals.progress.emit(70)
-            transcript_text = self.processor.generate_transcript(audio_path)
-            if transcript_text is None:
+            whisper_result = self.processor.generate_transcript(audio, on_segments=self._make_transcript_stream_callback())
+            if whisper_result is None:
                 raise Exception("대본 생성 실패: Whisper 모델이 텍스트를 반환하지 않았습니다.")
+            transcript_text = whisper_result["text"]
             print(f"[DEBUG_GUI] Whisper 대본 생성 결과 (로컬): {transcript_text[:50]}...")
-            whisper_result = {"text": transcript_text, "segments": []}
+            if whisper_result.get("no_speech"):
+                self.signals.log_message.emit("<span style='color:orange;'>음성이 감지되지 않았습니다 (음악/무음). 대본 생성과 AI 분석을 건너뜁니다.</span>")
 
             self.signals.log_message.emit("대본 저장 중...")
             print("[DEBUG_GUI] save_transcript 호출 전 (로컬).")
@@ -1085,6 +1184,7 @@ class TikTokGUI(QWidget):
             self.export_results_btn.setEnabled(True)
             self.generate_platform_content_btn.setEnabled(True) # 플랫폼 최적화 버튼 활성화
             self.last_loaded_transcript_content = transcript_text
+            self.last_loaded_segments = whisper_result.get('segments', [])
             self.last_loaded_video_title = video_info.get('video_title', '제목 없음')
 
         except InterruptedError:
@@ -1098,12 +1198,6 @@ class TikTokGUI(QWidget):
             self.signals.status_message.emit("오류 발생")
             self.signals.progress.emit(0)
         finally:
-            if audio_path and Path(audio_path).exists():
-                try:
-                    os.remove(audio_path)
-                    self.signals.log_message.emit(f"임시 로컬 오디오 파일 삭제 완료: {audio_path}")
-                except Exception as e:
-                    self.signals.log_message.emit(f"임시 로컬 오디오 파일 삭제 실패: {e}")
             self.signals.finished.emit()
 
     def _process_profile_videos_thread(self, profile_url, coupang_url, product_description):
@@ -1113,7 +1207,10 @@ class TikTokGUI(QWidget):
             self.progress.setValue(0)
             self.signals.status_message.emit("계정 영상 목록 다운로드 중...")
             
+            self.signals.total_progress.emit(100) # 다운로드 동안은 전체 진행률(%)로 표시
+            self.processor.on_download_progress = self._make_download_progress_reporter()
             video_paths = self.processor.download_all_videos_from_profile_url(profile_url)
+            self.processor.on_download_progress = None
             
             if not video_paths:
                 if self.stop_event.is_set():
@@ -1133,33 +1230,28 @@ class TikTokGUI(QWidget):
             all_timestamped_summaries = []
 
             last_profile_video_transcript = ""
+            last_profile_video_segments = []
 
-            for i, video_path in enumerate(video_paths, 1):
+            # 대본은 전사 워커 풀에서 여러 영상을 동시에 생성하고, 완료되는 대로 순서대로 저장/분석
+            transcripts = self.processor.transcribe_videos(video_paths)
+            for i, (video_path, whisper_result) in enumerate(transcripts, 1):
                 if self.stop_event.is_set():
                     self.signals.log_message.emit("<span style='color:orange;'>작업이 사용자에 의해 중지되었습니다.</span>")
                     self.signals.status_message.emit("중지됨")
                     break
 
                 self.signals.log_message.emit(f"\n<b>[{i}/{len(video_paths)}] 영상 처리 중: {Path(video_path).name}</b>")
-                self.signals.status_message.emit(f"[{i}/{len(video_paths)}] 대본 생성 중...")
+                self.signals.status_message.emit(f"[{i}/{len(video_paths)}] 대본 저장 및 분석 중...")
                 
-                audio_path = None
                 try:
-                    audio_path = self.processor.extract_audio(video_path)
-                    if not audio_path:
-                        if self.stop_event.is_set():
-                            self.signals.log_message.emit("<span style='color:orange;'>작업이 중지되었습니다.</span>")
-                            self.signals.status_message.emit("중지됨")
-                            break
-                        else:
-                            self.signals.log_message.emit(f"<span style='color:orange;'>영상({Path(video_path).name}) 오디오 추출 실패 (건너뛰기)</span>")
-                            continue
-
-                    whisper_result = self.processor.generate_transcript(audio_path)
                     if whisper_result is None or "text" not in whisper_result:
-                        raise Exception("대본 생성 실패: Whisper 모델이 텍스트를 반환하지 않았습니다.")
+                        self.signals.log_message.emit(f"<span style='color:orange;'>영상({Path(video_path).name}) 오디오 추출 또는 대본 생성 실패 (건너뛰기)</span>")
+                        self.progress.setValue(i)
+                        continue
+
                     transcript_text = whisper_result["text"]
                     last_profile_video_transcript = transcript_text # 마지막 영상 대본 저장
+                    last_profile_video_segments = whisper_result.get("segments", [])
                     print(f"[DEBUG_GUI] Whisper 대본 생성 결과: {transcript_text[:50]}...")
 
                     video_id = Path(video_path).stem
@@ -1198,12 +1290,6 @@ class TikTokGUI(QWidget):
                     break
                 except Exception as e:
                     self.signals.log_message.emit(f"<span style='color:red;'>영상({Path(video_path).name}) 처리 중 오류 발생: {e}</span>")
-                finally:
-                    if audio_path is not None and os.path.exists(audio_path):
-                        try:
-                            os.remove(audio_path)
-                        except Exception as e:
-                            self.signals.log_message.emit(f"<span style='color:orange;'>임시 오디오 파일 삭제 실패: {audio_path} - {e}</span>")
 
                 self.progress.setValue(i)
             
@@ -1240,6 +1326,7 @@ class TikTokGUI(QWidget):
                 self.export_results_btn.setEnabled(True)
                 self.generate_platform_content_btn.setEnabled(True) # 플랫폼 최적화 버튼 활성화
                 self.last_loaded_transcript_content = last_profile_video_transcript
+                self.last_loaded_segments = last_profile_video_segments
                 self.last_loaded_video_title = "여러 영상 합본"
 
                 # 쿠팡 파트너스 관련 데이터 저장 (초안 생성은 버튼 클릭 시)
@@ -1264,110 +1351,67 @@ class TikTokGUI(QWidget):
         finally:
             self.signals.finished.emit()
 
-    def _process_channel_with_filters_thread(self, channel_url, min_views, video_type, keywords, coupang_url, product_description):
+    def _process_channel_with_filters_thread(self, channel_url, min_views, video_type, keywords, coupang_url, product_description,
+                                             top_n=None, sort_by="views"):
         """채널 URL을 받아서 필터링 조건에 맞는 동영상들을 처리하는 스레드"""
         try:
             self.signals.log_message.emit(f"<b>채널 필터링 처리 시작: {channel_url}</b>")
-            self.signals.log_message.emit(f"<b>필터 조건: 최소 조회수={min_views}, 유형={video_type}, 키워드={keywords}</b>")
+            self.signals.log_message.emit(f"<b>필터 조건: 최소 조회수={min_views}, 유형={video_type}, 키워드={keywords}, 상위={top_n}개 ({sort_by})</b>")
             self.progress.setValue(0)
+            # 목록을 다 읽기 전에는 전체 개수를 모르므로 진행 표시줄을 '진행 중' 표시(최댓값 0)로 둠
+            self.signals.total_progress.emit(0)
             self.signals.status_message.emit("채널 동영상 필터링 중...")
             
-            # 1단계: 필터링된 동영상 목록 가져오기
-            filtered_videos = self.processor.get_channel_videos_with_filters(channel_url, min_views, video_type, keywords)
-            
-            if not filtered_videos:
-                if self.stop_event.is_set():
-                    self.signals.log_message.emit("<span style='color:orange;'>작업이 중지되었습니다.</span>")
-                    self.signals.status_message.emit("중지됨")
-                else:
-                    self.signals.log_message.emit("<span style='color:red;'>조건에 맞는 동영상을 찾지 못했습니다.</span>")
-                    self.signals.status_message.emit("실패: 조건에 맞는 동영상 없음")
-                return
-
-            self.signals.log_message.emit(f"<b>필터링 완료: {len(filtered_videos)}개의 동영상 선택됨</b>")
-            
-            # 2단계: 필터링된 동영상들 다운로드
-            self.signals.status_message.emit("선택된 동영상 다운로드 중...")
-            downloaded_videos = self.processor.download_filtered_videos(filtered_videos)
-            
-            if not downloaded_videos:
-                self.signals.log_message.emit("<span style='color:red;'>동영상 다운로드에 실패했습니다.</span>")
-                self.signals.status_message.emit("실패: 다운로드 오류")
-                return
+            # 채널 목록을 받아오는 대로 조건에 맞는 영상부터 다운로드 → 오디오 추출 → 대본 생성 → 분석 → 저장 파이프라인에 넣음
+            matched_videos = []
 
-            self.signals.log_message.emit(f"<b>총 {len(downloaded_videos)}개의 동영상 다운로드 완료. 분석 시작...</b>")
-            self.progress.setMaximum(len(downloaded_videos))
+            def stream_matches():
+                for video in self.processor.iter_channel_videos(channel_url, min_views, video_type, keywords, top_n=top_n, sort_by=sort_by):
+                    matched_videos.append(video)
+                    self.signals.log_message.emit(f"선택됨 ({len(matched_videos)}): {video.get('title', 'Unknown')}")
+                    yield video
+                # 목록을 끝까지 읽은 뒤에 한 번만 최댓값을 정해, 처리 중에 진행 표시줄이 뒤로 가지 않게 함
+                self.signals.total_progress.emit(max(len(matched_videos), 1))
 
             all_analysis_results = []
             all_suggested_tags = []
             all_content_ideas = []
             all_timestamped_summaries = []
-            last_video_transcript = ""
-
-            # 3단계: 각 동영상에 대해 분석 수행
-            for i, video_info in enumerate(downloaded_videos, 1):
-                if self.stop_event.is_set():
-                    self.signals.log_message.emit("<span style='color:orange;'>작업이 사용자에 의해 중지되었습니다.</span>")
-                    self.signals.status_message.emit("중지됨")
-                    break
+            last_video = {'transcript': "", 'segments': []}
+            completed = [0]
 
+            def on_video_done(video_info, whisper_result, analysis_results):
+                # 저장 단계(단일 스레드)에서 영상 하나가 끝날 때마다 호출됨
+                completed[0] += 1
                 video_title = video_info.get('video_title', 'Unknown')
-                self.signals.log_message.emit(f"\n<b>[{i}/{len(downloaded_videos)}] 동영상 분석 중: {video_title}</b>")
-                self.signals.status_message.emit(f"[{i}/{len(downloaded_videos)}] 분석 중...")
-                
-                audio_path = None
-                try:
-                    video_path = video_info.get('downloaded_path')
-                    if not video_path or not os.path.exists(video_path):
-                        self.signals.log_message.emit(f"<span style='color:orange;'>동영상 파일을 찾을 수 없습니다: {video_title}</span>")
-                        continue
-
-                    audio_path = self.processor.extract_audio(video_path)
-                    if not audio_path:
-                        if self.stop_event.is_set():
-                            self.signals.log_message.emit("<span style='color:orange;'>작업이 중지되었습니다.</span>")
-                            self.signals.status_message.emit("중지됨")
-                            break
-                        else:
-                            self.signals.log_message.emit(f"<span style='color:orange;'>동영상({video_title}) 오디오 추출 실패 (건너뛰기)</span>")
-                            continue
-
-                    transcript = self.processor.generate_transcript(audio_path)
-                    if transcript:
-                        last_video_transcript = transcript
-                        
-                        # 대본 저장
-                        self.processor.save_transcript(video_info, {"text": transcript})
-                        
-                        # 콘텐츠 분석
-                        analysis_results = self.processor.analyze_video_content(video_info, {"text": transcript})
-                        if analysis_results:
-                            self.processor.save_analysis_results(video_info, analysis_results)
-                            
-                            all_suggested_tags.extend(analysis_results.get('suggested_tags', []))
-                            all_content_ideas.extend(analysis_results.get('content_ideas', []))
-                            all_timestamped_summaries.extend(analysis_results.get('timestamped_summaries', []))
-                            
-                            self.signals.log_message.emit(f"<span style='color:green;'>동영상({video_title}) 분석 완료</span>")
-                        else:
-                            self.signals.log_message.emit(f"<span style='color:orange;'>동영상({video_title}) 분석 실패 (건너뛰기)</span>")
-                    else:
-                        self.signals.log_message.emit(f"<span style='color:orange;'>동영상({video_title}) 대본 생성 실패 (건너뛰기)</span>")
-
-                except InterruptedError:
-                    self.signals.log_message.emit("<b><span style='color:orange;'>작업이 사용자에 의해 중지되었습니다.</span></b>")
-                    self.signals.status_message.emit("중지됨")
-                    break
-                except Exception as e:
-                    self.signals.log_message.emit(f"<span style='color:red;'>동영상({video_title}) 처리 중 오류 발생: {e}</span>")
-                finally:
-                    if audio_path is not None and os.path.exists(audio_path):
-                        try:
-                            os.remove(audio_path)
-                        except Exception as e:
-                            self.signals.log_message.emit(f"<span style='color:orange;'>임시 오디오 파일 삭제 실패: {audio_path} - {e}</span>")
-
-                self.progress.setValue(i)
+                last_video['transcript'] = whisper_result["text"]
+                last_video['segments'] = whisper_result.get("segments", [])
+                if analysis_results:
+                    all_suggested_tags.extend(analysis_results.get('suggested_tags', []))
+                    all_content_ideas.extend(analysis_results.get('content_ideas', []))
+                    all_timestamped_summaries.extend(analysis_results.get('timestamped_summaries', []))
+                    self.signals.log_message.emit(f"<span style='color:green;'>[{completed[0]}/{len(matched_videos)}] 동영상({video_title}) 분석 완료</span>")
+                else:
+                    self.signals.log_message.emit(f"<span style='color:orange;'>[{completed[0]}/{len(matched_videos)}] 동영상({video_title}) 분석 실패 (대본만 저장)</span>")
+                self.signals.status_message.emit(f"[{completed[0]}/{len(matched_videos)}] 처리 완료")
+                self.signals.progress.emit(completed[0])
+
+            processed_videos = self.processor.run_channel_pipeline(stream_matches(), on_video_done=on_video_done)
+            self.signals.total_progress.emit(max(len(matched_videos), 1)) # 목록을 끝까지 읽기 전에 중지된 경우
+            last_video_transcript = last_video['transcript']
+            last_video_segments = last_video['segments']
+
+            if self.stop_event.is_set():
+                self.signals.log_message.emit("<span style='color:orange;'>작업이 사용자에 의해 중지되었습니다.</span>")
+                self.signals.status_message.emit("중지됨")
+            elif not matched_videos:
+                self.signals.log_message.emit("<span style='color:red;'>조건에 맞는 동영상을 찾지 못했습니다.</span>")
+                self.signals.status_message.emit("실패: 조건에 맞는 동영상 없음")
+                return
+            elif not processed_videos:
+                self.signals.log_message.emit("<span style='color:red;'>동영상 다운로드 또는 대본 생성에 실패했습니다.</span>")
+                self.signals.status_message.emit("실패: 처리된 동영상 없음")
+                return
             
             if not self.stop_event.is_set():
                 self.signals.log_message.emit("<b>채널 필터링 처리가 완료되었습니다.</b>")
@@ -1402,6 +1446,7 @@ class TikTokGUI(QWidget):
                 
                 # 데이터 저장
                 self.last_loaded_transcript_content = last_video_transcript
+                self.last_loaded_segments = last_video_segments
                 self.last_loaded_video_title = "필터링된 채널 동영상들"
                 self.last_coupang_url = coupang_url
                 self.last_product_description = product_description
@@ -1777,6 +1822,7 @@ class TikTokGUI(QWidget):
         if video_type == "전체":
             video_type = None
         keywords = self.keywords_input.text().strip() if self.keywords_input.text().strip() else None
+        top_n, sort_by = self._ranking_options()
 
         if not url:
             QMessageBox.warning(self, "입력 오류", "채널 URL을 입력해주세요.")
@@ -1794,7 +1840,7 @@ class TikTokGUI(QWidget):
             QMessageBox.warning(self, "입력 오류", "YouTube 채널 URL을 입력해주세요.")
             return
 
-        if not (min_views or video_type or keywords):
+        if not (min_views or video_type or keywords or top_n):
             QMessageBox.warning(self, "입력 오류", "최소 하나의 필터링 조건을 설정해주세요.")
             return
         
@@ -1820,26 +1866,28 @@ class TikTokGUI(QWidget):
 
         self.stop_event.clear()
 
-        self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key)
+        self.processor = VideoProcessor(stop_event=self.stop_event, api_key=google_api_key,
+                                        transcription_profile=self.transcription_profile_combo.currentText())
 
         # 채널 필터링만 실행하는 스레드 시작
         self.current_thread = threading.Thread(
             target=self._process_channel_filtering_only_thread, 
-            args=(url, min_views, video_type, keywords,), 
+            args=(url, min_views, video_type, keywords, top_n, sort_by,), 
             daemon=True
         )
         self.current_thread.start()
 
-    def _process_channel_filtering_only_thread(self, channel_url, min_views, video_type, keywords):
+    def _process_channel_filtering_only_thread(self, channel_url, min_views, video_type, keywords, top_n=None, sort_by="views"):
         """채널 필터링만 실행하여 조건에 맞는 영상 URL 목록을 제공하는 스레드"""
         try:
             self.signals.log_message.emit(f"<b>채널 필터링 시작: {channel_url}</b>")
-            self.signals.log_message.emit(f"<b>필터 조건: 최소 조회수={min_views}, 유형={video_type}, 키워드={keywords}</b>")
+            self.signals.log_message.emit(f"<b>필터 조건: 최소 조회수={min_views}, 유형={video_type}, 키워드={keywords}, 상위={top_n}개 ({sort_by})</b>")
             self.progress.setValue(0)
             self.signals.status_message.emit("채널 동영상 필터링 중...")
             
             # 필터링된 동영상 목록 가져오기
-            filtered_videos = self.processor.get_channel_videos_with_filters(channel_url, min_views, video_type, keywords)
+            filtered_videos = self.processor.get_channel_videos_with_filters(channel_url, min_views, video_type, keywords,
+                                                                             top_n=top_n, sort_by=sort_by)
             
             if not filtered_videos:
                 if self.stop_event.is_set():
@@ -2065,6 +2113,11 @@ class TikTokGUI(QWidget):
             QMessageBox.warning(self, "입력 오류", "먼저 영상 대본을 로드하거나 생성해야 합니다.")
             return
 
+        # 실제 Whisper 세그먼트 타임스탬프가 있으면 타임라인이 실제 시간을 기준으로 하도록 함께 전달
+        segments = getattr(self, 'last_loaded_segments', None)
+        if segments:
+            transcript_content = format_segments_with_timestamps(segments)
+
         video_length = self.shorts_length_combo.currentText()
         platform = self.shorts_platform_combo.currentText()
 